@@ -1,13 +1,85 @@
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify, render_template_string, g, Response, stream_with_context
 from flask_cors import CORS
+from functools import wraps
 from tourism_optimizer import TourismOptimizer
+from session_store import SessionStore
+from jobs import JobManager
+from islands import island_options
+from batch_optimize import batch_items, fingerprint, get_batch_pool, item_options
+from result_cache import create_result_cache
 import json
+import time
 from datetime import datetime
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+CORS(app, expose_headers=['X-Journey-Id'])  # Enable CORS for all routes
 
-# Global optimizer instance
-optimizer = TourismOptimizer()
+# Data bersama (katalog + matriks) dibangun sekali; state per journey di SessionStore
+place_data = TourismOptimizer().place_data
+sessions = SessionStore(lambda data: TourismOptimizer(place_data=data), place_data)
+jobs = JobManager()
+# Optimizer tanpa state journey, hanya untuk normalisasi preferensi item batch
+batch_planner = TourismOptimizer(place_data=place_data)
+# Cache hasil /api/optimize untuk request identik (env TOURISM_RESULT_CACHE)
+result_cache = create_result_cache()
+
+
+def request_journey_id():
+    """Journey ID dari header X-Journey-Id, query ?journey_id= atau body JSON"""
+    journey_id = request.headers.get('X-Journey-Id') or request.args.get('journey_id')
+    if not journey_id:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            journey_id = data.get('journey_id')
+    return journey_id
+
+
+def request_body():
+    """Body JSON jika ada, selain itu dict kosong"""
+    if request.content_type == 'application/json':
+        return request.get_json(silent=True) or {}
+    return {}
+
+
+def journey_endpoint(view):
+    """Jalankan endpoint dengan optimizer milik journey (dibuat jika belum ada)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        session = sessions.get(request_journey_id())
+        g.journey_id = session.journey_id
+        with session.lock:
+            return view(session.optimizer, *args, **kwargs)
+    return wrapper
+
+
+def request_deadline(data, started=None):
+    """
+    Deadline absolut (time.monotonic()) dari 'deadline_ms' di body, dihitung
+    sejak request diterima sehingga waktu tunggu lock/antrian ikut terhitung
+    """
+    deadline_ms = data.get('deadline_ms')
+    if deadline_ms is None:
+        return None
+    try:
+        deadline_ms = float(deadline_ms)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid deadline_ms: {deadline_ms}")
+    if deadline_ms <= 0:
+        raise ValueError("deadline_ms must be positive")
+    started = started if started is not None else time.monotonic()
+    return started + deadline_ms / 1000.0
+
+
+@app.before_request
+def mark_request_start():
+    g.request_started = time.monotonic()
+
+
+@app.after_request
+def attach_journey_id(response):
+    journey_id = g.get('journey_id')
+    if journey_id:
+        response.headers['X-Journey-Id'] = journey_id
+    return response
 
 @app.route('/')
 def home():
@@ -29,6 +101,9 @@ def home():
     <body>
         <h1>🗺️ Tourism Route Optimizer API</h1>
         <p>API untuk optimasi rute wisata dengan 5 fitur utama</p>
+        <p>Setiap perjalanan memakai <strong>journey ID</strong>: kirim header <code>X-Journey-Id</code>
+        (atau <code>journey_id</code> di query/body). Jika kosong, server menerbitkan ID baru
+        di header respons <code>X-Journey-Id</code>.</p>
         
         <h2>📋 Endpoints</h2>
         
@@ -37,6 +112,40 @@ def home():
             <strong>/api/optimize</strong>
             <p>Optimasi rute awal berdasarkan preferensi pengguna</p>
             <pre>Body: { "preferences": { "start_time": "08:00", "budget": 200000, ... } }</pre>
+            <p><code>algorithm</code>: <code>simple</code>, <code>mu_plus_lambda</code>, <code>mu_comma_lambda</code>,
+            <code>exact</code> (branch-and-bound, hanya instance kecil), <code>auto</code> (exact jika instance kecil)
+            atau <code>islands</code> (beberapa sub-populasi di process terpisah, migrasi elit berbentuk ring).</p>
+            <p>Opsional <code>islands</code> (untuk <code>algorithm: "islands"</code>): <code>count</code>,
+            <code>migration_interval</code> (generasi), <code>migrants</code> (elit per migrasi),
+            <code>crossover_methods</code> (dipakai bergiliran per island).</p>
+            <p>Opsional <code>stop_criteria</code>: <code>max_generations</code>, <code>stagnation_generations</code>
+            (0 = nonaktif), <code>target_fitness</code>, <code>max_evaluations</code>. Kriteria yang menghentikan GA
+            ada di <code>evolution_stats.stop_reason</code>.</p>
+            <p>Opsional <code>local_search: true</code>: 2-opt, relocate dan swap-in pada individu elit setiap
+            generasi dan pada hasil akhir (memetic GA).</p>
+            <p>Opsional <code>deadline_ms</code> (juga untuk /api/next-and-reoptimize): batas waktu respons sejak
+            request diterima. GA berhenti di antara generasi dan mengembalikan rute terbaik sejauh ini dengan
+            <code>truncated: true</code>.</p>
+            <p>Opsional <code>seed</code> (juga untuk /api/next-and-reoptimize dan item batch): seed sama dengan
+            input sama menghasilkan rute yang sama. Seed yang dipakai selalu dikembalikan di <code>seed</code>
+            sehingga run tanpa seed pun bisa diulang.</p>
+            <p>Request identik (preferensi ternormalisasi, crossover, algoritma, opsi, katalog) dilayani dari
+            result cache dengan <code>from_cache: true</code>; rute journey tetap dipulihkan sehingga bisa lanjut
+            ke /api/next-place. Backend diatur lewat env <code>TOURISM_RESULT_CACHE</code>: <code>memory</code>
+            (default), <code>file</code> (dibagi antar worker) atau <code>off</code>.</p>
+        </div>
+        
+        <div class="endpoint">
+            <span class="method post">POST</span>
+            <strong>/api/optimize/batch</strong>
+            <p>Optimasi banyak set preferensi sekaligus (tanpa journey), dijalankan paralel di process pool</p>
+            <pre>Body: { "items": [ { "id": "tamu-1", "preferences": { ... } }, ... ], "algorithm": "simple" }</pre>
+            <p>Field <code>crossover_method</code>, <code>algorithm</code>, <code>stop_criteria</code>,
+            <code>local_search</code>, <code>deadline_ms</code>, <code>seed</code> di level atas menjadi default setiap item.
+            Item dengan preferensi dan opsi identik dioptimasi sekali (<code>deduplicated: true</code>).
+            Respons berupa NDJSON: satu baris per item sesuai urutan selesai (<code>index</code>, <code>id</code>,
+            <code>status</code>, <code>data</code>/<code>message</code>), lalu baris ringkasan
+            <code>status: "done"</code>. Item yang gagal tidak menggagalkan batch.</p>
         </div>
         
         <div class="endpoint">
@@ -76,10 +185,22 @@ def home():
             <p>Gabungan Menu 1 & 2: Otomatis lanjut ke tempat berikutnya + reoptimasi rute</p>
         </div>
         
+        <div class="endpoint">
+            <span class="method post">POST</span>
+            <strong>/api/jobs/optimize</strong> &amp; <strong>/api/jobs/next-and-reoptimize</strong>
+            <p>Versi asinkron: langsung mengembalikan job ID, GA berjalan di background</p>
+        </div>
+        
+        <div class="endpoint">
+            <span class="method get">GET</span>
+            <strong>/api/jobs/&lt;job_id&gt;</strong> &amp; <strong>/api/jobs/&lt;job_id&gt;/events</strong>
+            <p>Polling status job, atau stream Server-Sent Events berisi statistik tiap generasi dan hasil akhir</p>
+        </div>
+        
         <div class="endpoint">
             <span class="method get">GET</span>
             <strong>/api/places</strong>
-            <p>Lihat semua tempat wisata yang tersedia</p>
+            <p>Lihat semua tempat wisata yang tersedia. Opsional: <code>?category=</code>, <code>?offset=&amp;limit=</code> (paginasi untuk katalog besar)</p>
         </div>
         
         <div class="endpoint">
@@ -92,8 +213,8 @@ def home():
     """
     return render_template_string(docs)
 
-@app.route('/api/optimize', methods=['POST'])
-def optimize_route():
+def run_optimize(optimizer, data, journey_id, progress_callback=None, started=None):
+    """Isi endpoint /api/optimize; mengembalikan (body, http_status) untuk mode sinkron maupun job"""
     # ✅ START SEPARATOR
     print("\n" + "🟢" * 80)
     print("🟢" + " " * 30 + "NEW API REQUEST" + " " * 30 + "🟢")
@@ -103,9 +224,7 @@ def optimize_route():
     print("🎯 STARTING ROUTE OPTIMIZATION")
     print("🎯 STARTING ROUTE OPTIMIZATION")
     start_time = datetime.now()
-    """Optimasi rute awal"""
     try:
-        data = request.get_json() or {}
         preferences = data.get('preferences', {})
         print(preferences)
         crossover_method = data.get('crossover_method', 'original')
@@ -130,10 +249,10 @@ def optimize_route():
             required_fields = ['name', 'latitude', 'longitude']
             if not all(field in start_loc for field in required_fields):
                 print(f"❌ Invalid start_location: missing {required_fields}")
-                return jsonify({
+                return {
                     'status': 'error',
                     'message': f"start_location must include: {', '.join(required_fields)}"
-                }), 400
+                }, 400
             print(f"📍 Start Location: {start_loc['name']} ({start_loc['latitude']}, {start_loc['longitude']})")
         
         if 'end_location' in preferences:
@@ -141,12 +260,14 @@ def optimize_route():
             required_fields = ['name', 'latitude', 'longitude']
             if not all(field in end_loc for field in required_fields):
                 print(f"❌ Invalid end_location: missing {required_fields}")
-                return jsonify({
+                return {
                     'status': 'error',
                     'message': f"end_location must include: {', '.join(required_fields)}"
-                }), 400
+                }, 400
             print(f"🏁 End Location: {end_loc['name']} ({end_loc['latitude']}, {end_loc['longitude']})")
         
+        deadline = request_deadline(data, started)
+
         # Check if user wants verbose output
         verbose = data.get('verbose', True)  # Default ke True untuk menampilkan GA progres
         # Optimize route with user preferences
@@ -155,7 +276,15 @@ def optimize_route():
             preferences, 
             crossover_method=crossover_method,  # ← Gunakan parameter user
             algorithm=algorithm,
-            verbose=verbose
+            verbose=verbose,
+            progress_callback=progress_callback,
+            parallel_workers=data.get('parallel_workers'),
+            stop_criteria=data.get('stop_criteria'),
+            deadline=deadline,
+            local_search=bool(data.get('local_search', False)),
+            islands=data.get('islands'),
+            result_cache=result_cache,
+            seed=data.get('seed')
         )
         
         # Add location info to response
@@ -168,32 +297,108 @@ def optimize_route():
 
         execution_time = (datetime.now() - start_time).total_seconds()
         print(f"✅ OPTIMIZATION COMPLETED in {execution_time:.2f}s")
-        print(f"🗺️ Best Route: {[optimizer.df_places.iloc[id-1]['name'] for id in result['route']]}")
+        print(f"🗺️ Best Route: {[optimizer.place_row(id)['name'] for id in result['route']]}")
         print(f"💰 Total Cost: Rp{result['total_cost']:,}")
         print(f"📈 Fitness Score: {result['fitness']:.2f}")
+        if result['truncated']:
+            print("⏱️ Deadline reached: returning best route found so far")
         
-        return jsonify({
+        return {
             'status': 'success',
+            'journey_id': journey_id,
             'data': result,
             'message': f'Optimized with {crossover_method} crossover and {algorithm} algorithm'
-        })
+                       + (' (served from cache)' if result['from_cache'] else '')
+        }, 200
         
     except ValueError as ve:
         print(f"❌ Validation Error: {str(ve)}")
-        return jsonify({
+        return {
             'status': 'error',
             'message': str(ve)
-        }), 400
+        }, 400
         
     except Exception as e:
         print(f"💥 Optimization Error: {str(e)}")
-        return jsonify({
+        return {
             'status': 'error',
             'message': str(e)
-        }), 500
+        }, 500
+
+
+@app.route('/api/optimize', methods=['POST'])
+@journey_endpoint
+def optimize_route(optimizer):
+    """Optimasi rute awal"""
+    body, status_code = run_optimize(optimizer, request.get_json() or {}, g.journey_id, started=g.request_started)
+    return jsonify(body), status_code
+
+@app.route('/api/optimize/batch', methods=['POST'])
+def optimize_batch():
+    """
+    Optimasi banyak set preferensi sekaligus (tanpa journey). Item dengan
+    fingerprint sama dioptimasi sekali; hasil di-stream sebagai NDJSON
+    sesuai urutan selesai. Error per item hanya menggagalkan item itu.
+    """
+    data = request.get_json(silent=True) or {}
+    started = g.request_started
+    try:
+        items = batch_items(data)
+    except ValueError as ve:
+        return jsonify({
+            'status': 'error',
+            'message': str(ve)
+        }), 400
+
+    def generate():
+        groups = {}
+        tasks = []
+        failed = 0
+        for index, item in enumerate(items):
+            item_id = item.get('id') if isinstance(item, dict) else None
+            try:
+                options = item_options(batch_planner, item)
+                deadline = request_deadline(options, started)
+            except ValueError as ve:
+                failed += 1
+                yield json.dumps({'index': index, 'id': item_id, 'status': 'error', 'http_status': 400,
+                                  'message': str(ve)}) + "\n"
+                continue
+            key = fingerprint(options)
+            if key not in groups:
+                groups[key] = []
+                tasks.append((key, options, deadline))
+            groups[key].append((index, item_id))
+
+        print(f"📦 Batch: {len(items)} item, {len(tasks)} unik")
+        if tasks:
+            for key, (body, status_code) in get_batch_pool(TourismOptimizer, place_data).run(tasks):
+                for position, (index, item_id) in enumerate(groups[key]):
+                    if status_code != 200:
+                        failed += 1
+                    line = {'index': index, 'id': item_id, 'fingerprint': key,
+                            'deduplicated': position > 0, 'http_status': status_code}
+                    line.update(body)
+                    yield json.dumps(line) + "\n"
+
+        yield json.dumps({
+            'status': 'done',
+            'summary': {
+                'items': len(items),
+                'unique': len(tasks),
+                'failed': failed,
+                'seconds': round(time.monotonic() - started, 3)
+            }
+        }) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 @app.route('/api/next-place', methods=['POST'])
-def next_place():
+@journey_endpoint
+def next_place(optimizer):
     """Menu 1: Lanjutkan ke tempat berikutnya"""
     print("➡️ NEXT PLACE REQUEST")
     try:
@@ -223,7 +428,8 @@ def next_place():
         }), 500
 
 @app.route('/api/reoptimize', methods=['POST'])
-def reoptimize_route():
+@journey_endpoint
+def reoptimize_route(optimizer):
     """Menu 2: Perbarui data real-time dan optimasi ulang rute"""
     try:
         data = request.get_json() or {}
@@ -244,7 +450,8 @@ def reoptimize_route():
         }), 500
 
 @app.route('/api/schedule', methods=['GET'])
-def get_schedule():
+@journey_endpoint
+def get_schedule(optimizer):
     """Menu 3: Lihat jadwal saat ini"""
     try:
         result = optimizer.get_current_schedule()
@@ -262,7 +469,8 @@ def get_schedule():
         }), 500
 
 @app.route('/api/route', methods=['GET'])
-def get_route():
+@journey_endpoint
+def get_route(optimizer):
     """Menu 4: Lihat rute saat ini"""
     try:
         result = optimizer.get_current_route()
@@ -280,7 +488,8 @@ def get_route():
         }), 500
 
 @app.route('/api/end-journey', methods=['POST'])
-def end_journey():
+@journey_endpoint
+def end_journey(optimizer):
     """Menu 5: Akhiri perjalanan"""
     try:
         result = optimizer.end_journey()
@@ -297,21 +506,52 @@ def end_journey():
             'message': str(e)
         }), 500
 
+def query_int(name, default=None, minimum=0):
+    """Parameter query integer (>= minimum) atau default"""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value}")
+    if value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}")
+    return value
+
+
 @app.route('/api/places', methods=['GET'])
 def get_places():
-    """Lihat semua tempat wisata yang tersedia"""
+    """
+    Lihat tempat wisata yang tersedia. Query opsional untuk katalog besar:
+    ?category=Alam, ?offset=0&limit=100 (tanpa limit = semua tempat)
+    """
     try:
-        places_data = optimizer.df_places.to_dict('records')
+        df = place_data.df_places
+        category = request.args.get('category')
+        if category:
+            df = df[df['category'] == category]
+        offset = query_int('offset', 0)
+        limit = query_int('limit', None, minimum=1)
+        page = df.iloc[offset:offset + limit if limit is not None else None]
+        places_data = page.to_dict('records')
         
         return jsonify({
             'status': 'success',
             'data': {
                 'places': places_data,
-                'total': len(places_data)
+                'total': len(df),
+                'offset': offset,
+                'limit': limit
             },
             'message': 'Data tempat wisata berhasil diambil'
         })
         
+    except ValueError as ve:
+        return jsonify({
+            'status': 'error',
+            'message': str(ve)
+        }), 400
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -319,7 +559,8 @@ def get_places():
         }), 500
 
 @app.route('/api/map', methods=['GET'])
-def get_map():
+@journey_endpoint
+def get_map(optimizer):
     """Dapatkan peta rute dalam format HTML"""
     try:
         map_html = optimizer.plot_route_on_map()
@@ -345,7 +586,8 @@ def get_map():
         }), 500
 
 @app.route('/api/status', methods=['GET'])
-def get_status():
+@journey_endpoint
+def get_status(optimizer):
     """Dapatkan status perjalanan saat ini"""
     try:
         current_route = optimizer.current_route
@@ -358,8 +600,8 @@ def get_status():
             if current_place_id:
                 current_place = {
                     'id': current_place_id,
-                    'name': optimizer.df_places.iloc[current_place_id-1]['name'],
-                    'category': optimizer.df_places.iloc[current_place_id-1]['category']
+                    'name': optimizer.place_row(current_place_id)['name'],
+                    'category': optimizer.place_row(current_place_id)['category']
                 }
             
             return jsonify({
@@ -393,11 +635,13 @@ def get_status():
 def reset_journey():
     """Reset state perjalanan"""
     try:
-        global optimizer
-        optimizer = TourismOptimizer()
+        # Request lain yang sedang berjalan tetap memakai sesi lamanya
+        session = sessions.reset(request_journey_id() or sessions.new_journey_id())
+        g.journey_id = session.journey_id
         
         return jsonify({
             'status': 'success',
+            'journey_id': session.journey_id,
             'message': 'State perjalanan berhasil direset'
         })
         
@@ -408,21 +652,14 @@ def reset_journey():
         }), 500
     
 
-@app.route('/api/next-and-reoptimize', methods=['POST'])
-def next_place_and_reoptimize():
+def run_next_and_reoptimize(optimizer, data, progress_callback=None, started=None):
+    """Isi endpoint /api/next-and-reoptimize; mengembalikan (body, http_status)"""
     print("==============================================================================================================================")
     print("➡️ NEXT PLACE AND REOPTIMIZED")
     # ✅ Fix: Import datetime di awal
     from datetime import datetime
     start_time = datetime.now()
-    """Gabungan Menu 1 & 2: Lanjut ke tempat berikutnya + Reoptimasi rute"""
     try:
-        # Handle both empty body and JSON body
-        if request.content_type == 'application/json':
-            data = request.get_json() or {}
-        else:
-            data = {}
-        
         # ✅ Fix: Cek parameter di 2 tempat (root level dan dalam body)
         crossover_method = data.get('crossover_method', 'original')
         algorithm = data.get('algorithm', 'simple')
@@ -434,19 +671,31 @@ def next_place_and_reoptimize():
         
         # ✅ Validate crossover_method and algorithm values
         valid_crossover = ['original', 'order', 'cycle']
-        valid_algorithm = ['simple', 'mu_plus_lambda', 'mu_comma_lambda']
+        valid_algorithm = ['simple', 'mu_plus_lambda', 'mu_comma_lambda', 'exact', 'auto', 'islands']
         
         if crossover_method not in valid_crossover:
-            return jsonify({
+            return {
                 'status': 'error',
                 'message': f"Invalid crossover_method. Valid options: {valid_crossover}"
-            }), 400
+            }, 400
             
         if algorithm not in valid_algorithm:
-            return jsonify({
+            return {
                 'status': 'error',
                 'message': f"Invalid algorithm. Valid options: {valid_algorithm}"
-            }), 400
+            }, 400
+
+        try:
+            deadline = request_deadline(data, started)
+            # Opsi island dan seed divalidasi sebelum pindah tempat (langkah 1 tidak bisa dibatalkan)
+            if algorithm == 'islands':
+                island_options(data.get('islands'), crossover_method)
+            TourismOptimizer.create_rng(data.get('seed'))
+        except ValueError as ve:
+            return {
+                'status': 'error',
+                'message': str(ve)
+            }, 400
 
         # Generate current time otomatis dari server
         current_time = datetime.now().strftime('%H:%M')
@@ -461,14 +710,14 @@ def next_place_and_reoptimize():
         if not next_place_result['success']:
             # Jika tidak bisa next place, return error
             print(f"❌ Cannot move to next place: {next_place_result['message']}")
-            return jsonify({
+            return {
                 'status': 'error',
                 'data': {
                     'next_place': next_place_result,
                     'reoptimize': None
                 },
                 'message': next_place_result['message']
-            })
+            }, 200
         
         print(f"✅ Successfully moved to: {next_place_result.get('current_place', {}).get('name', 'Unknown')}")
         
@@ -477,7 +726,14 @@ def next_place_and_reoptimize():
         reoptimize_result = optimizer.reoptimize_route_with_crossover(
             current_time, 
             crossover_method=crossover_method,
-            algorithm=algorithm
+            algorithm=algorithm,
+            progress_callback=progress_callback,
+            parallel_workers=data.get('parallel_workers'),
+            stop_criteria=data.get('stop_criteria'),
+            deadline=deadline,
+            local_search=bool(data.get('local_search', False)),
+            islands=data.get('islands'),
+            seed=data.get('seed')
         )
         
         print("✅ Reoptimization completed")
@@ -497,7 +753,8 @@ def next_place_and_reoptimize():
                 'new_position': next_place_result.get('current_position', 0),
                 'route_updated': reoptimize_result.get('success', False),
                 'weather_condition': reoptimize_result.get('dynamic_data', {}).get('weather', 'Unknown'),
-                'total_places_in_route': len(reoptimize_result.get('route_ids', []))
+                'total_places_in_route': len(reoptimize_result.get('route_ids', [])),
+                'truncated': reoptimize_result.get('truncated', False)
             }
         }
 
@@ -507,7 +764,7 @@ def next_place_and_reoptimize():
         # Safe logging
         try:
             if 'route_ids' in reoptimize_result and reoptimize_result['route_ids']:
-                route_names = [optimizer.df_places.iloc[id-1]['name'] for id in reoptimize_result['route_ids']]
+                route_names = [optimizer.place_row(id)['name'] for id in reoptimize_result['route_ids']]
                 print(f"🗺️ Updated Route: {route_names}")
             
             if 'budget_info' in reoptimize_result:
@@ -525,24 +782,120 @@ def next_place_and_reoptimize():
             'timestamp': datetime.now().isoformat()
         }
         
-        return jsonify({
+        return {
             'status': 'success',
             'data': combined_result,
             'message': f"Berhasil pindah dan reoptimasi dengan {crossover_method} crossover dan {algorithm} algorithm"
-        })
+        }, 200
         
     except Exception as e:
         print(f"💥 Next and Reoptimize Error: {str(e)}")
         print(f"💥 Error type: {type(e).__name__}")
         import traceback
         print(f"💥 Traceback: {traceback.format_exc()}")
-        return jsonify({
+        return {
             'status': 'error',
             'message': f"Error dalam proses gabungan: {str(e)}"
-        }), 500
+        }, 500
+
+
+@app.route('/api/next-and-reoptimize', methods=['POST'])
+@journey_endpoint
+def next_place_and_reoptimize(optimizer):
+    """Gabungan Menu 1 & 2: Lanjut ke tempat berikutnya + Reoptimasi rute"""
+    body, status_code = run_next_and_reoptimize(optimizer, request_body(), started=g.request_started)
+    return jsonify(body), status_code
     
+def submit_journey_job(kind, runner):
+    """Jalankan runner(optimizer, job) di background dengan lock sesi journey"""
+    session = sessions.get(request_journey_id())
+    g.journey_id = session.journey_id
+
+    def run(job):
+        with session.lock:
+            return runner(session.optimizer, job)
+
+    job = jobs.submit(kind, session.journey_id, run)
+    return jsonify({
+        'status': 'success',
+        'journey_id': session.journey_id,
+        'data': {
+            'job_id': job.job_id,
+            'status': job.status,
+            'status_url': f"/api/jobs/{job.job_id}",
+            'events_url': f"/api/jobs/{job.job_id}/events"
+        },
+        'message': 'Job optimasi diterima'
+    }), 202
+
+
+@app.route('/api/jobs/optimize', methods=['POST'])
+def submit_optimize_job():
+    """Versi asinkron /api/optimize: kembalikan job ID, GA berjalan di background"""
+    data = request.get_json(silent=True) or {}
+    started = g.request_started
+    return submit_journey_job('optimize', lambda optimizer, job: run_optimize(
+        optimizer, data, job.journey_id, progress_callback=job.report_generation, started=started
+    ))
+
+
+@app.route('/api/jobs/next-and-reoptimize', methods=['POST'])
+def submit_next_and_reoptimize_job():
+    """Versi asinkron /api/next-and-reoptimize"""
+    data = request_body()
+    started = g.request_started
+    return submit_journey_job('next-and-reoptimize', lambda optimizer, job: run_next_and_reoptimize(
+        optimizer, data, progress_callback=job.report_generation, started=started
+    ))
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status job (polling); 'result' berisi body respons endpoint sinkron setelah selesai"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Job tidak ditemukan'
+        }), 404
+
+    return jsonify({
+        'status': 'success',
+        'data': job.to_dict(),
+        'message': f"Job {job.status}"
+    })
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """Server-Sent Events: statistik per generasi (avg/max/min/std) lalu hasil akhir"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Job tidak ditemukan'
+        }), 404
+
+    def generate():
+        index = 0
+        while True:
+            events, index, finished = job.wait_events(index)
+            for event in events:
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+            if finished and not events:
+                break
+            if not events:
+                yield ": keep-alive\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
 @app.route('/api/previous-route', methods=['GET'])
-def get_previous_route():
+@journey_endpoint
+def get_previous_route(optimizer):
     """Dapatkan rute sebelumnya (simple)"""
     try:
         previous = optimizer.get_previous_route()
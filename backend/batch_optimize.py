@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import random
+import threading
+
+from result_cache import create_result_cache
+from shared_data import load_place_data, pool_context
+
+# Jumlah process untuk /api/optimize/batch dan batas item per request
+BATCH_WORKERS = int(os.environ.get('TOURISM_BATCH_WORKERS', os.cpu_count() or 1))
+MAX_BATCH_ITEMS = int(os.environ.get('TOURISM_BATCH_MAX_ITEMS', 200))
+
+# Field level atas body batch yang menjadi default setiap item
+SHARED_FIELDS = ('crossover_method', 'algorithm', 'stop_criteria', 'local_search', 'deadline_ms', 'seed')
+# Worker batch sudah satu process per item; 'islands' butuh process pool sendiri
+BATCH_ALGORITHMS = ('simple', 'mu_plus_lambda', 'mu_comma_lambda', 'exact', 'auto')
+
+# Optimizer satu per process worker, diisi sekali oleh initializer
+_WORKER = {}
+
+
+def _init_batch_worker(optimizer_class, place_data, directory=None):
+    if directory is not None:
+        place_data = load_place_data(directory)
+    _WORKER['optimizer'] = optimizer_class(place_data=place_data)
+    _WORKER['result_cache'] = create_result_cache()
+
+
+def _optimize_item(args):
+    fingerprint, options, run_seed, deadline = args
+    return fingerprint, optimize_item(_WORKER['optimizer'], options, deadline, _WORKER['result_cache'], run_seed)
+
+
+def batch_items(data):
+    """
+    Daftar item dari body batch: 'items' (list body /api/optimize), field
+    SHARED_FIELDS di level atas menjadi default tiap item
+    """
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        raise ValueError("items must be a non-empty list")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise ValueError(f"items must contain <= {MAX_BATCH_ITEMS} entries")
+    shared = {key: data[key] for key in SHARED_FIELDS if key in data}
+    return [dict(shared, **item) if isinstance(item, dict) else item for item in items]
+
+
+def item_options(optimizer, item):
+    """
+    Opsi optimasi satu item yang sudah dinormalisasi (preferensi digabung
+    dengan default), dipakai untuk fingerprint dan dikirim ke worker
+    """
+    if not isinstance(item, dict):
+        raise ValueError("each item must be an object")
+    preferences = dict(item.get('preferences') or {})
+    crossover_method = item.get('crossover_method') or preferences.pop('crossover_method', 'original')
+    algorithm = item.get('algorithm') or preferences.pop('algorithm', 'simple')
+    preferences.pop('crossover_method', None)
+    preferences.pop('algorithm', None)
+    if crossover_method not in ('original', 'order', 'cycle'):
+        raise ValueError(f"Invalid crossover_method '{crossover_method}'")
+    if algorithm not in BATCH_ALGORITHMS:
+        raise ValueError(f"Invalid algorithm for batch. Valid options: {list(BATCH_ALGORITHMS)}")
+    seed = item.get('seed')
+    if seed is not None:
+        _, seed = optimizer.create_rng(seed)
+    return {
+        'preferences': optimizer.create_user_preferences(preferences),
+        'crossover_method': crossover_method,
+        'algorithm': algorithm,
+        'stop_criteria': item.get('stop_criteria'),
+        'local_search': bool(item.get('local_search', False)),
+        'deadline_ms': item.get('deadline_ms'),
+        'seed': seed
+    }
+
+
+def fingerprint(options):
+    """Hash opsi ternormalisasi; item dengan fingerprint sama dioptimasi sekali"""
+    return hashlib.sha256(json.dumps(options, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def optimize_item(optimizer, options, deadline=None, result_cache=None, run_seed=None):
+    """
+    Optimasi satu item batch; mengembalikan (body, http_status) seperti
+    /api/optimize. run_seed: seed run untuk item tanpa 'seed' (lihat
+    optimize_route_with_crossover_choice)
+    """
+    try:
+        result = optimizer.optimize_route_with_crossover_choice(
+            options['preferences'],
+            crossover_method=options['crossover_method'],
+            algorithm=options['algorithm'],
+            verbose=False,
+            parallel_workers=0,
+            stop_criteria=options['stop_criteria'],
+            deadline=deadline,
+            local_search=options['local_search'],
+            result_cache=result_cache,
+            seed=options['seed'],
+            run_seed=run_seed
+        )
+        return {
+            'status': 'success',
+            'data': result,
+            'message': f"Optimized with {options['crossover_method']} crossover and {options['algorithm']} algorithm"
+        }, 200
+    except ValueError as ve:
+        return {'status': 'error', 'message': str(ve)}, 400
+    except Exception as e:
+        print(f"💥 Batch item error: {str(e)}")
+        return {'status': 'error', 'message': str(e)}, 500
+
+
+class BatchPool:
+    """
+    Process pool untuk batch optimasi. Seperti IslandPool, setiap worker
+    membuat optimizer sekali dari PlaceData bersama (memory-mapped jika ada
+    direktori cache); task hanya membawa opsi item.
+    """
+
+    def __init__(self, optimizer_class, place_data, processes):
+        self.processes = processes
+        if place_data.directory is not None:
+            initargs = (optimizer_class, None, place_data.directory)
+        else:
+            initargs = (optimizer_class, place_data)
+        self._pool = pool_context().Pool(processes=processes, initializer=_init_batch_worker,
+                                         initargs=initargs)
+
+    def run(self, tasks):
+        """
+        tasks: list (fingerprint, options, deadline). Yield (fingerprint,
+        (body, http_status)) sesuai urutan selesai, bukan urutan input.
+        Setiap task membawa run_seed sendiri (dari parent) untuk item tanpa seed.
+        """
+        tasks = [(key, options, random.getrandbits(32), deadline) for key, options, deadline in tasks]
+        return self._pool.imap_unordered(_optimize_item, tasks)
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_batch_pool(optimizer_class, place_data, processes=None):
+    """Pool dipakai ulang antar request batch untuk PlaceData yang sama"""
+    processes = max(1, processes or BATCH_WORKERS)
+    key = (id(place_data), processes)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = BatchPool(optimizer_class, place_data, processes)
+            _POOLS[key] = pool
+        return pool
+
+
+def shutdown_batch_pools():
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
@@ -0,0 +1,925 @@
+"""
+Micro-benchmark untuk jalur evaluasi TourismOptimizer.
+
+Jalankan: python benchmark.py [nama_benchmark ...]
+"""
+import random
+import shutil
+import sys
+import time
+from datetime import datetime, timedelta
+
+import geopy.distance as geodist
+import numpy as np
+import pandas as pd
+
+from distance import haversine_matrix, load_or_build_distance_matrix
+from parallel import ParallelEvaluator
+from place_catalog import PlaceCatalog, PlaceData
+from tourism_optimizer import TourismOptimizer
+from travel_time import HOURS_PER_DAY, TravelTimeModel, free_flow_table
+
+
+def legacy_eval_route(route, df_places, preferences, distance_matrix, time_matrix):
+    """Evaluasi versi lama (df_places.iloc per gen) sebagai pembanding"""
+    if not route:
+        return (1.0,)
+
+    place_count_score = len(route) / preferences['max_places']
+
+    total_distance = 0
+    start_loc = (preferences['start_location']['latitude'], preferences['start_location']['longitude'])
+    first_loc = (df_places.iloc[route[0]-1]['latitude'], df_places.iloc[route[0]-1]['longitude'])
+    total_distance += geodist.distance(start_loc, first_loc).km
+    for i in range(len(route)-1):
+        total_distance += float(distance_matrix[route[i]-1][route[i+1]-1])
+    end_loc = (preferences['end_location']['latitude'], preferences['end_location']['longitude'])
+    last_loc = (df_places.iloc[route[-1]-1]['latitude'], df_places.iloc[route[-1]-1]['longitude'])
+    total_distance += geodist.distance(last_loc, end_loc).km
+    distance_score = max(0, 1 - (total_distance / 200))
+
+    category_matches = sum(1 for place_id in route
+                           if df_places.iloc[place_id-1]['category'] in preferences['preferred_categories'])
+    category_score = category_matches / len(route)
+    popularity_score = sum(df_places.iloc[place_id-1]['popularity'] for place_id in route)
+    popularity_score = (popularity_score / len(route)) / 10.0
+
+    base_fitness = (
+        0.40 * place_count_score +
+        0.15 * distance_score +
+        0.20 * category_score +
+        0.25 * popularity_score
+    ) * 100
+
+    penalty_multiplier = 1.0
+    budget_used = sum(df_places.iloc[place_id-1]['entrance_fee'] for place_id in route)
+    if budget_used > preferences['budget']:
+        penalty_multiplier *= max(0.5, preferences['budget'] / budget_used)
+
+    must_visit_count = len(preferences['must_visit'])
+    if must_visit_count > 0:
+        visited_must = sum(1 for place_id in preferences['must_visit'] if place_id in route)
+        penalty_multiplier *= (0.3 + 0.7 * visited_must / must_visit_count)
+
+    current_time = datetime.strptime(preferences['start_time'], '%H:%M')
+    end_time = datetime.strptime(preferences['end_time'], '%H:%M')
+    for i, place_id in enumerate(route):
+        place = df_places.iloc[place_id-1]
+        if i > 0:
+            current_time += timedelta(minutes=float(time_matrix[route[i-1]-1][place_id-1]))
+        current_time += timedelta(minutes=int(place['visit_duration_min']))
+        if current_time > end_time:
+            penalty_multiplier *= 0.7
+            break
+
+    return (max(1.0, float(base_fitness * penalty_multiplier)),)
+
+
+def random_routes(optimizer, count, max_places=6, seed=42):
+    rng = random.Random(seed)
+    place_ids = optimizer.catalog.all_ids
+    return [rng.sample(place_ids, rng.randint(1, max_places)) for _ in range(count)]
+
+
+def time_per_call(func, routes, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for route in routes:
+            func(route)
+        best = min(best, time.perf_counter() - start)
+    return best / len(routes)
+
+
+def bench_eval(n_routes=500):
+    """Biaya per evaluasi: df_places.iloc (lama) vs PlaceCatalog (baru)"""
+    # geodesic supaya jarak leg sama persis dengan evaluator lama
+    optimizer = TourismOptimizer(distance_method='geodesic')
+    preferences = optimizer.create_user_preferences()
+    dynamic_data = optimizer.create_dynamic_data()
+    routes = random_routes(optimizer, n_routes)
+    # Evaluator lama memakai faktor lalu lintas tetap 1.2 untuk semua jam
+    legacy_time_matrix = optimizer.create_travel_time_matrix(optimizer.distance_matrix, 1.2)
+    travel_times = TravelTimeModel(optimizer.distance_matrix, {hour: 1.2 for hour in range(HOURS_PER_DAY)})
+
+    def legacy(route):
+        return legacy_eval_route(route, optimizer.df_places, preferences,
+                                 optimizer.distance_matrix, legacy_time_matrix)
+
+    def catalog(route):
+        return optimizer.eval_route_fixed(route, optimizer.df_places, preferences,
+                                          optimizer.distance_matrix, travel_times, dynamic_data)
+
+    mismatches = sum(1 for route in routes if legacy(route) != catalog(route))
+    legacy_us = time_per_call(legacy, routes) * 1e6
+    catalog_us = time_per_call(catalog, routes) * 1e6
+
+    print(f"📊 eval_route_fixed ({n_routes} rute acak)")
+    print(f"   df_places.iloc : {legacy_us:8.1f} µs/evaluasi")
+    print(f"   PlaceCatalog   : {catalog_us:8.1f} µs/evaluasi")
+    print(f"   Speedup        : {legacy_us / catalog_us:8.1f}x")
+    print(f"   Fitness berbeda: {mismatches}")
+
+
+def bench_batch(population_size=50, n_populations=40):
+    """Satu generasi: eval_route_fixed per individu vs evaluate_population sekali jalan"""
+    optimizer = TourismOptimizer()
+    optimizer.preferences = optimizer.create_user_preferences()
+    optimizer.dynamic_data = optimizer.create_dynamic_data()
+    rng = random.Random(7)
+    populations = [random_routes(optimizer, population_size, seed=rng.random()) for _ in range(n_populations)]
+
+    def scalar(population):
+        return [optimizer.eval_route_fixed(route, optimizer.df_places, optimizer.preferences,
+                                           optimizer.distance_matrix, optimizer.travel_times,
+                                           optimizer.dynamic_data)
+                for route in population]
+
+    scalar_ms = time_per_call(scalar, populations) * 1e3
+    batch_ms = time_per_call(optimizer.evaluate_population, populations) * 1e3
+
+    print(f"📊 Evaluasi populasi ({population_size} individu)")
+    print(f"   Skalar (loop)  : {scalar_ms:8.2f} ms/generasi")
+    print(f"   Batch (NumPy)  : {batch_ms:8.2f} ms/generasi")
+    print(f"   Speedup        : {scalar_ms / batch_ms:8.1f}x")
+
+
+def legacy_distance_matrix(df):
+    """Double loop df.iloc + geopy (versi lama create_distance_matrix)"""
+    n = len(df)
+    matrix = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                point1 = (df.iloc[i]['latitude'], df.iloc[i]['longitude'])
+                point2 = (df.iloc[j]['latitude'], df.iloc[j]['longitude'])
+                matrix[i][j] = geodist.distance(point1, point2).km
+    return matrix
+
+
+def synthetic_coordinates(n, seed=0):
+    """Koordinat acak di sekitar DIY untuk katalog sintetis"""
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-8.2, -7.5, n), rng.uniform(110.0, 110.8, n)
+
+
+def bench_matrix(sizes=(15, 500, 3000)):
+    """Startup matriks jarak: loop geopy vs haversine vektor vs cache .npy"""
+    import tempfile
+
+    df = TourismOptimizer().df_places
+    start = time.perf_counter()
+    legacy = legacy_distance_matrix(df)
+    legacy_s = time.perf_counter() - start
+    max_error = np.abs(haversine_matrix(df['latitude'], df['longitude']) - legacy).max()
+
+    print("📊 Matriks jarak")
+    print(f"   n=15   loop geopy (lama)     : {legacy_s * 1e3:9.1f} ms (selisih haversine maks {max_error:.3f} km)")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for n in sizes:
+            lat, lon = synthetic_coordinates(n)
+            start = time.perf_counter()
+            load_or_build_distance_matrix(lat, lon, cache_dir=cache_dir)
+            build_s = time.perf_counter() - start
+            start = time.perf_counter()
+            load_or_build_distance_matrix(lat, lon, cache_dir=cache_dir)
+            cached_s = time.perf_counter() - start
+            print(f"   n={n:<5} haversine+simpan cache : {build_s * 1e3:9.1f} ms | cache mmap: {cached_s * 1e3:7.2f} ms")
+
+
+def synthetic_place_data(n, seed=0):
+    """PlaceData sintetis dengan n tempat (koordinat & atribut acak)"""
+    rng = np.random.default_rng(seed)
+    lat, lon = synthetic_coordinates(n, seed)
+    categories = np.array(['Budaya', 'Alam', 'Belanja', 'Rekreasi'])
+    open_hours = rng.integers(6, 10, n)
+    df = pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'name': [f"Tempat {i}" for i in range(1, n + 1)],
+        'latitude': lat,
+        'longitude': lon,
+        'category': categories[rng.integers(0, len(categories), n)],
+        'open_time': [f"{h:02d}:00" for h in open_hours],
+        'close_time': [f"{h + 9:02d}:00" for h in open_hours],
+        'visit_duration_min': rng.choice([30, 60, 90, 120], n),
+        'entrance_fee': rng.choice([0, 5000, 10000, 25000, 50000], n),
+        'popularity': np.round(rng.uniform(6.0, 9.8, n), 1),
+        'crowdedness_factor': np.round(rng.uniform(0.3, 0.9, n), 1)
+    })
+    distance_matrix = load_or_build_distance_matrix(lat, lon, cache_dir=None)
+    return PlaceData(df, PlaceCatalog.from_dataframe(df), 'haversine', distance_matrix)
+
+
+def bench_parallel(n_places=2000, population_size=4000, route_length=25, worker_counts=(1, 2, 4, 8)):
+    """Skala evaluasi fitness dengan process pool pada katalog sintetis besar"""
+    import os
+
+    place_data = synthetic_place_data(n_places)
+    optimizer = TourismOptimizer(place_data=place_data)
+    preferences = optimizer.create_user_preferences({'max_places': route_length, 'budget': 10 ** 7})
+    rng = random.Random(3)
+    population = [rng.sample(range(1, n_places + 1), route_length) for _ in range(population_size)]
+
+    print(f"📊 Evaluasi paralel ({n_places} tempat, {population_size} rute x {route_length} tempat, {os.cpu_count()} CPU)")
+    baseline = None
+    for workers in worker_counts:
+        if workers == 1:
+            evaluate = lambda routes: optimizer.evaluate_population(routes, preferences)
+            evaluator = None
+        else:
+            evaluator = ParallelEvaluator(place_data, workers)
+            evaluate = lambda routes: evaluator.evaluate(routes, preferences, optimizer.travel_times.fingerprint())
+        evaluate(population[:workers])  # warm-up: legs per worker
+        elapsed = min(_timed(evaluate, population) for _ in range(3))
+        baseline = baseline or elapsed
+        print(f"   {workers} worker : {elapsed * 1e3:8.1f} ms/generasi  (speedup {baseline / elapsed:4.2f}x)")
+        if evaluator:
+            evaluator.close()
+
+
+def bench_exact(cases=({'max_places': 3}, {'max_places': 4, 'budget': 50000}, {'must_visit': [7], 'max_places': 4})):
+    """Solver eksak vs enumerasi brute-force semua rute (harus sama), dan vs GA default"""
+    import itertools
+
+    optimizer = TourismOptimizer()
+    print("📊 Exact solver vs brute force vs GA")
+    for case in cases:
+        result = optimizer.optimize_route_with_crossover_choice(dict(case), algorithm='exact', verbose=False)
+        preferences = optimizer.preferences
+        candidates = [i for i in optimizer.catalog.all_ids if i not in preferences['avoid_places']]
+        routes = [list(order)
+                  for k in range(1, preferences['max_places'] + 1)
+                  for subset in itertools.combinations(candidates, k)
+                  if optimizer.catalog.total_fee(subset) <= preferences['budget']
+                  for order in itertools.permutations(subset)]
+        brute = max(fit[0] for fit in optimizer.evaluate_population(routes))
+
+        start = time.perf_counter()
+        ga = optimizer.optimize_route_with_crossover_choice(dict(case), verbose=False, seed=1)
+        ga_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        optimizer.optimize_route_with_crossover_choice(dict(case), algorithm='exact', verbose=False)
+        exact_elapsed = time.perf_counter() - start
+
+        status = "OK" if abs(result['fitness'] - brute) < 1e-9 else "MISMATCH"
+        print(f"   {case}: exact {result['fitness']:.4f} ({exact_elapsed * 1e3:.0f} ms) | "
+              f"brute {brute:.4f} ({len(routes)} rute) | GA {ga['fitness']:.4f} ({ga_elapsed * 1e3:.0f} ms) {status}")
+
+    # Jalur legacy /api/reoptimize (optimize_route) tidak ikut dispatch exact/auto
+    optimizer.optimize_route_with_crossover_choice(verbose=False)
+    optimizer.get_next_place()
+    reoptimized = optimizer.reoptimize_route("14:00")
+    print(f"   reoptimize (legacy): {len(reoptimized['updated_route'])} tempat, OK")
+
+
+def bench_warm_start(seeds=range(32), sizes=(None, 300)):
+    """
+    Reoptimasi warm-start vs cold-run (baseline) pada perubahan yang sama
+    (dua tempat di rute awal ditutup): generasi, evaluasi, fitness.
+    sizes: None = katalog bawaan, angka = katalog sintetis n tempat
+    """
+    import os
+    import tempfile
+
+    print("📊 Warm-start vs cold-run reoptimasi")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            if n is None:
+                optimizer = TourismOptimizer()
+            else:
+                path = os.path.join(tmp, 'places.csv')
+                synthetic_places_csv(path, n)
+                os.environ['TOURISM_CATALOG_PATH'] = path
+                try:
+                    optimizer = TourismOptimizer()
+                finally:
+                    del os.environ['TOURISM_CATALOG_PATH']
+                discard_place_data_cache(optimizer)
+            totals = {'warm': np.zeros(3), 'cold': np.zeros(3)}
+            worse = 0
+            for seed in seeds:
+                first = optimizer.optimize_route_with_crossover_choice(verbose=False, seed=seed)
+                must_visit = optimizer.preferences['must_visit']
+                closed = [place_id for place_id in first['route'] if place_id not in must_visit][:2]
+                preferences = {'avoid_places': closed, 'max_places': len(first['route'])}
+                seed_routes = optimizer.build_warm_start_seeds(first['route'], optimizer.create_user_preferences(preferences))
+                runs = {
+                    'warm': optimizer.optimize_route_with_crossover_choice(
+                        dict(preferences), verbose=False, seed_routes=seed_routes, seed=seed),
+                    'cold': optimizer.optimize_route_with_crossover_choice(dict(preferences), verbose=False, seed=seed)
+                }
+                for name, result in runs.items():
+                    stats = result['evolution_stats']
+                    totals[name] += (stats['generations'] - 1, stats['evaluations'], result['fitness'])
+                worse += runs['warm']['fitness'] < runs['cold']['fitness'] - 1e-9
+
+        count = len(seeds)
+        print(f"   {n or len(optimizer.catalog)} tempat, {count} seed:")
+        for name, (generations, evaluations, fitness) in totals.items():
+            print(f"      {name}: {generations / count:5.1f} generasi, {evaluations / count:6.0f} evaluasi, "
+                  f"fitness rata-rata {fitness / count:.4f}")
+        saved = (totals['cold'][0] - totals['warm'][0]) / count
+        print(f"      generasi dihemat vs cold-run: {saved:.1f} per reoptimasi, "
+              f"warm lebih buruk: {worse} dari {count}")
+
+
+def bench_memetic(seeds=range(10), generations=(5, 10, 20)):
+    """GA dengan vs tanpa local search pada jumlah generasi tetap (rata-rata beberapa seed)"""
+    optimizer = TourismOptimizer()
+    print("📊 Memetic GA (local search) vs GA biasa")
+    for ngen in generations:
+        for local_search in (False, True):
+            fitness = []
+            start = time.perf_counter()
+            for seed in seeds:
+                result = optimizer.optimize_route_with_crossover_choice(
+                    verbose=False, local_search=local_search,
+                    stop_criteria={'max_generations': ngen, 'stagnation_generations': 0}, seed=seed
+                )
+                fitness.append(result['fitness'])
+            elapsed = (time.perf_counter() - start) / len(fitness)
+            label = "local search" if local_search else "GA biasa    "
+            print(f"   {ngen:3d} generasi, {label}: rata-rata {np.mean(fitness):.4f}, "
+                  f"terburuk {min(fitness):.4f}, {elapsed * 1e3:.0f} ms/run")
+
+
+def bench_route_state(n_routes=300, seed=5):
+    """Waktu skor langkah RouteState (delta) vs evaluasi penuh, lalu lintas flat vs per jam.
+    Kesamaan hasil diuji di tests/test_route_state.py"""
+    from route_state import RouteContext, RouteState
+
+    optimizer = TourismOptimizer()
+    preferences = optimizer.create_user_preferences()
+    start_leg, end_leg = optimizer.get_leg_distances(preferences)
+    n_places = len(optimizer.catalog)
+    traffic_modes = {
+        'flat': {hour: 1.0 for hour in range(HOURS_PER_DAY)},
+        'per jam': {hour: (1.5 if 7 <= hour <= 9 or 16 <= hour <= 18 else 1.0) for hour in range(HOURS_PER_DAY)}
+    }
+
+    print("📊 RouteState delta vs eval_route_fixed")
+    for label, traffic in traffic_modes.items():
+        optimizer.set_dynamic_data(dict(optimizer.create_dynamic_data(), traffic_by_hour=traffic))
+        context = RouteContext(optimizer.catalog, preferences, optimizer.distance_matrix,
+                               optimizer.travel_times, start_leg, end_leg)
+        rng = random.Random(seed)
+        checks = 0
+        delta_time = full_time = 0.0
+
+        for _ in range(n_routes):
+            route = rng.sample(range(1, n_places + 1), rng.randint(2, min(10, n_places - 1)))
+            state = RouteState(context, route)
+            k = len(route)
+            i, j = sorted(rng.sample(range(k), 2))
+            outside = rng.choice([p for p in range(n_places) if p not in state.path])
+            moves = [
+                ('swap', (i, j)), ('reverse', (i, j)), ('relocate', (i, j)), ('relocate', (j, i)),
+                ('remove', (i,)), ('replace', (i, outside)), ('insert', (outside, rng.randint(0, k)))
+            ]
+            for kind, args in moves:
+                start = time.perf_counter()
+                getattr(state, f"score_{kind}")(*args)
+                delta_time += time.perf_counter() - start
+
+                moved = RouteState(context, route)
+                getattr(moved, f"apply_{kind}")(*args)
+                start = time.perf_counter()
+                optimizer.eval_route_fixed(moved.route, optimizer.df_places, preferences,
+                                           optimizer.distance_matrix, optimizer.travel_times, None)
+                full_time += time.perf_counter() - start
+                checks += 1
+
+        print(f"   {label:8s} delta: {delta_time / checks * 1e6:7.1f} µs/langkah, "
+              f"penuh: {full_time / checks * 1e6:7.1f} µs/langkah ({checks} langkah)")
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def bench_travel_time(sizes=(15, 300, 1500), n_lookups=200000, seed=3):
+    """TravelTimeModel: tabel free-flow bersama vs hitung dari jarak (harus sama), update satu jam, memori per journey"""
+    rng = np.random.default_rng(seed)
+    traffic = {hour: float(rng.choice([1.0, 1.2, 1.5])) for hour in range(HOURS_PER_DAY)}
+
+    print("📊 Model waktu tempuh per jam")
+    for n in sizes:
+        lat, lon = synthetic_coordinates(n)
+        distances = haversine_matrix(lat, lon)
+        shared = free_flow_table(distances, max_bytes=float('inf'))
+        table = TravelTimeModel(distances, traffic, free_flow=shared)
+        direct = TravelTimeModel(distances, traffic)
+        hours = rng.integers(0, HOURS_PER_DAY, n_lookups)
+        a, b = rng.integers(0, n, n_lookups), rng.integers(0, n, n_lookups)
+        mismatches = int((table.lookup(hours, a, b) != direct.lookup(hours, a, b)).sum())
+
+        timings = []
+        for model in (table, direct):
+            start = time.perf_counter()
+            for _ in range(10):
+                model.lookup(hours, a, b)
+            timings.append((time.perf_counter() - start) / 10 / n_lookups * 1e9)
+
+        start = time.perf_counter()
+        table.update_hour(8, table.factor(8) * 1.3)
+        update_ms = (time.perf_counter() - start) * 1e3
+        # State per journey hanya array faktor jam; tabel n x n dibagi semua journey
+        print(f"   n={n:5d}: tabel bersama {timings[0]:5.1f} ns/lookup ({shared.nbytes / 1e6:6.1f} MB sekali), "
+              f"dari jarak {timings[1]:5.1f} ns/lookup, per journey {table.factors.nbytes} B, "
+              f"update 1 jam {update_ms:6.3f} ms, berbeda: {mismatches}")
+
+
+def synthetic_places_csv(path, n, seed=0):
+    """Katalog sintetis n tempat dengan place ID acak (tidak berurutan)"""
+    rng = np.random.default_rng(seed)
+    lat, lon = synthetic_coordinates(n, seed)
+    ids = rng.choice(np.arange(100, 100 * n), n, replace=False)
+    pd.DataFrame({
+        'id': ids, 'name': [f"Tempat {place_id}" for place_id in ids],
+        'category': rng.choice(['Budaya', 'Alam', 'Belanja', 'Rekreasi'], n),
+        'latitude': lat, 'longitude': lon, 'open_time': '08:00', 'close_time': '17:00',
+        'visit_duration_min': rng.integers(30, 180, n), 'entrance_fee': rng.integers(0, 50, n) * 1000,
+        'popularity': rng.uniform(5, 10, n).round(1), 'description': 'tidak dibaca loader'
+    }).to_csv(path, index=False)
+    return ids
+
+
+def discard_place_data_cache(optimizer):
+    """Hapus direktori cache PlaceData katalog sementara (array yang sudah dipetakan tetap valid)"""
+    if optimizer.place_data.directory:
+        shutil.rmtree(optimizer.place_data.directory, ignore_errors=True)
+
+
+def bench_catalog(sizes=(1000, 5000)):
+    """Katalog besar dari CSV (ID tidak berurutan): startup (load, validasi, matriks) dan satu optimasi"""
+    import os
+    import tempfile
+
+    print("📊 Katalog dari file")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, f"places_{n}.csv")
+            ids = synthetic_places_csv(path, n)
+            os.environ['TOURISM_CATALOG_PATH'] = path
+            try:
+                start = time.perf_counter()
+                optimizer = TourismOptimizer()
+                startup_s = time.perf_counter() - start
+                discard_place_data_cache(optimizer)
+                start = time.perf_counter()
+                result = optimizer.optimize_route_with_crossover_choice({'must_visit': [int(ids[0])]}, verbose=False,
+                                                                        seed=0)
+                optimize_s = time.perf_counter() - start
+            finally:
+                del os.environ['TOURISM_CATALOG_PATH']
+            print(f"   n={n:5d}: startup {startup_s * 1e3:7.0f} ms, optimasi {optimize_s * 1e3:5.0f} ms, fitness {result['fitness']:.2f}")
+
+
+def bench_spatial(n_places=5000, n_queries=300, runs=3, seed=4):
+    """SpatialIndex vs brute force (harus sama), dan GA dengan kandidat terdekat vs acak seragam"""
+    import os
+    import tempfile
+
+    from distance import haversine_to_point
+    from spatial_index import SpatialIndex
+
+    rng = np.random.default_rng(seed)
+    lat, lon = synthetic_coordinates(n_places, seed)
+    index = SpatialIndex(lat, lon)
+    mismatches = 0
+    grid_time = brute_time = 0.0
+    for _ in range(n_queries):
+        point = (rng.uniform(-8.3, -7.4), rng.uniform(109.9, 110.9))
+        k = int(rng.integers(1, 80))
+        start = time.perf_counter()
+        nearest = index.nearest(*point, k)
+        within = index.within(*point, 5.0)
+        grid_time += time.perf_counter() - start
+        start = time.perf_counter()
+        distances = haversine_to_point(lat, lon, point)
+        expected = np.argsort(distances, kind='stable')[:k]
+        brute_time += time.perf_counter() - start
+        mismatches += not np.array_equal(distances[nearest], distances[expected])
+        mismatches += set(within.tolist()) != set(np.flatnonzero(distances <= 5.0).tolist())
+
+    print(f"📊 SpatialIndex ({n_places} tempat, sel {index.cell_km:.2f} km)")
+    print(f"   grid (kNN + radius): {grid_time / n_queries * 1e6:7.1f} µs/query")
+    print(f"   brute force        : {brute_time / n_queries * 1e6:7.1f} µs/query")
+    print(f"   Hasil berbeda      : {mismatches} dari {2 * n_queries}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'places.csv')
+        ids = synthetic_places_csv(path, n_places, seed)
+        os.environ['TOURISM_CATALOG_PATH'] = path
+        try:
+            optimizer = TourismOptimizer()
+            discard_place_data_cache(optimizer)
+        finally:
+            del os.environ['TOURISM_CATALOG_PATH']
+        preferences = {'must_visit': [int(ids[0])], 'start_location': {
+            'name': 'Hotel', 'latitude': float(lat[0]), 'longitude': float(lon[0])}}
+        for label, min_places in (("acak seragam", n_places + 1), ("tetangga    ", 0)):
+            optimizer.SPATIAL_MIN_PLACES = min_places
+            fitness = []
+            start = time.perf_counter()
+            for run in range(runs):
+                result = optimizer.optimize_route_with_crossover_choice(dict(preferences), verbose=False, seed=run)
+                fitness.append(result['fitness'])
+            elapsed = (time.perf_counter() - start) / runs
+            print(f"   GA {label}: fitness rata-rata {np.mean(fitness):.2f}, {elapsed * 1e3:.0f} ms/run")
+
+
+def bench_sparse(sizes=(5000, 20000), n_lookups=200000, seed=6):
+    """Backend jarak dense n x n vs SparseDistanceMatrix (kNN CSR + haversine on-demand): memori, latensi, nilai"""
+    import os
+    import tempfile
+
+    from sparse_distance import SparseDistanceMatrix
+
+    rng = np.random.default_rng(seed)
+    print("📊 Backend jarak: dense vs sparse kNN")
+    for n in sizes:
+        lat, lon = synthetic_coordinates(n, seed)
+        start = time.perf_counter()
+        sparse = SparseDistanceMatrix(lat, lon)
+        sparse_build = time.perf_counter() - start
+        dense = None
+        if n <= 10000:
+            start = time.perf_counter()
+            dense = haversine_matrix(lat, lon)
+            dense_build = time.perf_counter() - start
+
+        # Pola akses GA: sebagian besar pasangan bertetangga, sisanya acak
+        rows = rng.integers(0, n, n_lookups)
+        neighbour_cols = sparse.indices[rows * (len(sparse.indices) // n) + rng.integers(0, len(sparse.indices) // n,
+                                                                                          n_lookups)]
+        cols = np.where(rng.random(n_lookups) < 0.8, neighbour_cols, rng.integers(0, n, n_lookups))
+
+        def vector_ns(matrix):
+            start = time.perf_counter()
+            matrix[rows, cols]
+            return (time.perf_counter() - start) / n_lookups * 1e9
+
+        def scalar_ns(matrix, count=50000):
+            pairs = list(zip(rows[:count].tolist(), cols[:count].tolist()))
+            start = time.perf_counter()
+            for a, b in pairs:
+                matrix[a, b]
+            return (time.perf_counter() - start) / count * 1e9
+
+        print(f"   n={n}:")
+        print(f"      sparse: {sparse.nbytes / 1e6:8.1f} MB, build {sparse_build * 1e3:6.0f} ms, "
+              f"vektor {vector_ns(sparse):6.1f} ns/pasangan, skalar {scalar_ns(sparse):6.0f} ns "
+              f"(cache hit {sparse.hits / max(sparse.hits + sparse.misses, 1):.0%})")
+        if dense is not None:
+            mismatches = int((sparse[rows, cols] != dense[rows, cols]).sum())
+            print(f"      dense : {dense.nbytes / 1e6:8.1f} MB, build {dense_build * 1e3:6.0f} ms, "
+                  f"vektor {vector_ns(dense):6.1f} ns/pasangan, skalar {scalar_ns(dense):6.0f} ns")
+            print(f"      Jarak berbeda: {mismatches} dari {n_lookups}")
+        else:
+            print(f"      dense : {n * n * 8 / 1e6:8.1f} MB (tidak dibangun)")
+
+    # Hasil GA harus sama persis antara kedua backend
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'places.csv')
+        ids = synthetic_places_csv(path, 3000, seed)
+        os.environ['TOURISM_CATALOG_PATH'] = path
+        results = {}
+        try:
+            for backend in ('dense', 'sparse'):
+                os.environ['TOURISM_DISTANCE_BACKEND'] = backend
+                optimizer = TourismOptimizer()
+                discard_place_data_cache(optimizer)
+                start = time.perf_counter()
+                result = optimizer.optimize_route_with_crossover_choice({'must_visit': [int(ids[0])]}, verbose=False,
+                                                                        seed=0)
+                results[backend] = (result['fitness'], result['route'], time.perf_counter() - start)
+        finally:
+            del os.environ['TOURISM_CATALOG_PATH']
+            del os.environ['TOURISM_DISTANCE_BACKEND']
+        same = results['dense'][:2] == results['sparse'][:2]
+        print(f"   GA 3000 tempat: dense {results['dense'][2] * 1e3:.0f} ms, sparse {results['sparse'][2] * 1e3:.0f} ms, "
+              f"hasil {'identik' if same else 'BERBEDA'}")
+
+
+def _memory_mb():
+    """(anonim, PSS) proses ini dalam MB (Linux); halaman file memory-mapped dibagi antar proses"""
+    with open('/proc/self/smaps_rollup') as f:
+        fields = dict(line.split(':', 1) for line in f if ':' in line)
+    return tuple(int(fields[name].split()[0]) / 1024 for name in ('Anonymous', 'Pss'))
+
+
+def _worker_boot(results, barrier):
+    """Satu 'worker web' baru (proses spawn, env dari parent): buat PlaceData lalu sentuh matriks"""
+    baseline = _memory_mb()
+    start = time.perf_counter()
+    optimizer = TourismOptimizer()
+    boot_s = time.perf_counter() - start
+    optimizer.distance_matrix[np.arange(len(optimizer.catalog)), 0]
+    # Ukur saat semua worker hidup bersamaan (PSS membagi halaman bersama ke semua pemetanya)
+    barrier.wait()
+    anonymous, pss = _memory_mb()
+    results.put((boot_s, anonymous - baseline[0], pss - baseline[1]))
+    barrier.wait()
+
+
+def bench_shared(cases=((2500, 'dense'), (20000, 'sparse')), workers=4):
+    """PlaceData per worker web: dibangun sendiri vs memory-mapped dari cache bersama (boot dan memori)"""
+    import multiprocessing as mp
+    import os
+    import tempfile
+
+    context = mp.get_context('spawn')
+    print(f"📊 PlaceData di {workers} worker (proses baru, berjalan bersamaan)")
+    saved_env = {name: os.environ.get(name) for name in
+                 ('TOURISM_CATALOG_PATH', 'TOURISM_DISTANCE_BACKEND', 'TOURISM_CACHE_DIR')}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for n, backend in cases:
+                path = os.path.join(tmp, f"places_{n}.csv")
+                synthetic_places_csv(path, n)
+                os.environ['TOURISM_CATALOG_PATH'] = path
+                os.environ['TOURISM_DISTANCE_BACKEND'] = backend
+                print(f"   n={n} ({backend}):")
+                # Proses spawn mewarisi os.environ saat start (DEFAULT_CACHE_DIR dibaca saat import)
+                for label, cache_dir, count in (('tanpa cache', '', workers),
+                                                ('cache dingin', os.path.join(tmp, f"cache_{n}"), 1),
+                                                ('cache hangat', os.path.join(tmp, f"cache_{n}"), workers)):
+                    os.environ['TOURISM_CACHE_DIR'] = cache_dir
+                    results = context.Queue()
+                    barrier = context.Barrier(count)
+                    processes = [context.Process(target=_worker_boot, args=(results, barrier)) for _ in range(count)]
+                    for process in processes:
+                        process.start()
+                    boots = [results.get() for _ in processes]
+                    for process in processes:
+                        process.join()
+                    boot_ms, anonymous_mb, pss_mb = np.mean(boots, axis=0) * (1e3, 1, 1)
+                    print(f"      {label:12s}: boot {boot_ms:6.0f} ms/worker, "
+                          f"anonim {anonymous_mb:6.1f} MB/worker, PSS {pss_mb:6.1f} MB/worker")
+    finally:
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def bench_islands(n_places=1000, budgets_s=(0.15, 0.3, 0.6), seeds=range(3), seed=7):
+    """GA satu populasi vs island model pada batas waktu yang sama (kualitas per detik wall-clock)"""
+    import os
+    import tempfile
+
+    from islands import island_options, shutdown_island_pools
+
+    print(f"📊 Island model ({island_options()['count']} island, {os.cpu_count()} CPU) vs GA biasa, "
+          f"{n_places} tempat, batas waktu sama")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'places.csv')
+        ids = synthetic_places_csv(path, n_places, seed)
+        os.environ['TOURISM_CATALOG_PATH'] = path
+        try:
+            optimizer = TourismOptimizer()
+        finally:
+            del os.environ['TOURISM_CATALOG_PATH']
+        preferences = {'must_visit': [int(ids[0])], 'max_places': 8, 'budget': 300000}
+        # Pool island dibuat sebelum pengukuran (sekali per proses)
+        optimizer.optimize_route_with_crossover_choice(preferences, verbose=False, algorithm="islands",
+                                                       stop_criteria={'max_generations': 1})
+        try:
+            for budget_s in budgets_s:
+                for algorithm in ("simple", "islands"):
+                    fitness = []
+                    generations = []
+                    start = time.perf_counter()
+                    for run_seed in seeds:
+                        result = optimizer.optimize_route_with_crossover_choice(
+                            preferences, verbose=False, algorithm=algorithm,
+                            stop_criteria={'stagnation_generations': 0},
+                            deadline=time.monotonic() + budget_s, seed=run_seed
+                        )
+                        fitness.append(result['fitness'])
+                        generations.append(result['evolution_stats']['generations'] - 1)
+                    elapsed = (time.perf_counter() - start) / len(fitness)
+                    print(f"   {budget_s:4.2f} s, {algorithm:8s}: rata-rata {np.mean(fitness):.4f}, "
+                          f"terburuk {min(fitness):.4f}, {np.mean(generations):4.1f} generasi, {elapsed:.2f} s/run")
+        finally:
+            shutdown_island_pools()
+            # Worker island memetakan direktori cache; dihapus setelah pool ditutup
+            discard_place_data_cache(optimizer)
+
+
+def bench_batch_api(n_unique=4, copies=3):
+    """/api/optimize/batch vs /api/optimize berulang untuk sekumpulan preferensi (dengan duplikat)"""
+    import json
+    import os
+
+    import app as api
+    from batch_optimize import shutdown_batch_pools
+
+    # Tanpa result cache: yang diukur deduplikasi dan paralelisme batch
+    saved_cache = api.result_cache
+    saved_env = os.environ.get('TOURISM_RESULT_CACHE')
+    api.result_cache = None
+    os.environ['TOURISM_RESULT_CACHE'] = 'off'
+    client = api.app.test_client()
+    items = [{'id': f"tamu-{i}-{copy}", 'preferences': {'max_places': 4 + i, 'budget': 150000 + 50000 * i}}
+             for i in range(n_unique) for copy in range(copies)]
+    print(f"📊 Batch API: {len(items)} item ({n_unique} preferensi unik), {os.cpu_count()} CPU")
+
+    start = time.perf_counter()
+    for item in items:
+        response = client.post('/api/optimize', json=dict(item, verbose=False, seed=7))
+        assert response.status_code == 200
+    sequential = time.perf_counter() - start
+
+    # Pool batch dibuat sebelum pengukuran (sekali per proses)
+    client.post('/api/optimize/batch', json={'items': items[:1]}).get_data()
+    start = time.perf_counter()
+    first = None
+    lines = []
+    for chunk in client.post('/api/optimize/batch', json={'items': items}).response:
+        if first is None:
+            first = time.perf_counter() - start
+        lines.extend(json.loads(line) for line in chunk.decode().splitlines() if line)
+    batch = time.perf_counter() - start
+    shutdown_batch_pools()
+    api.result_cache = saved_cache
+    if saved_env is None:
+        del os.environ['TOURISM_RESULT_CACHE']
+    else:
+        os.environ['TOURISM_RESULT_CACHE'] = saved_env
+
+    summary = lines[-1]['summary']
+    print(f"   /api/optimize x{len(items)}: {sequential:.2f} s")
+    print(f"   /api/optimize/batch:    {batch:.2f} s ({sequential / batch:.1f}x), hasil pertama {first:.2f} s, "
+          f"{summary['unique']} optimasi, {summary['failed']} gagal")
+
+
+def bench_result_cache(repeats=20):
+    """/api/optimize identik: GA penuh vs result cache (memory dan file), termasuk pemulihan state journey"""
+    import tempfile
+
+    from result_cache import FileBackend, MemoryBackend, ResultCache
+
+    optimizer = TourismOptimizer()
+    preferences = {'budget': 250000}
+    print("📊 Result cache untuk request identik")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, backend in (('memory', MemoryBackend()), ('file', FileBackend(tmp))):
+            cache = ResultCache(backend)
+            start = time.perf_counter()
+            first = optimizer.optimize_route_with_crossover_choice(dict(preferences), verbose=False,
+                                                                   result_cache=cache)
+            miss = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(repeats):
+                journey = TourismOptimizer(place_data=optimizer.place_data)
+                result = journey.optimize_route_with_crossover_choice(dict(preferences), verbose=False,
+                                                                      result_cache=cache)
+            hit = (time.perf_counter() - start) / repeats
+            assert result['from_cache'] and result['route'] == first['route'] == journey.current_route
+            print(f"   {name:6s}: GA {miss * 1000:7.1f} ms, cache hit {hit * 1000:6.2f} ms ({miss / hit:.0f}x)")
+
+
+def bench_seeded(seeds=range(8), threads=4):
+    """Run ber-seed: seed sama -> rute sama, juga saat banyak optimasi berjalan bersamaan di thread"""
+    import threading
+
+    optimizer = TourismOptimizer()
+    preferences = {'budget': 250000}
+
+    def run(seed):
+        journey = TourismOptimizer(place_data=optimizer.place_data)
+        result = journey.optimize_route_with_crossover_choice(dict(preferences), verbose=False, seed=seed)
+        return result['route'], result['fitness']
+
+    print("📊 Reproduksibilitas run ber-seed")
+    start = time.perf_counter()
+    sequential = {seed: run(seed) for seed in seeds}
+    elapsed = time.perf_counter() - start
+
+    concurrent = {}
+    lock = threading.Lock()
+    pending = list(seeds)
+
+    def worker():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                seed = pending.pop()
+            result = run(seed)
+            with lock:
+                concurrent[seed] = result
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    repeated = sum(run(seed) == sequential[seed] for seed in seeds)
+    same_concurrent = sum(concurrent[seed] == sequential[seed] for seed in seeds)
+    distinct = len({tuple(route) for route, _ in sequential.values()})
+    print(f"   {len(sequential)} seed, {elapsed / len(sequential) * 1000:.1f} ms/run, {distinct} rute berbeda")
+    print(f"   diulang: {repeated}/{len(sequential)} identik, {threads} thread bersamaan: "
+          f"{same_concurrent}/{len(sequential)} identik")
+
+
+def legacy_reset_creator():
+    """Setup tipe DEAP versi lama: del + create ulang di namespace global deap.creator"""
+    from deap import base, creator
+    if 'FitnessMax' in dir(creator):
+        del creator.FitnessMax
+        del creator.Individual
+    creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+    creator.create("Individual", list, fitness=creator.FitnessMax)
+    return creator.Individual
+
+
+def bench_engine(n_setups=2000, n_clones=100000, n_threads=8):
+    """GAEngine vs deap.creator per request: setup toolbox, clone individu, optimasi paralel di thread"""
+    import threading
+    import warnings
+
+    from deap import base, tools
+
+    from ga_engine import GA_ENGINE
+
+    def legacy_setup():
+        individual = legacy_reset_creator()
+        toolbox = base.Toolbox()
+        toolbox.register("individual", tools.initIterate, individual, list)
+        toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+        toolbox.register("select", tools.selTournament, tournsize=3)
+        return toolbox
+
+    print("📊 GA engine: tipe DEAP dibuat sekali vs per request")
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for label, setup in (("creator per request", legacy_setup),
+                             ("GAEngine.toolbox   ", lambda: GA_ENGINE.toolbox(list))):
+            start = time.perf_counter()
+            for _ in range(n_setups):
+                toolbox = setup()
+            setup_us = (time.perf_counter() - start) / n_setups * 1e6
+            individual = toolbox.individual()
+            individual.extend(range(1, 7))
+            individual.fitness.values = (1.0,)
+            start = time.perf_counter()
+            for _ in range(n_clones):
+                toolbox.clone(individual)
+            clone_us = (time.perf_counter() - start) / n_clones * 1e6
+            print(f"   {label}: setup {setup_us:6.1f} µs/run, clone {clone_us:5.2f} µs/individu")
+
+    optimizer = TourismOptimizer()
+    errors = []
+
+    def run(seed):
+        try:
+            TourismOptimizer(place_data=optimizer.place_data).optimize_route_with_crossover_choice(
+                verbose=False, algorithm=("simple", "mu_plus_lambda", "mu_comma_lambda")[seed % 3])
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=run, args=(seed,)) for seed in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"   {n_threads} optimasi bersamaan (thread): {time.perf_counter() - start:.2f} s, error: {len(errors)}")
+    for error in errors[:3]:
+        print(f"      {error}")
+
+
+BENCHMARKS = {
+    'matrix': bench_matrix,
+    'eval': bench_eval,
+    'batch': bench_batch,
+    'parallel': bench_parallel,
+    'exact': bench_exact,
+    'memetic': bench_memetic,
+    'warm_start': bench_warm_start,
+    'route_state': bench_route_state,
+    'travel_time': bench_travel_time,
+    'catalog': bench_catalog,
+    'spatial': bench_spatial,
+    'sparse': bench_sparse,
+    'shared': bench_shared,
+    'engine': bench_engine,
+    'islands': bench_islands,
+    'batch_api': bench_batch_api,
+    'result_cache': bench_result_cache,
+    'seeded': bench_seeded,
+}
+
+
+if __name__ == '__main__':
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for name in selected:
+        BENCHMARKS[name]()
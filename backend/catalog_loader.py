@@ -0,0 +1,139 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# Path katalog tempat (CSV/Parquet/JSON); kosong = 15 tempat bawaan Yogyakarta
+CATALOG_PATH_ENV = 'TOURISM_CATALOG_PATH'
+
+REQUIRED_COLUMNS = (
+    'id', 'name', 'category', 'latitude', 'longitude',
+    'open_time', 'close_time', 'visit_duration_min', 'entrance_fee'
+)
+# Kolom opsional dan nilai default-nya
+OPTIONAL_COLUMNS = {
+    'popularity': 5.0,
+    'crowdedness_factor': 0.5
+}
+CATALOG_COLUMNS = REQUIRED_COLUMNS + tuple(OPTIONAL_COLUMNS)
+
+_TIME_PATTERN = re.compile(r'^([01]\d|2[0-3]):[0-5]\d$')
+
+
+def _read_csv(path):
+    # usecols: kolom lain (deskripsi, foto, ...) tidak pernah dibaca
+    return pd.read_csv(path, usecols=lambda column: column in CATALOG_COLUMNS,
+                       dtype={'open_time': str, 'close_time': str})
+
+
+def _read_parquet(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet catalog requires pyarrow (pip install pyarrow)")
+    available = pq.ParquetFile(path).schema_arrow.names
+    return pd.read_parquet(path, columns=[column for column in CATALOG_COLUMNS if column in available])
+
+
+def _read_json(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    # Format list record, {"places": [...]}, atau respons /api/places utuh
+    if isinstance(data, dict) and isinstance(data.get('data'), dict):
+        data = data['data']
+    if isinstance(data, dict):
+        data = data.get('places')
+    if not isinstance(data, list):
+        raise ValueError(f"Invalid catalog {path}: expected a list of places or {{'places': [...]}}")
+    records = [{key: record.get(key) for key in CATALOG_COLUMNS if key in record}
+               for record in data if isinstance(record, dict)]
+    return pd.DataFrame.from_records(records, columns=[c for c in CATALOG_COLUMNS
+                                                       if any(c in record for record in records)])
+
+
+READERS = {
+    '.csv': _read_csv,
+    '.parquet': _read_parquet,
+    '.pq': _read_parquet,
+    '.json': _read_json,
+}
+
+
+def validate_places(df, source='catalog'):
+    """
+    Validasi dan normalisasi DataFrame tempat: kolom wajib, ID unik,
+    koordinat, format jam HH:MM, durasi > 0, tiket >= 0. Kolom opsional
+    yang tidak ada diisi default. Raise ValueError berisi semua masalah.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Invalid {source}: missing columns {missing}")
+    if df.empty:
+        raise ValueError(f"Invalid {source}: no places")
+
+    df = df.reset_index(drop=True).copy()
+    for column, default in OPTIONAL_COLUMNS.items():
+        if column not in df.columns:
+            df[column] = default
+        df[column] = df[column].fillna(default)
+
+    errors = []
+    null_columns = [column for column in REQUIRED_COLUMNS if df[column].isna().any()]
+    if null_columns:
+        errors.append(f"empty values in {null_columns}")
+
+    numeric = {}
+    for column in ('id', 'latitude', 'longitude', 'visit_duration_min', 'entrance_fee',
+                   'popularity', 'crowdedness_factor'):
+        numeric[column] = pd.to_numeric(df[column], errors='coerce')
+        if numeric[column].isna().any() and column not in null_columns:
+            errors.append(f"non-numeric {column}")
+
+    ids = numeric['id']
+    if (ids.dropna() % 1 != 0).any():
+        errors.append("id must be integer")
+    duplicated = ids[ids.duplicated()].dropna().astype(np.int64).unique().tolist()
+    if duplicated:
+        errors.append(f"duplicate id {duplicated[:10]}")
+    if not numeric['latitude'].dropna().between(-90, 90).all():
+        errors.append("latitude out of range [-90, 90]")
+    if not numeric['longitude'].dropna().between(-180, 180).all():
+        errors.append("longitude out of range [-180, 180]")
+    if (numeric['visit_duration_min'].dropna() <= 0).any():
+        errors.append("visit_duration_min must be positive")
+    if (numeric['entrance_fee'].dropna() < 0).any():
+        errors.append("entrance_fee must not be negative")
+
+    for column in ('open_time', 'close_time'):
+        times = df[column].astype(str).str.strip()
+        invalid = ~times.str.match(_TIME_PATTERN)
+        if invalid.any() and column not in null_columns:
+            errors.append(f"{column} must be HH:MM (e.g. {times[invalid].iloc[0]!r})")
+        df[column] = times
+
+    if errors:
+        raise ValueError(f"Invalid {source}: " + "; ".join(errors))
+
+    df['id'] = ids.astype(np.int64)
+    df['name'] = df['name'].astype(str)
+    df['category'] = df['category'].astype(str)
+    for column in ('latitude', 'longitude', 'popularity', 'crowdedness_factor'):
+        df[column] = numeric[column].astype(np.float64)
+    for column in ('visit_duration_min', 'entrance_fee'):
+        df[column] = numeric[column].round().astype(np.int64)
+    return df[list(CATALOG_COLUMNS)]
+
+
+def load_places(path):
+    """Baca katalog tempat dari CSV, Parquet, atau JSON (hanya kolom yang dipakai), lalu validasi"""
+    extension = os.path.splitext(path)[1].lower()
+    reader = READERS.get(extension)
+    if reader is None:
+        raise ValueError(f"Unsupported catalog format {extension!r}, use one of {sorted(READERS)}")
+    return validate_places(reader(path), source=f"catalog {path}")
+
+
+def configured_catalog_path():
+    return os.environ.get(CATALOG_PATH_ENV) or None
@@ -0,0 +1,122 @@
+import hashlib
+import os
+
+import numpy as np
+import geopy.distance as geodist
+
+EARTH_RADIUS_KM = 6371.0088
+
+DISTANCE_METHODS = ('haversine', 'geodesic')
+
+# geodesic = O(n^2) panggilan geopy; di atas batas ini dipakai haversine
+GEODESIC_MAX_PLACES = int(os.environ.get('TOURISM_GEODESIC_MAX_PLACES', 1000))
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'TOURISM_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+)
+
+
+def haversine_to_point(latitude, longitude, point):
+    """Jarak haversine (km) dari satu titik (lat, lon) ke array koordinat"""
+    lat1 = np.radians(point[0])
+    lon1 = np.radians(point[1])
+    lat2 = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon2 = np.radians(np.asarray(longitude, dtype=np.float64))
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine_radians(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2):
+    """
+    Haversine (km) dari koordinat radian + cos(lat) yang sudah dihitung.
+    Satu rumus untuk matriks dense dan backend sparse agar jaraknya sama.
+    """
+    a = np.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos_lat2 * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine_matrix(latitude, longitude, block_size=1024):
+    """
+    Matriks jarak haversine n x n (km), dihitung per blok baris
+    supaya memori sementara tetap kecil untuk katalog besar.
+    """
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    n = len(lat)
+    matrix = np.empty((n, n))
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        matrix[start:stop] = haversine_radians(lat[start:stop, None], lon[start:stop, None], cos_lat[start:stop, None],
+                                               lat[None, :], lon[None, :], cos_lat[None, :])
+
+    np.fill_diagonal(matrix, 0.0)
+    return matrix
+
+
+def geodesic_matrix(latitude, longitude):
+    """Matriks jarak geodesic n x n (km), lebih akurat tapi O(n^2) panggilan geopy"""
+    points = list(zip(np.asarray(latitude).tolist(), np.asarray(longitude).tolist()))
+    n = len(points)
+    matrix = np.zeros((n, n))
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            matrix[i, j] = matrix[j, i] = geodist.distance(points[i], points[j]).km
+
+    return matrix
+
+
+def point_distances(latitude, longitude, point, method='haversine'):
+    """Jarak (km) dari satu titik ke setiap koordinat, dengan metode yang sama dengan matriks"""
+    if method == 'geodesic':
+        return np.array([geodist.distance(point, (lat, lon)).km
+                         for lat, lon in zip(np.asarray(latitude).tolist(), np.asarray(longitude).tolist())])
+    return haversine_to_point(latitude, longitude, point)
+
+
+def build_distance_matrix(latitude, longitude, method='haversine'):
+    if method not in DISTANCE_METHODS:
+        raise ValueError(f"Invalid distance method '{method}'. Valid options: {list(DISTANCE_METHODS)}")
+    if method == 'geodesic':
+        return geodesic_matrix(latitude, longitude)
+    return haversine_matrix(latitude, longitude)
+
+
+def coordinates_fingerprint(latitude, longitude, method='haversine'):
+    """Hash isi koordinat katalog + metode, dipakai sebagai kunci cache"""
+    digest = hashlib.sha256(method.encode())
+    digest.update(np.ascontiguousarray(latitude, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(longitude, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:20]
+
+
+def load_or_build_distance_matrix(latitude, longitude, method='haversine', cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Ambil matriks jarak dari cache .npy (memory-mapped, read-only) atau
+    bangun lalu simpan. Kunci cache = hash koordinat katalog, sehingga
+    katalog yang berubah otomatis memakai file baru.
+    """
+    if not cache_dir:
+        return build_distance_matrix(latitude, longitude, method)
+
+    key = coordinates_fingerprint(latitude, longitude, method)
+    path = os.path.join(cache_dir, f"distance_{method}_{key}.npy")
+
+    if not os.path.exists(path):
+        matrix = build_distance_matrix(latitude, longitude, method)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Distance cache not writable ({e}), using in-memory matrix")
+            return matrix
+
+    # np.asarray: view ndarray biasa di atas mmap (indeks skalar lebih cepat dari np.memmap)
+    return np.asarray(np.load(path, mmap_mode='r'))
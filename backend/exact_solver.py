@@ -0,0 +1,150 @@
+import itertools
+import math
+import os
+import time
+
+import numpy as np
+
+from place_catalog import time_to_minutes
+from fitness import evaluate_routes_batch
+
+# Batas instance kecil untuk mode "auto": jumlah subset kandidat dan panjang rute
+EXACT_MAX_SUBSETS = int(os.environ.get('TOURISM_EXACT_MAX_SUBSETS', 20000))
+EXACT_MAX_PLACES = int(os.environ.get('TOURISM_EXACT_MAX_PLACES', 7))
+
+_PERMUTATIONS = {}
+
+
+def _permutations(k):
+    """Semua permutasi range(k) sebagai array (k! x k), disimpan per k"""
+    if k not in _PERMUTATIONS:
+        _PERMUTATIONS[k] = np.array(list(itertools.permutations(range(k))), dtype=np.int64).reshape(-1, k)
+    return _PERMUTATIONS[k]
+
+
+def candidate_places(catalog, preferences):
+    """Place ID yang boleh dikunjungi (tidak di avoid_places)"""
+    avoid = set(preferences['avoid_places'])
+    return [place_id for place_id in catalog.all_ids if place_id not in avoid]
+
+
+def count_subsets(n_candidates, max_places):
+    return sum(math.comb(n_candidates, k) for k in range(1, max_places + 1))
+
+
+def is_small_instance(catalog, preferences):
+    """True jika enumerasi subset + permutasi cukup murah (dipakai algorithm="auto")"""
+    max_places = preferences['max_places']
+    n_candidates = len(candidate_places(catalog, preferences))
+    return (max_places <= EXACT_MAX_PLACES
+            and count_subsets(n_candidates, min(max_places, n_candidates)) <= EXACT_MAX_SUBSETS)
+
+
+def _subset_scores(combos, catalog, preferences, start_leg, end_leg):
+    """
+    Komponen fitness yang tidak bergantung urutan untuk setiap subset
+    (jumlah tempat, kategori, popularitas, budget, must-visit) plus batas
+    atas fitness dengan jarak minimum = leg awal terdekat + leg akhir terdekat.
+    """
+    k = combos.shape[1]
+    preferred_codes = np.fromiter(catalog.category_codes_for(preferences['preferred_categories']), dtype=np.int64)
+
+    place_count_score = k / preferences['max_places']
+    category_score = np.isin(catalog.category_codes[combos], preferred_codes).sum(axis=1) / k
+    popularity_score = (catalog.popularity[combos].sum(axis=1) / k) / 10.0
+    set_score = 0.40 * place_count_score + 0.20 * category_score + 0.25 * popularity_score
+
+    penalty = np.ones(len(combos))
+    must_visit = preferences['must_visit']
+    if must_visit:
+        must_indices = [catalog.index_of(place_id) for place_id in must_visit]
+        visited_must = np.isin(combos, must_indices).sum(axis=1)
+        penalty = penalty * (0.3 + 0.7 * (visited_must / len(must_visit)))
+
+    min_distance = start_leg[combos].min(axis=1) + end_leg[combos].min(axis=1)
+    upper_bound = (set_score + 0.15 * np.maximum(0, 1 - min_distance / 200)) * 100 * penalty
+    return set_score, penalty, upper_bound
+
+
+def solve_exact(catalog, preferences, distance_matrix, travel_times, start_leg, end_leg, deadline=None):
+    """
+    Solver eksak (branch-and-bound) untuk objektif yang sama dengan eval_route_fixed.
+
+    Ruang pencarian sama dengan GA: tempat di luar avoid_places, paling banyak
+    max_places tempat, total tiket <= budget. Subset diurutkan menurut batas
+    atas fitness; setiap subset dievaluasi dengan semua permutasinya (vektor)
+    sampai batas atas subset berikutnya tidak bisa mengalahkan rute terbaik.
+
+    Return dict: route, fitness, top_routes, subsets_total, subsets_evaluated,
+    permutations_evaluated, optimal (False jika dihentikan deadline).
+    travel_times: TravelTimeModel (waktu tempuh menurut jam keberangkatan).
+    """
+    candidates = np.array([catalog.index_of(place_id) for place_id in candidate_places(catalog, preferences)],
+                          dtype=np.int64)
+    max_places = min(preferences['max_places'], len(candidates))
+    budget = preferences['budget']
+    day_start = time_to_minutes(preferences['start_time'])
+    day_end = time_to_minutes(preferences['end_time'])
+
+    # Enumerasi subset yang lolos budget, dengan skor set-level dan batas atas
+    groups = []
+    for k in range(1, max_places + 1):
+        combos = np.array(list(itertools.combinations(candidates, k)), dtype=np.int64).reshape(-1, k)
+        combos = combos[catalog.entrance_fee[combos].sum(axis=1) <= budget]
+        if len(combos):
+            set_score, penalty, upper_bound = _subset_scores(combos, catalog, preferences, start_leg, end_leg)
+            groups.extend((float(bound), k, combo, float(score), float(pen))
+                          for bound, combo, score, pen in zip(upper_bound, combos, set_score, penalty))
+    groups.sort(key=lambda item: -item[0])
+
+    best_score = 1.0
+    scored = []
+    subsets_evaluated = 0
+    permutations_evaluated = 0
+    optimal = True
+
+    for bound, k, combo, set_score, penalty in groups:
+        if bound <= best_score:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            optimal = False
+            break
+
+        orders = combo[_permutations(k)]
+        total_distance = start_leg[orders[:, 0]] + end_leg[orders[:, -1]]
+        elapsed = catalog.visit_duration[orders[:, 0]].astype(np.float64)
+        for col in range(1, k):
+            total_distance = total_distance + distance_matrix[orders[:, col - 1], orders[:, col]]
+            hours = ((day_start + elapsed) // 60).astype(np.int64) % 24
+            elapsed = elapsed + travel_times.lookup(hours, orders[:, col - 1], orders[:, col])
+            elapsed = elapsed + catalog.visit_duration[orders[:, col]]
+
+        feasible = day_start + elapsed <= day_end
+        scores = (set_score + 0.15 * np.maximum(0, 1 - total_distance / 200)) * 100 * penalty
+        scores = np.where(feasible, scores, scores * 0.7)
+
+        best = int(np.argmax(scores))
+        scored.append((float(scores[best]), orders[best]))
+        best_score = max(best_score, float(scores[best]))
+        subsets_evaluated += 1
+        permutations_evaluated += len(orders)
+
+    scored.sort(key=lambda item: -item[0])
+    top_routes = [[int(catalog.ids[idx]) for idx in order] for _, order in scored[:5]]
+    if not top_routes:
+        top_routes = [[]]
+
+    # Nilai akhir dihitung ulang dengan evaluator GA agar identik dengan eval_route_fixed
+    fitnesses = evaluate_routes_batch(top_routes, catalog, preferences, distance_matrix, travel_times,
+                                      start_leg, end_leg)
+    ranked = sorted(zip(fitnesses, top_routes), key=lambda item: -item[0][0])
+
+    return {
+        'route': ranked[0][1],
+        'fitness': ranked[0][0][0],
+        'top_routes': [route for _, route in ranked],
+        'subsets_total': len(groups),
+        'subsets_evaluated': subsets_evaluated,
+        'permutations_evaluated': permutations_evaluated,
+        'optimal': optimal
+    }
@@ -0,0 +1,108 @@
+import numpy as np
+
+from place_catalog import time_to_minutes
+from distance import point_distances
+
+
+def pad_routes(routes, catalog):
+    """
+    Ubah list rute (place ID) menjadi array indeks 2-D.
+    Posisi kosong diisi 0 dan ditandai False pada mask.
+    """
+    lengths = np.fromiter((len(route) for route in routes), dtype=np.int64, count=len(routes))
+    width = int(lengths.max()) if len(routes) else 0
+    indices = np.zeros((len(routes), max(width, 1)), dtype=np.int64)
+    for row, route in enumerate(routes):
+        if route:
+            indices[row, :len(route)] = [catalog.index_of(place_id) for place_id in route]
+    mask = np.arange(indices.shape[1]) < lengths[:, None]
+    return indices, mask, lengths
+
+
+def leg_distance_vector(catalog, location, method='haversine'):
+    """Jarak (km) dari location ke setiap tempat di katalog"""
+    point = (location['latitude'], location['longitude'])
+    distances = point_distances(catalog.latitude, catalog.longitude, point, method)
+    distances.setflags(write=False)
+    return distances
+
+
+def evaluate_routes_batch(routes, catalog, preferences, distance_matrix, travel_times, start_leg, end_leg):
+    """
+    Versi vektor dari eval_route_fixed untuk satu populasi penuh.
+    travel_times: TravelTimeModel (waktu tempuh menurut jam keberangkatan).
+    start_leg/end_leg: vektor jarak lokasi awal/akhir ke setiap tempat.
+
+    Semua komponen (jumlah tempat, jarak, kategori, popularitas, budget,
+    must-visit, kelayakan waktu) dihitung dengan NumPy per kolom posisi,
+    dengan urutan operasi floating point yang sama seperti versi skalar
+    sehingga hasilnya identik.
+    """
+    if not routes:
+        return []
+
+    indices, mask, lengths = pad_routes(routes, catalog)
+    non_empty = lengths > 0
+    rows = np.arange(len(routes))
+    safe_lengths = np.where(non_empty, lengths, 1)
+    first_idx = indices[:, 0]
+    last_idx = indices[rows, safe_lengths - 1]
+
+    # Akumulasi per posisi (urutan penjumlahan sama dengan loop skalar)
+    total_distance = start_leg[first_idx]
+    popularity_sum = np.where(mask[:, 0], catalog.popularity[first_idx], 0.0)
+    budget_used = np.where(mask[:, 0], catalog.entrance_fee[first_idx], 0)
+    preferred_codes = np.fromiter(catalog.category_codes_for(preferences['preferred_categories']), dtype=np.int64)
+    category_hits = mask & np.isin(catalog.category_codes[indices], preferred_codes)
+
+    day_start = time_to_minutes(preferences['start_time'])
+    day_end = time_to_minutes(preferences['end_time'])
+    elapsed = np.where(mask[:, 0], catalog.visit_duration[first_idx], 0).astype(np.float64)
+    over_time = mask[:, 0] & (day_start + elapsed > day_end)
+
+    for col in range(1, indices.shape[1]):
+        valid = mask[:, col]
+        prev_idx = indices[:, col - 1]
+        cur_idx = indices[:, col]
+        total_distance = total_distance + np.where(valid, distance_matrix[prev_idx, cur_idx], 0.0)
+        popularity_sum = popularity_sum + np.where(valid, catalog.popularity[cur_idx], 0.0)
+        budget_used = budget_used + np.where(valid, catalog.entrance_fee[cur_idx], 0)
+        hours = ((day_start + elapsed) // 60).astype(np.int64) % 24
+        elapsed = elapsed + np.where(valid, travel_times.lookup(hours, prev_idx, cur_idx), 0.0)
+        elapsed = elapsed + np.where(valid, catalog.visit_duration[cur_idx], 0)
+        over_time |= valid & (day_start + elapsed > day_end)
+
+    total_distance = total_distance + end_leg[last_idx]
+
+    place_count_score = lengths / preferences['max_places']
+    distance_score = np.maximum(0, 1 - (total_distance / 200))
+    category_score = category_hits.sum(axis=1) / safe_lengths
+    popularity_score = (popularity_sum / safe_lengths) / 10.0
+
+    base_fitness = (
+        0.40 * place_count_score +
+        0.15 * distance_score +
+        0.20 * category_score +
+        0.25 * popularity_score
+    ) * 100
+
+    penalty_multiplier = np.ones(len(routes))
+
+    budget = preferences['budget']
+    over_budget = budget_used > budget
+    budget_ratio = budget / np.where(over_budget, budget_used, 1)
+    penalty_multiplier = np.where(over_budget, penalty_multiplier * np.maximum(0.5, budget_ratio), penalty_multiplier)
+
+    must_visit = preferences['must_visit']
+    if len(must_visit) > 0:
+        visited_must = np.zeros(len(routes), dtype=np.int64)
+        for place_id in must_visit:
+            visited_must += ((indices == catalog.index_of(place_id)) & mask).any(axis=1)
+        must_visit_ratio = visited_must / len(must_visit)
+        penalty_multiplier = penalty_multiplier * (0.3 + 0.7 * must_visit_ratio)
+
+    penalty_multiplier = np.where(over_time, penalty_multiplier * 0.7, penalty_multiplier)
+
+    final_fitness = np.maximum(1.0, base_fitness * penalty_multiplier)
+    final_fitness = np.where(non_empty, final_fitness, 1.0)
+    return [(float(value),) for value in final_fitness]
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+
+def fitness_context_key(preferences, distance_method, traffic=()):
+    """
+    Fingerprint semua input objektif selain rute: lokasi awal/akhir, jam,
+    budget, max_places, kategori favorit, must_visit, metode jarak, dan
+    faktor lalu lintas per jam (TravelTimeModel.fingerprint()).
+    """
+    context = {
+        'start': [preferences['start_location']['latitude'], preferences['start_location']['longitude']],
+        'end': [preferences['end_location']['latitude'], preferences['end_location']['longitude']],
+        'start_time': preferences['start_time'],
+        'end_time': preferences['end_time'],
+        'budget': preferences['budget'],
+        'max_places': preferences['max_places'],
+        'preferred_categories': sorted(preferences['preferred_categories']),
+        'must_visit': sorted(preferences['must_visit']),
+        'distance_method': distance_method,
+        'traffic': list(traffic)
+    }
+    encoded = json.dumps(context, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class FitnessCache:
+    """
+    Cache LRU nilai fitness dengan kunci (konteks, tuple rute).
+
+    Satu instance per journey (optimizer), dipakai lintas generasi dan lintas
+    reoptimasi. Rute duplikat di populasi maupun dalam satu batch hanya
+    dievaluasi sekali.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or int(os.environ.get('TOURISM_FITNESS_CACHE_SIZE', 50000))
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def evaluate(self, routes, context_key, evaluate_batch):
+        """
+        Fitness untuk setiap rute; yang belum ada di cache dievaluasi dengan
+        satu panggilan evaluate_batch(list_rute)
+        """
+        keys = [(context_key, tuple(route)) for route in routes]
+        results = [None] * len(keys)
+        pending = OrderedDict()
+
+        for position, key in enumerate(keys):
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                results[position] = value
+                self.hits += 1
+            elif key in pending:
+                pending[key].append(position)
+                self.hits += 1
+            else:
+                pending[key] = [position]
+                self.misses += 1
+
+        if pending:
+            values = evaluate_batch([list(key[1]) for key in pending])
+            for (key, positions), value in zip(pending.items(), values):
+                self._entries[key] = value
+                for position in positions:
+                    results[position] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return results
+
+    def counters(self):
+        return self.hits, self.misses
@@ -0,0 +1,276 @@
+import copy
+import random
+import time
+from operator import attrgetter
+
+import numpy as np
+from deap import base, tools
+
+STOP_MAX_GENERATIONS = 'max_generations'
+STOP_STAGNATION = 'stagnation'
+STOP_TARGET_FITNESS = 'target_fitness'
+STOP_DEADLINE = 'deadline'
+STOP_MAX_EVALUATIONS = 'max_evaluations'
+
+
+class FitnessMax(base.Fitness):
+    """Fitness satu objektif, dimaksimalkan"""
+    weights = (1.0,)
+
+
+class Individual(list):
+    """
+    Individu GA: list place ID + fitness. Dibuat sekali di modul, bukan
+    lewat deap.creator (namespace global yang dulu di-del/create ulang
+    setiap request dan saling timpa antar thread).
+    """
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.fitness = FitnessMax()
+
+    def __deepcopy__(self, memo):
+        # toolbox.clone: gen berupa int (immutable), jadi salinan list + nilai fitness cukup
+        clone = type(self)(self)
+        clone.fitness.wvalues = self.fitness.wvalues
+        return clone
+
+
+def select_tournament(individuals, k, tournsize, rng=random):
+    """tools.selTournament dengan RNG milik run (urutan pemanggilan RNG sama dengan DEAP)"""
+    chosen = []
+    for _ in range(k):
+        aspirants = [rng.choice(individuals) for _ in range(tournsize)]
+        chosen.append(max(aspirants, key=attrgetter('fitness')))
+    return chosen
+
+
+def var_and(population, toolbox, cxpb, mutpb, rng=random):
+    """algorithms.varAnd dengan RNG milik run"""
+    offspring = [toolbox.clone(ind) for ind in population]
+    for i in range(1, len(offspring), 2):
+        if rng.random() < cxpb:
+            offspring[i - 1], offspring[i] = toolbox.mate(offspring[i - 1], offspring[i])
+            del offspring[i - 1].fitness.values, offspring[i].fitness.values
+    for i in range(len(offspring)):
+        if rng.random() < mutpb:
+            offspring[i], = toolbox.mutate(offspring[i])
+            del offspring[i].fitness.values
+    return offspring
+
+
+def var_or(population, toolbox, lambda_, cxpb, mutpb, rng=random):
+    """algorithms.varOr dengan RNG milik run"""
+    if cxpb + mutpb > 1.0:
+        raise ValueError("The sum of the crossover and mutation probabilities must be smaller or equal to 1.0.")
+    offspring = []
+    for _ in range(lambda_):
+        op_choice = rng.random()
+        if op_choice < cxpb:
+            ind1, ind2 = [toolbox.clone(ind) for ind in rng.sample(population, 2)]
+            ind1, ind2 = toolbox.mate(ind1, ind2)
+            del ind1.fitness.values
+            offspring.append(ind1)
+        elif op_choice < cxpb + mutpb:
+            ind = toolbox.clone(rng.choice(population))
+            ind, = toolbox.mutate(ind)
+            del ind.fitness.values
+            offspring.append(ind)
+        else:
+            offspring.append(rng.choice(population))
+    return offspring
+
+
+class GAEngine:
+    """
+    Mesin GA yang dipakai ulang antar request dan thread: toolbox template
+    (operator yang sama untuk semua run) dibuat sekali; toolbox() memberi
+    salinan dangkal per run untuk didaftari operator yang bergantung request
+    (inisialisasi, evaluasi, crossover, mutasi). Tidak ada state global yang
+    diubah saat run, sehingga banyak optimasi bisa berjalan bersamaan.
+    """
+
+    def __init__(self, tournament_size=3):
+        self.tournament_size = tournament_size
+        template = base.Toolbox()
+        template.register("select", select_tournament, tournsize=tournament_size)
+        self._template = template
+
+    def toolbox(self, init_route=None, rng=None):
+        """
+        Toolbox baru untuk satu run; init_route() -> list place ID untuk individu
+        acak, rng: random.Random milik run untuk seleksi (default modul random)
+        """
+        toolbox = copy.copy(self._template)
+        if rng is not None:
+            toolbox.register("select", select_tournament, tournsize=self.tournament_size, rng=rng)
+        if init_route is not None:
+            toolbox.register("individual", tools.initIterate, Individual, init_route)
+            toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+        return toolbox
+
+    @staticmethod
+    def statistics():
+        """Statistik fitness per generasi (avg/max/min/std) untuk logbook"""
+        stats = tools.Statistics(lambda ind: ind.fitness.values)
+        stats.register("avg", np.mean)
+        stats.register("max", np.max)
+        stats.register("min", np.min)
+        stats.register("std", np.std)
+        return stats
+
+
+class StopCriteria:
+    """
+    Kriteria berhenti loop GA, dicek setelah setiap generasi.
+
+    max_generations: batas atas generasi (seperti ngen DEAP)
+    stagnation_generations: berhenti jika fitness terbaik hall of fame tidak
+        naik lebih dari `tolerance` selama sekian generasi
+    target_fitness: berhenti begitu fitness terbaik >= target
+    deadline: waktu absolut time.monotonic() untuk berhenti; GA juga berhenti
+        jika generasi berikutnya (estimasi dari generasi terlama) tidak akan
+        selesai sebelum deadline
+    max_evaluations: batas total evaluasi fitness
+    """
+
+    def __init__(self, max_generations=50, stagnation_generations=None, target_fitness=None,
+                 deadline=None, max_evaluations=None, tolerance=1e-9):
+        self.max_generations = max_generations
+        self.stagnation_generations = stagnation_generations
+        self.target_fitness = target_fitness
+        self.deadline = deadline
+        self.max_evaluations = max_evaluations
+        self.tolerance = tolerance
+        self.generation_seconds = 0.0
+
+    def observe_generation(self, seconds):
+        """Catat durasi satu generasi untuk estimasi deadline"""
+        self.generation_seconds = max(self.generation_seconds, seconds)
+
+    def check(self, generation, best_fitness, last_improvement, evaluations):
+        """Nama kriteria yang terpenuhi, atau None jika evolusi lanjut"""
+        if self.target_fitness is not None and best_fitness >= self.target_fitness:
+            return STOP_TARGET_FITNESS
+        if self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            return STOP_MAX_EVALUATIONS
+        if (self.stagnation_generations is not None
+                and generation - last_improvement >= self.stagnation_generations):
+            return STOP_STAGNATION
+        if generation >= self.max_generations:
+            return STOP_MAX_GENERATIONS
+        if self.deadline is not None and time.monotonic() + self.generation_seconds >= self.deadline:
+            return STOP_DEADLINE
+        return None
+
+
+def _evaluate_invalid(individuals, toolbox):
+    """Evaluasi individu tanpa fitness valid; satu panggilan batch jika tersedia"""
+    invalid_ind = [ind for ind in individuals if not ind.fitness.valid]
+    if hasattr(toolbox, 'evaluate_batch'):
+        fitnesses = toolbox.evaluate_batch(invalid_ind)
+    else:
+        fitnesses = map(toolbox.evaluate, invalid_ind)
+    for ind, fit in zip(invalid_ind, fitnesses):
+        ind.fitness.values = fit
+    return len(invalid_ind)
+
+
+def improve_elites(individuals, toolbox, improve, elite_size):
+    """
+    Tahap memetic: perbaiki `elite_size` individu terbaik dengan improve(route)
+    lalu evaluasi ulang yang berubah. Return jumlah evaluasi.
+    """
+    changed = []
+    for ind in tools.selBest(individuals, elite_size):
+        route = list(ind)
+        improved = improve(route)
+        if improved != route:
+            ind[:] = improved
+            del ind.fitness.values
+            changed.append(ind)
+    return _evaluate_invalid(changed, toolbox)
+
+
+def evolve(population, toolbox, criteria, algorithm="simple", cxpb=0.7, mutpb=0.3, mu=30, lambda_=50,
+           stats=None, halloffame=None, verbose=True, on_generation=None, improve=None, elite_size=2,
+           rng=None):
+    """
+    Loop generasi pengganti eaSimple / eaMuPlusLambda / eaMuCommaLambda.
+
+    Variasi dan seleksi sama persis dengan DEAP (varAnd / varOr, urutan
+    pemanggilan random sama), tetapi setelah setiap generasi `criteria`
+    dicek sehingga evolusi bisa berhenti lebih awal.
+    rng: random.Random milik run (default modul random), dipakai variasi;
+    seleksi memakai rng yang didaftarkan di toolbox (GAEngine.toolbox).
+    on_generation(gen, record) dipanggil setiap generasi (progress job).
+    improve(route): opsional, local search untuk `elite_size` individu terbaik
+    setiap generasi (lihat local_search.py).
+
+    Return: (population, logbook, stop_reason, evaluations)
+    """
+    rng = rng or random
+    logbook = tools.Logbook()
+    logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+
+    def record_generation(gen, nevals):
+        record = stats.compile(population) if stats else {}
+        logbook.record(gen=gen, nevals=nevals, **record)
+        if verbose:
+            print(logbook.stream)
+        if on_generation:
+            on_generation(gen, record)
+
+    evaluations = _evaluate_invalid(population, toolbox)
+    if improve:
+        evaluations += improve_elites(population, toolbox, improve, elite_size)
+    if halloffame is not None:
+        halloffame.update(population)
+    record_generation(0, evaluations)
+
+    best_fitness = halloffame[0].fitness.values[0] if halloffame else float('-inf')
+    last_improvement = 0
+    gen = 0
+    stop_reason = criteria.check(gen, best_fitness, last_improvement, evaluations)
+
+    while stop_reason is None:
+        gen += 1
+        generation_start = time.monotonic()
+
+        if algorithm in ("mu_plus_lambda", "mu_comma_lambda"):
+            offspring = var_or(population, toolbox, lambda_, cxpb, mutpb, rng)
+        else:
+            offspring = toolbox.select(population, len(population))
+            offspring = var_and(offspring, toolbox, cxpb, mutpb, rng)
+
+        nevals = _evaluate_invalid(offspring, toolbox)
+        if improve:
+            nevals += improve_elites(offspring, toolbox, improve, elite_size)
+        evaluations += nevals
+
+        if halloffame is not None:
+            halloffame.update(offspring)
+
+        if algorithm == "mu_plus_lambda":
+            population[:] = toolbox.select(population + offspring, mu)
+        elif algorithm == "mu_comma_lambda":
+            population[:] = toolbox.select(offspring, mu)
+        else:
+            population[:] = offspring
+
+        record_generation(gen, nevals)
+        criteria.observe_generation(time.monotonic() - generation_start)
+
+        if halloffame:
+            current_best = halloffame[0].fitness.values[0]
+            if current_best > best_fitness + criteria.tolerance:
+                last_improvement = gen
+            best_fitness = max(best_fitness, current_best)
+
+        stop_reason = criteria.check(gen, best_fitness, last_improvement, evaluations)
+
+    return population, logbook, stop_reason, evaluations
+
+
+# Satu engine per proses, dibagi semua sesi/thread
+GA_ENGINE = GAEngine()
@@ -0,0 +1,19 @@
+import os
+
+# gunicorn -c gunicorn.conf.py app:app
+bind = os.environ.get('TOURISM_BIND', '0.0.0.0:5000')
+# Sesi journey (SessionStore), job + progress SSE (JobManager) dan result cache 'memory'
+# disimpan di memori proses worker: dengan >1 worker, request lanjutan satu journey bisa
+# masuk ke worker lain ("Rute belum tersedia" / job 404). Default satu worker, konkurensi
+# lewat thread; naikkan TOURISM_WEB_WORKERS hanya di belakang sticky routing per journey ID.
+workers = int(os.environ.get('TOURISM_WEB_WORKERS', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('TOURISM_WEB_THREADS', 8))
+# Optimasi GA bisa berjalan beberapa detik
+timeout = int(os.environ.get('TOURISM_WEB_TIMEOUT', 120))
+
+# app.py diimpor sekali di master: katalog + matriks dibangun/dimuat (memory-mapped dari
+# TOURISM_CACHE_DIR) sebelum fork, jadi worker (jika lebih dari satu) berbagi halaman
+# read-only yang sama. Pekerjaan CPU berat (GA paralel, island, batch) berjalan di
+# process pool terpisah, bukan di worker web.
+preload_app = True
@@ -0,0 +1,215 @@
+import math
+import os
+import random
+import threading
+import time
+
+from deap import tools
+
+from ga_engine import STOP_DEADLINE, Individual
+from shared_data import load_place_data, pool_context
+
+# Jumlah island default (satu process per island), dibatasi jumlah CPU
+ISLAND_COUNT = int(os.environ.get('TOURISM_ISLANDS', min(4, os.cpu_count() or 1)))
+MIGRATION_INTERVAL = 5
+MIGRANTS = 2
+MAX_ISLANDS = 16
+
+# Optimizer satu per process worker, diisi sekali oleh initializer
+_WORKER = {}
+
+
+def _init_island_worker(optimizer_class, place_data, directory=None):
+    if directory is not None:
+        place_data = load_place_data(directory)
+    _WORKER['optimizer'] = optimizer_class(place_data=place_data)
+
+
+def _evolve_island(args):
+    return _WORKER['optimizer'].evolve_island(*args)
+
+
+def island_options(options=None, crossover_method="original"):
+    """
+    Opsi island model dari request (semua opsional):
+    count, migration_interval (generasi per epoch), migrants (elit per migrasi),
+    crossover_methods (dipakai bergiliran per island; default crossover_method
+    dan 'cycle'/'order' bergantian)
+    """
+    options = options or {}
+    if not isinstance(options, dict):
+        raise ValueError("islands must be an object")
+
+    def option(name, default, minimum, maximum=None):
+        value = options.get(name, default)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid islands.{name}: {options.get(name)}")
+        if value < minimum:
+            raise ValueError(f"islands.{name} must be >= {minimum}")
+        if maximum is not None and value > maximum:
+            raise ValueError(f"islands.{name} must be <= {maximum}")
+        return value
+
+    methods = options.get('crossover_methods') or [
+        crossover_method, 'order' if crossover_method == 'cycle' else 'cycle'
+    ]
+    if not isinstance(methods, list) or any(m not in ('original', 'order', 'cycle') for m in methods):
+        raise ValueError("islands.crossover_methods must be a list of 'original', 'order', 'cycle'")
+    count = option('count', max(ISLAND_COUNT, 2), 2, MAX_ISLANDS)
+    return {
+        'count': count,
+        'migration_interval': option('migration_interval', MIGRATION_INTERVAL, 1),
+        'migrants': option('migrants', MIGRANTS, 0),
+        'crossover_methods': [methods[i % len(methods)] for i in range(count)]
+    }
+
+
+def merge_records(records):
+    """
+    Gabung record logbook satu generasi dari semua island (ukuran populasi
+    sama): avg/max/min/std atas populasi gabungan, nevals dijumlah
+    """
+    avg = sum(r['avg'] for r in records) / len(records)
+    second_moment = sum(r['std'] ** 2 + r['avg'] ** 2 for r in records) / len(records)
+    return {
+        'nevals': sum(r['nevals'] for r in records),
+        'avg': avg,
+        'max': max(r['max'] for r in records),
+        'min': min(r['min'] for r in records),
+        'std': math.sqrt(max(second_moment - avg ** 2, 0.0))
+    }
+
+
+def migrate(islands, migrants):
+    """Migrasi ring: `migrants` elit island i menggantikan individu terburuk island i+1"""
+    if not migrants:
+        return
+    elites = [sorted(zip(island['fitness'], island['routes']), key=lambda item: -item[0])[:migrants]
+              for island in islands]
+    for i, island in enumerate(islands):
+        incoming = elites[i - 1]
+        worst = sorted(range(len(island['routes'])), key=lambda j: island['fitness'][j])[:len(incoming)]
+        for j, (fitness, route) in zip(worst, incoming):
+            island['routes'][j] = list(route)
+            island['fitness'][j] = fitness
+
+
+class IslandPool:
+    """
+    Process pool untuk island model. Setiap worker membuat optimizer sendiri
+    sekali (PlaceData dipetakan dari direktori cache jika ada, lihat
+    shared_data.py); setiap epoch hanya populasi island (rute + fitness)
+    yang dikirim bolak-balik.
+    """
+
+    def __init__(self, optimizer_class, place_data, processes):
+        self.processes = processes
+        if place_data.directory is not None:
+            initargs = (optimizer_class, None, place_data.directory)
+        else:
+            initargs = (optimizer_class, place_data)
+        self._pool = pool_context().Pool(processes=processes, initializer=_init_island_worker,
+                                         initargs=initargs)
+
+    def evolve(self, preferences, dynamic_data, population, criteria, options, hall_of_fame,
+               local_search=False, on_generation=None, verbose=True, rng=None):
+        """
+        Jalankan island model sampai `criteria` terpenuhi (dicek setiap
+        epoch migrasi). population: rute awal (dibagi rata ke island).
+        Return (populasi gabungan, logbook gabungan, stop_reason, evaluations);
+        hall_of_fame diisi elit dari semua island. rng: random.Random milik run
+        (seed setiap island per epoch; default modul random).
+        """
+        rng = rng or random
+        count = options['count']
+        size = len(population) // count
+        islands = [{'crossover': method, 'routes': [list(r) for r in population[i * size:(i + 1) * size]],
+                    'fitness': [None] * size}
+                   for i, method in enumerate(options['crossover_methods'])]
+
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals', 'avg', 'max', 'min', 'std']
+        generation = 0
+        evaluations = 0
+        best_fitness = float('-inf')
+        last_improvement = 0
+        stop_reason = None
+
+        while stop_reason is None:
+            generations = min(options['migration_interval'], max(criteria.max_generations - generation, 0))
+            tasks = [(preferences, dynamic_data, island['crossover'], island['routes'], island['fitness'],
+                      generations, rng.getrandbits(32), criteria.deadline, local_search)
+                     for island in islands]
+            epoch_start = time.monotonic()
+            results = self._pool.map(_evolve_island, tasks)
+            criteria.observe_generation((time.monotonic() - epoch_start) / max(generations, 1))
+
+            # Epoch pertama ikut mencatat generasi 0 (populasi awal)
+            first = 1 if logbook else 0
+            for offset in range(min(len(result['records']) for result in results)):
+                record = merge_records([result['records'][offset] for result in results])
+                gen = generation + offset + first
+                logbook.record(gen=gen, **record)
+                if verbose:
+                    print(logbook.stream)
+                if on_generation:
+                    on_generation(gen, {key: record[key] for key in ('avg', 'max', 'min', 'std')})
+            generation = logbook[-1]['gen']
+
+            for island, result in zip(islands, results):
+                island['routes'] = result['routes']
+                island['fitness'] = result['fitness']
+                evaluations += result['evaluations']
+                for route, fitness in result['hall_of_fame']:
+                    individual = Individual(route)
+                    individual.fitness.values = (fitness,)
+                    hall_of_fame.update([individual])
+
+            current_best = hall_of_fame[0].fitness.values[0]
+            if current_best > best_fitness + criteria.tolerance:
+                last_improvement = generation
+            best_fitness = max(best_fitness, current_best)
+
+            if any(result['stop_reason'] == STOP_DEADLINE for result in results):
+                stop_reason = STOP_DEADLINE
+            else:
+                stop_reason = criteria.check(generation, best_fitness, last_improvement, evaluations)
+            if stop_reason is None:
+                migrate(islands, options['migrants'])
+
+        merged = []
+        for island in islands:
+            for route, fitness in zip(island['routes'], island['fitness']):
+                individual = Individual(route)
+                individual.fitness.values = (fitness,)
+                merged.append(individual)
+        merged.sort(key=lambda ind: ind.fitness.values[0], reverse=True)
+        return merged, logbook, stop_reason, evaluations
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_island_pool(optimizer_class, place_data, processes):
+    """Pool dipakai ulang antar request untuk PlaceData dan jumlah island yang sama"""
+    key = (id(place_data), processes)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = IslandPool(optimizer_class, place_data, processes)
+            _POOLS[key] = pool
+        return pool
+
+
+def shutdown_island_pools():
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job:
+    """
+    Satu job optimasi yang berjalan di background.
+    Event (progress per generasi, hasil akhir) disimpan berurutan agar
+    klien polling maupun SSE bisa membaca dari indeks terakhirnya.
+    """
+
+    def __init__(self, kind, journey_id):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.journey_id = journey_id
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.finished_at = None
+        self.events = []
+        self.progress = None
+        self.result = None
+        self.http_status = None
+        self.error = None
+        self._condition = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'error')
+
+    def publish(self, event_type, data, status=None):
+        with self._condition:
+            if status:
+                self.status = status
+            self.events.append({'event': event_type, 'data': data})
+            self._condition.notify_all()
+
+    def report_generation(self, generation, record):
+        """Callback GA: catat statistik logbook satu generasi"""
+        progress = {'gen': int(generation)}
+        progress.update({key: float(value) for key, value in record.items()})
+        self.progress = progress
+        self.publish('generation', progress)
+
+    def wait_events(self, index, timeout=15.0):
+        """Tunggu event baru setelah indeks tertentu; kembalikan (events, indeks_baru, selesai)"""
+        with self._condition:
+            if index >= len(self.events) and not self.finished:
+                self._condition.wait(timeout)
+            events = self.events[index:]
+            return events, index + len(events), self.finished
+
+    def to_dict(self, include_result=True):
+        data = {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'journey_id': self.journey_id,
+            'status': self.status,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'generations_reported': sum(1 for event in self.events if event['event'] == 'generation'),
+            'progress': self.progress
+        }
+        if include_result and self.finished:
+            data['result'] = self.result
+            data['http_status'] = self.http_status
+            data['error'] = self.error
+        return data
+
+
+class JobManager:
+    """Antrian job optimasi di thread pool, supaya worker Flask tidak terblokir selama GA"""
+
+    def __init__(self, max_workers=None, max_jobs=1000, ttl_seconds=3600):
+        self.max_workers = max_workers or int(os.environ.get('TOURISM_JOB_WORKERS', 4))
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ga-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, journey_id, func):
+        """
+        func(job) dijalankan di background dan harus mengembalikan
+        (response_body, http_status) yang sama dengan endpoint sinkron.
+        """
+        job = Job(kind, journey_id)
+        with self._lock:
+            self._cleanup()
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, func):
+        job.publish('status', {'status': 'running'}, status='running')
+        try:
+            job.result, job.http_status = func(job)
+            job.finished_at = time.time()
+            job.publish('done', {'result': job.result, 'http_status': job.http_status}, status='done')
+        except Exception as e:
+            print(f"💥 Job {job.job_id} Error: {str(e)}")
+            print(traceback.format_exc())
+            job.error = str(e)
+            job.result = {'status': 'error', 'message': str(e)}
+            job.http_status = 500
+            job.finished_at = time.time()
+            job.publish('error', {'message': str(e)}, status='error')
+
+    def _cleanup(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and now - job.finished_at > self.ttl_seconds]
+        for job_id in expired:
+            del self._jobs[job_id]
+        while len(self._jobs) >= self.max_jobs:
+            oldest_id = next((job_id for job_id, job in self._jobs.items() if job.finished), None)
+            if oldest_id is None:
+                break
+            del self._jobs[oldest_id]
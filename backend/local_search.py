@@ -0,0 +1,71 @@
+from route_state import RouteContext, RouteState
+
+
+class LocalSearch:
+    """
+    Local search (memetic) untuk rute GA: 2-opt, relocate, dan swap-in
+    (ganti satu tempat dengan tempat yang belum dikunjungi).
+
+    Setiap langkah dinilai dengan RouteState (delta dari sisi yang berubah;
+    waktu tempuh dari posisi pertama yang berubah), bukan evaluasi ulang
+    penuh. Yang diterima hanya langkah yang menaikkan fitness dan tidak
+    menambah tiket melewati budget.
+    """
+
+    def __init__(self, catalog, preferences, distance_matrix, travel_times, start_leg, end_leg,
+                 max_passes=5, tolerance=1e-9, context=None, candidates=None):
+        self.context = context or RouteContext(catalog, preferences, distance_matrix, travel_times,
+                                               start_leg, end_leg)
+        # candidates(route) -> place ID untuk swap-in; default semua tempat yang belum dikunjungi
+        self.candidates = candidates
+        self.max_passes = max_passes
+        self.tolerance = tolerance
+
+    def _best_move(self, state):
+        k = len(state)
+        best = (state.fitness + self.tolerance, None)
+
+        for i in range(k - 1):
+            for j in range(i + 1, k):
+                value = state.score_reverse(i, j)
+                if value > best[0]:
+                    best = (value, ('reverse', i, j))
+
+        for i in range(k if k > 1 else 0):
+            for j in range(k):
+                if j != i:
+                    value = state.score_relocate(i, j)
+                    if value > best[0]:
+                        best = (value, ('relocate', i, j))
+
+        budget = self.context.budget
+        if self.candidates is None:
+            unvisited = [place for place in self.context.allowed if place not in state.position]
+        else:
+            index_of = self.context.catalog.index_of
+            unvisited = [index_of(place_id) for place_id in self.candidates(state.route)]
+        for i in range(k):
+            for place in unvisited:
+                fee = state.fee_after_replace(i, place)
+                if fee > budget and fee > state.fee:
+                    continue
+                value = state.score_replace(i, place)
+                if value > best[0]:
+                    best = (value, ('replace', i, place))
+
+        return best[1]
+
+    def improve(self, route):
+        """Rute (place ID) hasil best-improvement sampai tidak ada langkah yang lebih baik"""
+        state = RouteState(self.context, route)
+        if not len(state):
+            return list(route)
+
+        for _ in range(self.max_passes):
+            move = self._best_move(state)
+            if move is None:
+                break
+            kind, i, j = move
+            getattr(state, f"apply_{kind}")(i, j)
+
+        return state.route
@@ -0,0 +1,124 @@
+import os
+import threading
+
+from fitness import evaluate_routes_batch, leg_distance_vector
+from shared_data import load_place_data, pool_context
+from travel_time import TravelTimeModel, free_flow_table
+
+# State read-only di setiap worker, diisi sekali oleh initializer
+_WORKER = {}
+
+
+def _init_worker(catalog, distance_method, distance_matrix, directory=None):
+    if directory is not None:
+        # Array dipetakan dari direktori cache (memory-mapped), tidak dikirim lewat pickle
+        place_data = load_place_data(directory)
+        catalog, distance_matrix = place_data.catalog, place_data.distance_matrix
+    _WORKER['catalog'] = catalog
+    _WORKER['distance_method'] = distance_method
+    _WORKER['distance_matrix'] = distance_matrix
+    _WORKER['legs'] = {}
+    _WORKER['travel_times'] = None
+
+
+def _worker_legs(preferences):
+    """Vektor jarak start/end dihitung sekali per worker per pasangan lokasi"""
+    start_loc = preferences['start_location']
+    end_loc = preferences['end_location']
+    key = (start_loc['latitude'], start_loc['longitude'], end_loc['latitude'], end_loc['longitude'])
+    legs = _WORKER['legs']
+    if key not in legs:
+        if len(legs) > 32:
+            legs.clear()
+        catalog = _WORKER['catalog']
+        method = _WORKER['distance_method']
+        legs[key] = (leg_distance_vector(catalog, start_loc, method), leg_distance_vector(catalog, end_loc, method))
+    return legs[key]
+
+
+def _worker_travel_times(traffic_factors):
+    """Model waktu tempuh worker; hanya jam yang faktornya berubah yang dihitung ulang"""
+    model = _WORKER['travel_times']
+    if model is None:
+        model = _WORKER['travel_times'] = TravelTimeModel(
+            _WORKER['distance_matrix'], free_flow=free_flow_table(_WORKER['distance_matrix']))
+    model.sync(dict(enumerate(traffic_factors)))
+    return model
+
+
+def _evaluate_chunk(args):
+    routes, preferences, traffic_factors = args
+    start_leg, end_leg = _worker_legs(preferences)
+    return evaluate_routes_batch(routes, _WORKER['catalog'], preferences,
+                                 _WORKER['distance_matrix'], _worker_travel_times(traffic_factors),
+                                 start_leg, end_leg)
+
+
+def configured_workers(requested=None):
+    """Jumlah worker dari parameter request, lalu env TOURISM_GA_WORKERS (0/1 = serial)"""
+    if requested is None:
+        requested = os.environ.get('TOURISM_GA_WORKERS', 0)
+    try:
+        workers = int(requested)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid parallel_workers: {requested}")
+    return max(0, min(workers, 64))
+
+
+class ParallelEvaluator:
+    """
+    Evaluasi fitness di process pool. Katalog dan matriks dikirim ke worker
+    sekali lewat initializer (atau, jika PlaceData punya direktori cache,
+    worker memetakan file yang sama); setiap task hanya membawa potongan
+    rute dan preferensi (kecil).
+    """
+
+    def __init__(self, place_data, workers):
+        self.place_data = place_data
+        self.workers = workers
+        if place_data.directory is not None:
+            initargs = (None, place_data.distance_method, None, place_data.directory)
+        else:
+            initargs = (place_data.catalog, place_data.distance_method, place_data.distance_matrix)
+        self._pool = pool_context().Pool(processes=workers, initializer=_init_worker, initargs=initargs)
+
+    def evaluate(self, routes, preferences, traffic_factors=None):
+        """traffic_factors: 24 faktor lalu lintas per jam (TravelTimeModel.fingerprint())"""
+        if not routes:
+            return []
+        # list biasa: individu DEAP tidak perlu (dan tidak boleh bergantung pada creator) di worker
+        routes = [list(route) for route in routes]
+        chunk_size = -(-len(routes) // self.workers)
+        traffic_factors = tuple(traffic_factors or (1.0,) * 24)
+        chunks = [(routes[i:i + chunk_size], preferences, traffic_factors)
+                  for i in range(0, len(routes), chunk_size)]
+        results = []
+        for chunk_result in self._pool.map(_evaluate_chunk, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_parallel_evaluator(place_data, workers):
+    """Pool dipakai ulang antar request untuk PlaceData dan jumlah worker yang sama"""
+    key = (id(place_data), workers)
+    with _POOLS_LOCK:
+        evaluator = _POOLS.get(key)
+        if evaluator is None:
+            evaluator = ParallelEvaluator(place_data, workers)
+            _POOLS[key] = evaluator
+        return evaluator
+
+
+def shutdown_pools():
+    with _POOLS_LOCK:
+        for evaluator in _POOLS.values():
+            evaluator.close()
+        _POOLS.clear()
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from spatial_index import SpatialIndex
+from travel_time import free_flow_table
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@lru_cache(maxsize=4096)
+def time_to_minutes(time_str):
+    """Ubah string 'HH:MM' menjadi menit sejak tengah malam (di-cache per string)"""
+    hours, minutes = time_str.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def minutes_to_time(minutes):
+    """Menit sejak tengah malam (boleh pecahan / lewat tengah malam) -> 'HH:MM'"""
+    minutes = int(minutes) % MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _frozen(values, dtype):
+    array = np.ascontiguousarray(values, dtype=dtype)
+    array.setflags(write=False)
+    return array
+
+
+class PlaceCatalog:
+    """
+    Katalog tempat wisata berbasis array NumPy (read-only).
+
+    Dibangun sekali dari df_places supaya jalur GA (fitness, constraint,
+    mutasi, jadwal) tidak perlu df_places.iloc per gen. df_places tetap
+    dipakai untuk output API.
+
+    Place ID tidak harus berurutan: indeks baris = urutan di katalog,
+    dipetakan lewat index_of().
+    """
+
+    # Array yang disimpan ke disk oleh save() dan di-memory-map oleh load()
+    ARRAY_FIELDS = ('ids', 'category_codes', 'latitude', 'longitude', 'open_min', 'close_min',
+                    'visit_duration', 'entrance_fee', 'popularity', 'crowdedness')
+
+    def __init__(self, ids, names, categories, latitude, longitude, open_min, close_min,
+                 visit_duration, entrance_fee, popularity, crowdedness):
+        self.ids = _frozen(ids, np.int64)
+        self._index = {place_id: idx for idx, place_id in enumerate(self.ids.tolist())}
+        if len(self._index) != len(self.ids):
+            raise ValueError("Place IDs must be unique")
+        self.names = tuple(str(name) for name in names)
+        self.category_names = tuple(dict.fromkeys(str(c) for c in categories))
+        self._category_lookup = {name: code for code, name in enumerate(self.category_names)}
+        self.category_codes = _frozen([self._category_lookup[str(c)] for c in categories], np.int64)
+        self.latitude = _frozen(latitude, np.float64)
+        self.longitude = _frozen(longitude, np.float64)
+        self.open_min = _frozen(open_min, np.int64)
+        self.close_min = _frozen(close_min, np.int64)
+        self.visit_duration = _frozen(visit_duration, np.int64)
+        self.entrance_fee = _frozen(entrance_fee, np.int64)
+        self.popularity = _frozen(popularity, np.float64)
+        self.crowdedness = _frozen(crowdedness, np.float64)
+
+        # Python-level copies untuk loop skalar (hindari overhead numpy scalar)
+        self.fee_list = self.entrance_fee.tolist()
+        self.popularity_list = self.popularity.tolist()
+        self.visit_duration_list = self.visit_duration.tolist()
+        self.category_list = self.category_codes.tolist()
+        self._spatial_index = None
+
+    @classmethod
+    def from_dataframe(cls, df):
+        return cls(
+            ids=df['id'].to_numpy(),
+            names=df['name'].tolist(),
+            categories=df['category'].tolist(),
+            latitude=df['latitude'].to_numpy(),
+            longitude=df['longitude'].to_numpy(),
+            open_min=[time_to_minutes(t) for t in df['open_time']],
+            close_min=[time_to_minutes(t) for t in df['close_time']],
+            visit_duration=df['visit_duration_min'].to_numpy(),
+            entrance_fee=df['entrance_fee'].to_numpy(),
+            popularity=df['popularity'].to_numpy(),
+            crowdedness=df['crowdedness_factor'].to_numpy()
+        )
+
+    def save(self, directory):
+        """Simpan array katalog (.npy) + nama/kategori (catalog.json) ke direktori"""
+        for field in self.ARRAY_FIELDS:
+            np.save(os.path.join(directory, f"catalog_{field}.npy"), getattr(self, field))
+        with open(os.path.join(directory, 'catalog.json'), 'w', encoding='utf-8') as f:
+            json.dump({'names': self.names, 'category_names': self.category_names}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Katalog dari save(); array numerik di-memory-map read-only (dibagi antar proses)"""
+        arrays = {field: np.load(os.path.join(directory, f"catalog_{field}.npy"), mmap_mode=mmap_mode)
+                  for field in cls.ARRAY_FIELDS}
+        with open(os.path.join(directory, 'catalog.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        category_names = meta['category_names']
+        return cls(
+            ids=arrays['ids'],
+            names=meta['names'],
+            categories=[category_names[code] for code in arrays['category_codes'].tolist()],
+            latitude=arrays['latitude'],
+            longitude=arrays['longitude'],
+            open_min=arrays['open_min'],
+            close_min=arrays['close_min'],
+            visit_duration=arrays['visit_duration'],
+            entrance_fee=arrays['entrance_fee'],
+            popularity=arrays['popularity'],
+            crowdedness=arrays['crowdedness']
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def all_ids(self):
+        """Semua place ID (urut sesuai indeks katalog)"""
+        return self.ids.tolist()
+
+    def index_of(self, place_id):
+        """Indeks baris untuk place ID (KeyError jika ID tidak ada)"""
+        return self._index[place_id]
+
+    def __contains__(self, place_id):
+        return place_id in self._index
+
+    @property
+    def spatial_index(self):
+        """Grid index koordinat untuk kandidat tempat terdekat (dibangun saat pertama dipakai)"""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self.latitude, self.longitude)
+        return self._spatial_index
+
+    def category_codes_for(self, category_names):
+        """Kode kategori untuk daftar nama kategori (nama tak dikenal diabaikan)"""
+        return {self._category_lookup[name] for name in category_names if name in self._category_lookup}
+
+    def fee(self, place_id):
+        return self.fee_list[self._index[place_id]]
+
+    def total_fee(self, route):
+        fees, index = self.fee_list, self._index
+        return sum(fees[index[place_id]] for place_id in route)
+
+    def location(self, place_id):
+        idx = self._index[place_id]
+        return float(self.latitude[idx]), float(self.longitude[idx])
+
+
+class PlaceData:
+    """
+    Data tempat yang read-only dan bisa dibagi antar sesi/journey:
+    df_places (output API), katalog array, dan matriks jarak (ndarray
+    dense atau SparseDistanceMatrix). Waktu tempuh diturunkan dari tabel
+    free-flow bersama (free_flow) x faktor jam milik TravelTimeModel per journey.
+
+    directory: direktori cache tempat array-nya di-memory-map (lihat
+    shared_data.py), atau None jika hanya ada di memori proses ini.
+    """
+
+    def __init__(self, df_places, catalog, distance_method, distance_matrix, directory=None):
+        self.df_places = df_places
+        self.catalog = catalog
+        self.distance_method = distance_method
+        self.distance_matrix = distance_matrix
+        self.directory = directory
+        if isinstance(distance_matrix, np.ndarray) and distance_matrix.flags.writeable:
+            distance_matrix.setflags(write=False)
+        self._version = None
+        self._free_flow = None
+
+    def __getstate__(self):
+        # Tabel free-flow dihitung ulang di proses tujuan, tidak ikut di-pickle
+        state = self.__dict__.copy()
+        state['_free_flow'] = None
+        return state
+
+    @property
+    def free_flow(self):
+        """Tabel waktu tempuh free-flow n x n bersama semua journey (None jika terlalu besar/sparse)"""
+        if self._free_flow is None:
+            self._free_flow = free_flow_table(self.distance_matrix)
+        return self._free_flow
+
+    @property
+    def version(self):
+        """Hash isi katalog + metode jarak (sama di semua proses untuk data yang sama)"""
+        if self._version is None:
+            digest = hashlib.sha256(self.distance_method.encode())
+            for field in PlaceCatalog.ARRAY_FIELDS:
+                digest.update(np.ascontiguousarray(getattr(self.catalog, field)).tobytes())
+            digest.update(json.dumps([self.catalog.names, self.catalog.category_names]).encode())
+            self._version = digest.hexdigest()[:20]
+        return self._version
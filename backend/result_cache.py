@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from distance import DEFAULT_CACHE_DIR
+
+# 'memory' (LRU per proses), 'file' (dibagi antar worker gunicorn) atau 'off'
+RESULT_CACHE_BACKENDS = ('memory', 'file', 'off')
+RESULT_CACHE_SIZE = int(os.environ.get('TOURISM_RESULT_CACHE_SIZE', 1000))
+RESULT_CACHE_TTL = float(os.environ.get('TOURISM_RESULT_CACHE_TTL', 600))
+# Field list yang berarti himpunan (urutan/duplikat tidak mengubah optimasi)
+UNORDERED_FIELDS = ('must_visit', 'avoid_places', 'preferred_categories', 'closed_places')
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def normalize_sets(data):
+    """Salinan dict dengan field UNORDERED_FIELDS diurutkan dan tanpa duplikat"""
+    normalized = dict(data)
+    for field in UNORDERED_FIELDS:
+        values = normalized.get(field)
+        if isinstance(values, (list, tuple, set)):
+            unique = {_canonical(value): value for value in values}
+            normalized[field] = [unique[key] for key in sorted(unique)]
+    return normalized
+
+
+def result_key(place_version, preferences, dynamic_data, options):
+    """
+    Kunci hasil optimasi: versi katalog (PlaceData.version), preferensi
+    ternormalisasi, kondisi dinamis, dan opsi algoritma (crossover,
+    algorithm, stop_criteria, local_search, islands, seed). Field himpunan
+    (must_visit, avoid_places, ...) dinormalisasi agar urutan tidak
+    menghasilkan kunci berbeda.
+    """
+    encoded = _canonical({
+        'catalog': place_version,
+        'preferences': normalize_sets(preferences),
+        'dynamic_data': normalize_sets(dynamic_data),
+        'options': options
+    }).encode()
+    return hashlib.sha256(encoded).hexdigest()[:24]
+
+
+class MemoryBackend:
+    """LRU + TTL di memori proses"""
+
+    def __init__(self, max_entries=None, ttl_seconds=None):
+        self.max_entries = max_entries or RESULT_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds or RESULT_CACHE_TTL
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class FileBackend:
+    """
+    Satu file JSON per kunci di direktori (dibagi antar proses; bukan pickle,
+    jadi file di direktori bersama tidak bisa menjalankan kode saat dibaca).
+    TTL dari mtime file; jika melebihi max_entries, file tertua dihapus.
+    Penulisan atomik (file sementara + rename).
+    """
+
+    def __init__(self, directory=None, max_entries=None, ttl_seconds=None):
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, 'results')
+        self.max_entries = max_entries or RESULT_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds or RESULT_CACHE_TTL
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _files(self):
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Result cache not writable ({e})")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._prune()
+
+    def _prune(self):
+        files = self._files()
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for entry in self._files():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def __len__(self):
+        return len(self._files())
+
+
+class ResultCache:
+    """
+    Cache hasil optimize_route_with_crossover_choice untuk request identik.
+    Nilai: body hasil (JSON) + state journey (rute, hall of fame)
+    agar sesi yang kena cache tetap bisa lanjut ke next-place/reoptimize.
+    Backend apa pun dengan get(key), set(key, value), clear() dan len().
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return {
+            'backend': type(self.backend).__name__,
+            'entries': len(self.backend),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+def create_result_cache(backend=None):
+    """ResultCache dari env TOURISM_RESULT_CACHE (default 'memory'); None jika 'off'"""
+    backend = backend or os.environ.get('TOURISM_RESULT_CACHE', 'memory')
+    if backend not in RESULT_CACHE_BACKENDS:
+        raise ValueError(f"Invalid result cache backend '{backend}'. Valid options: {list(RESULT_CACHE_BACKENDS)}")
+    if backend == 'off':
+        return None
+    if backend == 'file':
+        return ResultCache(FileBackend(os.environ.get('TOURISM_RESULT_CACHE_DIR')))
+    return ResultCache(MemoryBackend())
@@ -0,0 +1,320 @@
+from place_catalog import time_to_minutes
+from travel_time import hour_of
+
+
+class RouteContext:
+    """
+    Data tetap untuk menilai rute dalam satu optimasi: katalog, matriks jarak,
+    model waktu tempuh (TravelTimeModel), vektor leg awal/akhir, dan konstanta
+    preferensi (budget, jam, kategori, must-visit). Dibuat sekali, dipakai
+    banyak RouteState.
+    """
+
+    def __init__(self, catalog, preferences, distance_matrix, travel_times, start_leg, end_leg):
+        self.catalog = catalog
+        self.preferences = preferences
+        self.distance_matrix = distance_matrix
+        self.travel_times = travel_times
+        # Faktor lalu lintas sama untuk semua jam: delta waktu tempuh cukup dari sisi yang berubah
+        self.flat_traffic = travel_times.flat
+        self.start_leg = start_leg.tolist()
+        self.end_leg = end_leg.tolist()
+
+        self.max_places = preferences['max_places']
+        self.budget = preferences['budget']
+        self.day_start = time_to_minutes(preferences['start_time'])
+        self.day_end = time_to_minutes(preferences['end_time'])
+        preferred_codes = catalog.category_codes_for(preferences['preferred_categories'])
+        self.preferred = [code in preferred_codes for code in catalog.category_list]
+        self.must_visit = {catalog.index_of(place_id) for place_id in preferences['must_visit']}
+        avoid = set(preferences['avoid_places'])
+        self.allowed = [catalog.index_of(place_id) for place_id in catalog.all_ids if place_id not in avoid]
+
+    def distance(self, a, b):
+        """Jarak antar indeks tempat; None = lokasi awal (a) atau akhir (b)"""
+        if a is None:
+            return self.start_leg[b] if b is not None else 0.0
+        if b is None:
+            return self.end_leg[a]
+        return float(self.distance_matrix[a, b])
+
+    def travel(self, a, b, elapsed):
+        """Waktu tempuh a -> b jika berangkat `elapsed` menit setelah start_time"""
+        return self.travel_times.minutes(a, b, hour_of(self.day_start + elapsed))
+
+    def flat_travel(self, a, b):
+        """Waktu tempuh antar tempat jika flat_traffic (leg awal/akhir tidak dihitung, sama dengan fitness)"""
+        if a is None or b is None:
+            return 0.0
+        return self.travel_times.minutes(a, b, 0)
+
+    def elapsed(self, path, start=0, prefix=0.0):
+        """
+        Menit sejak start_time sampai kunjungan terakhir path selesai (tanpa
+        leg awal, sama dengan fitness). Jika start > 0, prefix = waktu selesai
+        path[start - 1] dan hanya path[start:] yang dihitung.
+        """
+        if not path:
+            return 0.0
+        visit_duration = self.catalog.visit_duration_list
+        if start == 0:
+            elapsed = float(visit_duration[path[0]])
+            start = 1
+        else:
+            elapsed = prefix
+        for position in range(start, len(path)):
+            elapsed += self.travel(path[position - 1], path[position], elapsed)
+            elapsed += visit_duration[path[position]]
+        return elapsed
+
+    def score(self, count, distance, elapsed, fee, popularity, category, must):
+        """Rumus eval_route_fixed dari total rute"""
+        if count == 0:
+            return 1.0
+        base_fitness = (
+            0.40 * (count / self.max_places) +
+            0.15 * max(0, 1 - (distance / 200)) +
+            0.20 * (category / count) +
+            0.25 * ((popularity / count) / 10.0)
+        ) * 100
+        penalty_multiplier = 1.0
+        if fee > self.budget:
+            penalty_multiplier *= max(0.5, self.budget / fee)
+        if self.must_visit:
+            penalty_multiplier *= (0.3 + 0.7 * must / len(self.must_visit))
+        if self.day_start + elapsed > self.day_end:
+            penalty_multiplier *= 0.7
+        return max(1.0, base_fitness * penalty_multiplier)
+
+
+class RouteState:
+    """
+    Rute beserta cache prefix: jarak kumulatif, waktu selesai kunjungan
+    (menit sejak start_time, tanpa leg awal seperti fitness), tiket, dan
+    jumlah kategori favorit, plus total popularitas/must-visit dan peta
+    indeks tempat -> posisi (position).
+
+    score_*() menilai langkah swap/insert/remove/replace/reverse/relocate:
+    jarak dan komponen set dalam O(1) dari sisi yang berubah. Waktu tempuh:
+    - lalu lintas flat (faktor semua jam sama): juga O(1) dari sisi yang
+      berubah, tanpa menyusun rute baru;
+    - selain itu waktu tempuh bergantung jam keberangkatan, sehingga sufiks
+      mulai posisi pertama yang berubah disusun dan dihitung ulang:
+      O(n - start) per langkah (prefix_arrival sebelum posisi itu dipakai ulang).
+    apply_*() menerapkan langkah dan membangun ulang prefix (O(k)).
+    Matriks jarak diasumsikan simetris (haversine/geodesic).
+    """
+
+    def __init__(self, context, route):
+        self.context = context
+        self.path = [context.catalog.index_of(place_id) for place_id in route]
+        self._rebuild()
+
+    def _rebuild(self):
+        context = self.context
+        catalog = context.catalog
+        self.prefix_distance = []
+        self.prefix_arrival = []
+        self.prefix_fee = []
+        self.prefix_category = []
+        self.position = {place: position for position, place in enumerate(self.path)}
+        distance = fee = category = 0
+        elapsed = popularity = 0.0
+        must = 0
+        previous = None
+        for place in self.path:
+            distance += context.distance(previous, place)
+            if previous is None:
+                elapsed = float(catalog.visit_duration_list[place])
+            else:
+                elapsed += context.travel(previous, place, elapsed)
+                elapsed += catalog.visit_duration_list[place]
+            fee += catalog.fee_list[place]
+            popularity += catalog.popularity_list[place]
+            category += context.preferred[place]
+            must += place in context.must_visit
+            self.prefix_distance.append(distance)
+            self.prefix_arrival.append(elapsed)
+            self.prefix_fee.append(fee)
+            self.prefix_category.append(category)
+            previous = place
+
+        self.distance = distance + (context.distance(previous, None) if self.path else 0.0)
+        self.elapsed = elapsed
+        self.fee = fee
+        self.popularity = popularity
+        self.category = category
+        self.must = must
+        self.fitness = self._score()
+
+    def __len__(self):
+        return len(self.path)
+
+    @property
+    def route(self):
+        """Rute sebagai place ID"""
+        ids = self.context.catalog.ids
+        return [int(ids[place]) for place in self.path]
+
+    @property
+    def feasible(self):
+        """Kunjungan terakhir selesai sebelum end_time"""
+        return self.context.day_start + self.elapsed <= self.context.day_end
+
+    def _at(self, position):
+        return self.path[position] if 0 <= position < len(self.path) else None
+
+    def _elapsed_from(self, start, suffix):
+        """
+        Waktu selesai rute baru self.path[:start] + suffix (sama dengan
+        RouteContext.elapsed); prefix sebelum `start` dari prefix_arrival
+        """
+        context = self.context
+        visit_duration = context.catalog.visit_duration_list
+        minutes = context.travel_times.minutes
+        day_start = context.day_start
+        if start == 0:
+            if not suffix:
+                return 0.0
+            previous = suffix[0]
+            elapsed = float(visit_duration[previous])
+            suffix = suffix[1:]
+        else:
+            previous = self.path[start - 1]
+            elapsed = self.prefix_arrival[start - 1]
+        for place in suffix:
+            elapsed += minutes(previous, place, hour_of(day_start + elapsed))
+            elapsed += visit_duration[place]
+            previous = place
+        return elapsed
+
+    def _score(self, count_delta=0, removed_edges=(), added_edges=(), removed_places=(), added_places=(),
+               suffix=None, start=0):
+        """suffix(): sufiks rute baru mulai posisi `start`, hanya dipanggil jika lalu lintas tidak flat"""
+        context = self.context
+        catalog = context.catalog
+        distance = self.distance
+        for a, b in removed_edges:
+            distance -= context.distance(a, b)
+        for a, b in added_edges:
+            distance += context.distance(a, b)
+        fee, popularity = self.fee, self.popularity
+        category, must = self.category, self.must
+        for place in removed_places:
+            fee -= catalog.fee_list[place]
+            popularity -= catalog.popularity_list[place]
+            category -= context.preferred[place]
+            must -= place in context.must_visit
+        for place in added_places:
+            fee += catalog.fee_list[place]
+            popularity += catalog.popularity_list[place]
+            category += context.preferred[place]
+            must += place in context.must_visit
+        if suffix is None:
+            elapsed = self.elapsed
+        elif context.flat_traffic:
+            elapsed = self.elapsed
+            for a, b in removed_edges:
+                elapsed -= context.flat_travel(a, b)
+            for a, b in added_edges:
+                elapsed += context.flat_travel(a, b)
+            for place in removed_places:
+                elapsed -= catalog.visit_duration_list[place]
+            for place in added_places:
+                elapsed += catalog.visit_duration_list[place]
+        else:
+            elapsed = self._elapsed_from(start, suffix())
+        return context.score(len(self.path) + count_delta, distance, elapsed, fee, popularity, category, must)
+
+    def fee_after_replace(self, position, place):
+        catalog = self.context.catalog
+        return self.fee - catalog.fee_list[self.path[position]] + catalog.fee_list[place]
+
+    # --- Penilaian langkah (tanpa mengubah rute) ---
+
+    def score_swap(self, i, j):
+        """Tukar posisi i dan j"""
+        if i == j:
+            return self.fitness
+        i, j = min(i, j), max(i, j)
+        p = self.path
+        before, x, y, after = self._at(i - 1), p[i], p[j], self._at(j + 1)
+        if j == i + 1:
+            removed = [(before, x), (x, y), (y, after)]
+            added = [(before, y), (y, x), (x, after)]
+        else:
+            removed = [(before, x), (x, p[i + 1]), (p[j - 1], y), (y, after)]
+            added = [(before, y), (y, p[i + 1]), (p[j - 1], x), (x, after)]
+        return self._score(removed_edges=removed, added_edges=added,
+                           suffix=lambda: [y] + p[i + 1:j] + [x] + p[j + 1:], start=i)
+
+    def score_insert(self, place, position):
+        """Sisipkan indeks tempat `place` sebelum posisi `position` (len = di akhir)"""
+        before, after = self._at(position - 1), self._at(position)
+        return self._score(1, [(before, after)], [(before, place), (place, after)], added_places=[place],
+                           suffix=lambda: [place] + self.path[position:], start=position)
+
+    def score_remove(self, position):
+        before, place, after = self._at(position - 1), self.path[position], self._at(position + 1)
+        return self._score(-1, [(before, place), (place, after)], [(before, after)], removed_places=[place],
+                           suffix=lambda: self.path[position + 1:], start=position)
+
+    def score_replace(self, position, place):
+        """Ganti tempat di `position` dengan indeks tempat `place`"""
+        before, old, after = self._at(position - 1), self.path[position], self._at(position + 1)
+        return self._score(0, [(before, old), (old, after)], [(before, place), (place, after)],
+                           removed_places=[old], added_places=[place],
+                           suffix=lambda: [place] + self.path[position + 1:], start=position)
+
+    def score_reverse(self, i, j):
+        """2-opt: balik segmen path[i..j]"""
+        before, after = self._at(i - 1), self._at(j + 1)
+        p = self.path
+        return self._score(removed_edges=[(before, p[i]), (p[j], after)],
+                           added_edges=[(before, p[j]), (p[i], after)],
+                           suffix=lambda: p[i:j + 1][::-1] + p[j + 1:], start=i)
+
+    def score_relocate(self, i, j):
+        """Pindahkan path[i] ke posisi j pada rute tanpa path[i]"""
+        p = self.path
+        place = p[i]
+        rest_at = lambda r: self._at(r if r < i else r + 1) if 0 <= r < len(p) - 1 else None
+        c, d = rest_at(j - 1), rest_at(j)
+        if j < i:
+            suffix = lambda: [place] + p[j:i] + p[i + 1:]
+        else:
+            suffix = lambda: p[i + 1:j + 1] + [place] + p[j + 1:]
+        return self._score(removed_edges=[(self._at(i - 1), place), (place, self._at(i + 1)), (c, d)],
+                           added_edges=[(self._at(i - 1), self._at(i + 1)), (c, place), (place, d)],
+                           suffix=suffix, start=min(i, j))
+
+    # --- Penerapan langkah ---
+
+    def apply_swap(self, i, j):
+        self.path[i], self.path[j] = self.path[j], self.path[i]
+        self._rebuild()
+
+    def apply_insert(self, place, position):
+        self.path.insert(position, place)
+        self._rebuild()
+
+    def apply_remove(self, position):
+        del self.path[position]
+        self._rebuild()
+
+    def apply_replace(self, position, place):
+        self.path[position] = place
+        self._rebuild()
+
+    def apply_reverse(self, i, j):
+        self.path[i:j + 1] = self.path[i:j + 1][::-1]
+        self._rebuild()
+
+    def apply_relocate(self, i, j):
+        place = self.path.pop(i)
+        self.path.insert(j, place)
+        self._rebuild()
+
+    def best_insert_position(self, place):
+        """Posisi sisip dengan fitness tertinggi untuk indeks tempat `place`"""
+        return max(range(len(self.path) + 1), key=lambda position: self.score_insert(place, position))
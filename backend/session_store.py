@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class JourneySession:
+    """State satu journey: optimizer ringan + lock agar request paralel tidak saling timpa"""
+
+    def __init__(self, journey_id, optimizer):
+        self.journey_id = journey_id
+        self.optimizer = optimizer
+        self.lock = threading.RLock()
+        self.created_at = time.time()
+        self.last_access = self.created_at
+
+
+class SessionStore:
+    """
+    Penyimpanan sesi per journey ID dengan eviction LRU + TTL.
+
+    Setiap sesi punya TourismOptimizer sendiri (route, posisi, jadwal,
+    preferensi, dynamic data), tetapi semuanya memakai satu PlaceData
+    (katalog + matriks) yang sama, sehingga membuat sesi baru tidak
+    membangun ulang matriks jarak.
+    """
+
+    def __init__(self, optimizer_factory, place_data, max_sessions=None, ttl_seconds=None):
+        self.optimizer_factory = optimizer_factory
+        self.place_data = place_data
+        self.max_sessions = max_sessions or int(os.environ.get('TOURISM_MAX_SESSIONS', 1000))
+        self.ttl_seconds = ttl_seconds or float(os.environ.get('TOURISM_SESSION_TTL', 6 * 3600))
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_journey_id():
+        return uuid.uuid4().hex
+
+    def _new_session(self, journey_id):
+        return JourneySession(journey_id, self.optimizer_factory(self.place_data))
+
+    def _evict(self, now):
+        expired = [key for key, session in self._sessions.items()
+                   if now - session.last_access > self.ttl_seconds]
+        for key in expired:
+            del self._sessions[key]
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def get(self, journey_id=None):
+        """Ambil sesi untuk journey_id, atau buat sesi baru (ID diterbitkan server jika kosong)"""
+        journey_id = journey_id or self.new_journey_id()
+        now = time.time()
+
+        with self._lock:
+            session = self._sessions.get(journey_id)
+            if session is not None and now - session.last_access > self.ttl_seconds:
+                session = None
+            if session is None:
+                session = self._new_session(journey_id)
+                self._sessions[journey_id] = session
+            session.last_access = now
+            self._sessions.move_to_end(journey_id)
+            self._evict(now)
+
+        return session
+
+    def reset(self, journey_id):
+        """Ganti state journey dengan optimizer baru (data bersama tetap dipakai)"""
+        with self._lock:
+            session = self._new_session(journey_id)
+            self._sessions[journey_id] = session
+            self._sessions.move_to_end(journey_id)
+        return session
+
+    def remove(self, journey_id):
+        with self._lock:
+            return self._sessions.pop(journey_id, None) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import shutil
+
+import pandas as pd
+
+from catalog_loader import CATALOG_PATH_ENV
+from distance import DEFAULT_CACHE_DIR, load_or_build_distance_matrix
+from place_catalog import PlaceCatalog, PlaceData
+from sparse_distance import SparseDistanceMatrix
+
+# Naikkan jika isi direktori cache berubah (file lama otomatis tidak dipakai)
+FORMAT_VERSION = 1
+
+# Start method process pool (GA paralel, island, batch). Bukan 'fork': server web
+# multithread (gthread, job thread), anak hasil fork bisa mewarisi lock yang sedang
+# dipegang thread lain. Worker memuat PlaceData dari direktori cache (memory-mapped).
+POOL_START_METHOD = os.environ.get('TOURISM_POOL_START_METHOD', 'forkserver')
+# Modul yang diimpor sekali di proses forkserver (worker baru tidak mengimpor ulang)
+POOL_PRELOAD = ('tourism_optimizer',)
+
+# Env yang ikut menentukan isi PlaceData (katalog, metode, backend jarak)
+SETTINGS_ENV = (
+    CATALOG_PATH_ENV, 'TOURISM_GEODESIC_MAX_PLACES', 'TOURISM_DISTANCE_BACKEND',
+    'TOURISM_SPARSE_MIN_PLACES', 'TOURISM_SPARSE_NEIGHBOURS'
+)
+
+
+def pool_context():
+    """Context multiprocessing untuk process pool (fallback ke 'spawn' jika forkserver tidak ada)"""
+    method = POOL_START_METHOD
+    if method not in mp.get_all_start_methods():
+        method = 'spawn'
+    context = mp.get_context(method)
+    if method == 'forkserver':
+        context.set_forkserver_preload(list(POOL_PRELOAD))
+    return context
+
+
+def catalog_signature(path=None, df_places=None):
+    """Identitas sumber katalog: file (path, ukuran, mtime) atau hash isi DataFrame"""
+    if path:
+        stat = os.stat(path)
+        return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+    return hashlib.sha256(pd.util.hash_pandas_object(df_places, index=True).values.tobytes()).hexdigest()[:20]
+
+
+def settings_key(catalog, distance_method):
+    """Kunci direktori cache dari sumber katalog, metode jarak, dan env terkait"""
+    settings = {
+        'version': FORMAT_VERSION,
+        'catalog': catalog,
+        'distance_method': distance_method,
+        'env': {name: os.environ.get(name) for name in SETTINGS_ENV}
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:20]
+
+
+def save_place_data(place_data, directory):
+    """Tulis PlaceData ke direktori (matriks dense tetap di cache distance_*.npy)"""
+    os.makedirs(directory)
+    place_data.df_places.to_pickle(os.path.join(directory, 'places.pkl'))
+    place_data.catalog.save(directory)
+    sparse = isinstance(place_data.distance_matrix, SparseDistanceMatrix)
+    if sparse:
+        place_data.distance_matrix.save(directory)
+    with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': FORMAT_VERSION,
+            'distance_method': place_data.distance_method,
+            'distance_backend': 'sparse' if sparse else 'dense'
+        }, f)
+
+
+def load_place_data(directory):
+    """PlaceData dari save_place_data(); array katalog dan matriks di-memory-map read-only"""
+    with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported place data format in {directory}")
+
+    catalog = PlaceCatalog.load(directory)
+    if meta['distance_backend'] == 'sparse':
+        distance_matrix = SparseDistanceMatrix.load(directory)
+    else:
+        distance_matrix = load_or_build_distance_matrix(catalog.latitude, catalog.longitude,
+                                                        method=meta['distance_method'],
+                                                        cache_dir=os.path.dirname(directory))
+    return PlaceData(
+        df_places=pd.read_pickle(os.path.join(directory, 'places.pkl')),
+        catalog=catalog,
+        distance_method=meta['distance_method'],
+        distance_matrix=distance_matrix,
+        directory=directory
+    )
+
+
+def load_or_build_place_data(key, build, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    PlaceData bersama untuk semua proses: dimuat dari direktori cache
+    (memory-mapped, page cache OS dibagi antar worker gunicorn) atau
+    dibangun sekali dengan build() lalu disimpan. Penulisan atomik
+    (direktori sementara + rename) sehingga worker yang start bersamaan
+    tidak pernah membaca direktori setengah jadi.
+    """
+    if not cache_dir:
+        return build()
+
+    directory = os.path.join(cache_dir, f"place_data_{key}")
+    if not os.path.isdir(directory):
+        place_data = build()
+        tmp_directory = f"{directory}.{os.getpid()}.tmp"
+        try:
+            save_place_data(place_data, tmp_directory)
+            os.rename(tmp_directory, directory)
+        except OSError as e:
+            shutil.rmtree(tmp_directory, ignore_errors=True)
+            # Proses lain bisa lebih dulu menyimpan direktori yang sama
+            if not os.path.isdir(directory):
+                print(f"⚠️ Place data cache not writable ({e}), using in-memory data")
+                return place_data
+
+    place_data = load_place_data(directory)
+    print(f"📦 Place data memory-mapped from {directory}")
+    return place_data
@@ -0,0 +1,174 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from distance import haversine_radians
+from spatial_index import SpatialIndex
+
+DISTANCE_BACKENDS = ('auto', 'dense', 'sparse')
+# "auto": katalog sebesar ini ke atas memakai backend sparse
+SPARSE_MIN_PLACES = int(os.environ.get('TOURISM_SPARSE_MIN_PLACES', 3000))
+SPARSE_NEIGHBOURS = int(os.environ.get('TOURISM_SPARSE_NEIGHBOURS', 32))
+SPARSE_CACHE_SIZE = int(os.environ.get('TOURISM_SPARSE_CACHE_SIZE', 200000))
+
+
+def configured_backend(n_places, backend=None):
+    """'dense' atau 'sparse' untuk katalog n_places tempat (default env TOURISM_DISTANCE_BACKEND=auto)"""
+    backend = backend or os.environ.get('TOURISM_DISTANCE_BACKEND', 'auto')
+    if backend not in DISTANCE_BACKENDS:
+        raise ValueError(f"Invalid distance backend '{backend}'. Valid options: {list(DISTANCE_BACKENDS)}")
+    if backend == 'auto':
+        return 'sparse' if n_places >= SPARSE_MIN_PLACES else 'dense'
+    return backend
+
+
+def _frozen(array):
+    array.setflags(write=False)
+    return array
+
+
+class SparseDistanceMatrix:
+    """
+    Backend jarak haversine untuk katalog besar: hanya k tetangga terdekat
+    per tempat yang disimpan (CSR: indptr, indices, data). Pasangan lain
+    dihitung saat diminta (haversine vektor); akses skalar di-cache LRU.
+
+    Antarmuka lookup sama dengan matriks dense n x n yang dipakai fitness,
+    jadwal, dan exact solver: matrix[a, b] dengan a/b int atau array indeks.
+    Rumus jarak sama dengan distance.haversine_matrix.
+    """
+
+    # Array yang disimpan ke disk oleh save() dan di-memory-map oleh load()
+    ARRAY_FIELDS = ('_lat', '_lon', '_cos', 'indptr', 'indices', 'data', '_keys')
+
+    def __init__(self, latitude, longitude, k=None, cache_size=None):
+        self._lat = np.radians(np.asarray(latitude, dtype=np.float64))
+        self._lon = np.radians(np.asarray(longitude, dtype=np.float64))
+        self._cos = np.cos(self._lat)
+        n = len(self._lat)
+        self._init_state(cache_size)
+
+        neighbour_indices, neighbour_distances = SpatialIndex(latitude, longitude).knn_graph(
+            k or SPARSE_NEIGHBOURS, self._block)
+        k = neighbour_indices.shape[1]
+
+        # CSR dengan kolom urut per baris -> kunci row * n + col terurut global (searchsorted)
+        order = np.argsort(neighbour_indices, axis=1, kind='stable')
+        self.indptr = _frozen(np.arange(0, n * k + 1, k, dtype=np.int64))
+        self.indices = _frozen(np.take_along_axis(neighbour_indices, order, axis=1).ravel().astype(np.int32))
+        self.data = _frozen(np.take_along_axis(neighbour_distances, order, axis=1).ravel())
+        self._keys = _frozen(np.repeat(np.arange(n, dtype=np.int64), k) * n + self.indices)
+
+    def _init_state(self, cache_size=None):
+        n = len(self._lat)
+        self.shape = (n, n)
+        self.cache_size = cache_size or SPARSE_CACHE_SIZE
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self, directory):
+        """Simpan koordinat dan array CSR (.npy) ke direktori"""
+        for field in self.ARRAY_FIELDS:
+            np.save(os.path.join(directory, f"sparse{field}.npy"), getattr(self, field))
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r', cache_size=None):
+        """Backend dari save(); array di-memory-map read-only (dibagi antar proses), cache LRU per proses"""
+        matrix = cls.__new__(cls)
+        for field in cls.ARRAY_FIELDS:
+            array = np.load(os.path.join(directory, f"sparse{field}.npy"), mmap_mode=mmap_mode)
+            setattr(matrix, field, _frozen(np.asarray(array)))
+        matrix._init_state(cache_size)
+        return matrix
+
+    def __getstate__(self):
+        # Lock dan cache LRU tidak ikut ke process worker
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_cache'] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.data.nbytes + self._keys.nbytes
+
+    def _block(self, rows, cols):
+        """Jarak semua pasangan rows x cols (untuk graf kNN)"""
+        rows = rows[:, None]
+        cols = cols[None, :]
+        return haversine_radians(self._lat[rows], self._lon[rows], self._cos[rows],
+                                 self._lat[cols], self._lon[cols], self._cos[cols])
+
+    def _find(self, rows, cols):
+        """Posisi pasangan di data CSR (atau -1), dicari di baris rows lalu baris cols (simetris)"""
+        n = self.shape[0]
+        positions = np.full(len(rows), -1, dtype=np.int64)
+        for a, b in ((rows, cols), (cols, rows)):
+            missing = positions < 0
+            if not missing.any():
+                break
+            keys = a[missing] * n + b[missing]
+            found = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+            hit = self._keys[found] == keys
+            positions[np.flatnonzero(missing)[hit]] = found[hit]
+        return positions
+
+    def lookup(self, rows, cols):
+        """Jarak untuk array indeks rows/cols (broadcast), vektor"""
+        rows, cols = np.broadcast_arrays(np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))
+        shape = rows.shape
+        rows = rows.ravel()
+        cols = cols.ravel()
+        distances = np.zeros(len(rows))
+        if not len(rows) or not len(self._keys):
+            return self._pairs(rows, cols).reshape(shape)
+
+        positions = self._find(rows, cols)
+        stored = positions >= 0
+        distances[stored] = self.data[positions[stored]]
+        computed = ~stored & (rows != cols)
+        if computed.any():
+            distances[computed] = self._pairs(rows[computed], cols[computed])
+        return distances.reshape(shape)
+
+    def _pairs(self, rows, cols):
+        return haversine_radians(self._lat[rows], self._lon[rows], self._cos[rows],
+                                 self._lat[cols], self._lon[cols], self._cos[cols])
+
+    def distance(self, a, b):
+        """Jarak satu pasangan (float), lewat cache LRU"""
+        if a == b:
+            return 0.0
+        key = (a, b) if a < b else (b, a)
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return value
+
+        # Nilai tersimpan di CSR memakai rumus yang sama, jadi cukup dihitung langsung
+        value = float(self._pairs(np.array([a]), np.array([b]))[0])
+        with self._lock:
+            self._cache[key] = value
+            self.misses += 1
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def __getitem__(self, key):
+        a, b = key
+        if isinstance(a, (int, np.integer)) and isinstance(b, (int, np.integer)):
+            return self.distance(int(a), int(b))
+        return self.lookup(a, b)
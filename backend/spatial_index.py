@@ -0,0 +1,170 @@
+import math
+
+import numpy as np
+
+from distance import EARTH_RADIUS_KM, haversine_to_point
+
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+# Proyeksi equirectangular sedikit berbeda dari haversine; batas ring dikecilkan agar hasil tetap eksak
+PROJECTION_SAFETY = 0.9
+
+
+class SpatialIndex:
+    """
+    Grid index (sel persegi di proyeksi equirectangular) atas koordinat
+    katalog, untuk kandidat k-terdekat / dalam radius tanpa menghitung
+    jarak ke semua tempat.
+
+    Ukuran sel dipilih supaya rata-rata ~points_per_cell tempat per sel.
+    Query memeriksa sel ring demi ring dari titik query dan berhenti saat
+    ring berikutnya pasti lebih jauh dari kandidat ke-k; jarak akhir =
+    haversine, sama dengan matriks jarak. Cocok untuk katalog regional
+    (satu provinsi/negara), bukan lintas kutub.
+    """
+
+    def __init__(self, latitude, longitude, points_per_cell=8):
+        self.latitude = np.asarray(latitude, dtype=np.float64)
+        self.longitude = np.asarray(longitude, dtype=np.float64)
+        # Katalog selalu berisi minimal satu tempat (lihat catalog_loader.validate_places)
+        n = len(self.latitude)
+
+        self._kx = KM_PER_DEGREE * math.cos(math.radians(float(self.latitude.mean())))
+        x = self.longitude * self._kx
+        y = self.latitude * KM_PER_DEGREE
+        self._x0 = float(x.min())
+        self._y0 = float(y.min())
+        width = float(np.ptp(x))
+        height = float(np.ptp(y))
+        area = max(width * height, 1e-6)
+        # Batas bawah dari sisi terpanjang: katalog satu baris/kolom (luas ~0) tetap
+        # mendapat ~n / points_per_cell sel per sumbu, bukan sel ~1e-3 km sepanjang katalog
+        self.cell_km = max(math.sqrt(area * points_per_cell / n), max(width, height) * points_per_cell / n, 1e-3)
+
+        cx = ((x - self._x0) // self.cell_km).astype(np.int64)
+        cy = ((y - self._y0) // self.cell_km).astype(np.int64)
+        self._nx = int(cx.max()) + 1
+        self._ny = int(cy.max()) + 1
+
+        # Kelompokkan indeks per sel: urutkan menurut (cx, cy), pecah di batas sel
+        order = np.lexsort((cy, cx))
+        keys = np.stack([cx[order], cy[order]], axis=1)
+        boundaries = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+        self._cells = {
+            (int(cell_x), int(cell_y)): group
+            for (cell_x, cell_y), group in zip(keys[np.r_[0, boundaries]], np.split(order, boundaries))
+        }
+        self._neighbours = {}
+
+    def __len__(self):
+        return len(self.latitude)
+
+    def _cell_of(self, latitude, longitude):
+        return (int((longitude * self._kx - self._x0) // self.cell_km),
+                int((latitude * KM_PER_DEGREE - self._y0) // self.cell_km))
+
+    def _ring(self, cx, cy, r):
+        """Indeks tempat di sel dengan jarak Chebyshev tepat r dari (cx, cy), hanya sel di dalam grid"""
+        xs = range(max(cx - r, 0), min(cx + r, self._nx - 1) + 1)
+        ys = range(max(cy - r, 0), min(cy + r, self._ny - 1) + 1)
+        cells = [(x, y) for x in {cx - r, cx + r} if 0 <= x < self._nx for y in ys]
+        cells += [(x, y) for y in {cy - r, cy + r} if 0 <= y < self._ny for x in xs if cx - r < x < cx + r]
+        groups = [self._cells[cell] for cell in cells if cell in self._cells]
+        return np.concatenate(groups) if groups else np.empty(0, dtype=np.int64)
+
+    def _min_ring(self, cx, cy):
+        """Ring pertama yang menyentuh grid (> 0 jika titik query di luar katalog)"""
+        return max(-cx, cx - (self._nx - 1), -cy, cy - (self._ny - 1), 0)
+
+    def _max_ring(self, cx, cy):
+        return max(cx, self._nx - 1 - cx, cy, self._ny - 1 - cy, 0)
+
+    def nearest(self, latitude, longitude, k):
+        """Indeks k tempat terdekat dari (latitude, longitude), urut jarak"""
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        cx, cy = self._cell_of(latitude, longitude)
+        max_ring = self._max_ring(cx, cy)
+        found = []
+        distances = []
+        count = 0
+        r = self._min_ring(cx, cy)
+        while r <= max_ring:
+            ring = self._ring(cx, cy, r)
+            if len(ring):
+                found.append(ring)
+                distances.append(haversine_to_point(self.latitude[ring], self.longitude[ring],
+                                                    (latitude, longitude)))
+                count += len(ring)
+            # Tempat di ring berikutnya berjarak >= r * cell_km (dengan margin proyeksi)
+            if count >= k:
+                kth = np.partition(np.concatenate(distances), k - 1)[k - 1]
+                if r * self.cell_km * PROJECTION_SAFETY >= kth:
+                    break
+            r += 1
+
+        indices = np.concatenate(found)
+        distances = np.concatenate(distances)
+        order = np.argsort(distances, kind='stable')[:k]
+        return indices[order]
+
+    def within(self, latitude, longitude, radius_km):
+        """Indeks tempat dalam radius_km dari (latitude, longitude), urut jarak"""
+        cx, cy = self._cell_of(latitude, longitude)
+        rings = min(int(math.ceil(radius_km / (self.cell_km * PROJECTION_SAFETY))) + 1,
+                    self._max_ring(cx, cy))
+        groups = [self._ring(cx, cy, r) for r in range(self._min_ring(cx, cy), rings + 1)]
+        indices = np.concatenate(groups) if groups else np.empty(0, dtype=np.int64)
+        distances = haversine_to_point(self.latitude[indices], self.longitude[indices], (latitude, longitude))
+        inside = distances <= radius_km
+        order = np.argsort(distances[inside], kind='stable')
+        return indices[inside][order]
+
+    def neighbours(self, index, k):
+        """k tetangga terdekat tempat `index` (tanpa dirinya), di-cache per tempat"""
+        key = (index, k)
+        if key not in self._neighbours:
+            nearest = self.nearest(self.latitude[index], self.longitude[index], k + 1)
+            self._neighbours[key] = nearest[nearest != index][:k].tolist()
+        return self._neighbours[key]
+
+    def knn_graph(self, k, pair_distances):
+        """
+        k tetangga terdekat semua tempat sekaligus (tanpa dirinya), diproses
+        vektor per sel. pair_distances(rows, cols) -> jarak (len(rows) x len(cols)).
+        Return (indeks n x k, jarak n x k), urut jarak per baris.
+        """
+        n = len(self)
+        k = min(k, n - 1)
+        neighbour_indices = np.empty((n, k), dtype=np.int64)
+        neighbour_distances = np.empty((n, k))
+        if k <= 0:
+            return neighbour_indices, neighbour_distances
+
+        for (cx, cy), members in self._cells.items():
+            max_ring = self._max_ring(cx, cy)
+            groups = []
+            count = 0
+            r = 0
+            while True:
+                ring = self._ring(cx, cy, r)
+                if len(ring):
+                    groups.append(ring)
+                    count += len(ring)
+                if count > k or r >= max_ring:
+                    candidates = np.concatenate(groups)
+                    distances = pair_distances(members, candidates)
+                    distances[members[:, None] == candidates[None, :]] = np.inf
+                    if r >= max_ring:
+                        break
+                    # Semua anggota sel: tetangga ke-k harus lebih dekat dari ring berikutnya
+                    kth = np.partition(distances, k - 1, axis=1)[:, k - 1].max()
+                    if r * self.cell_km * PROJECTION_SAFETY >= kth:
+                        break
+                r += 1
+
+            order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+            neighbour_indices[members] = candidates[order]
+            neighbour_distances[members] = np.take_along_axis(distances, order, axis=1)
+
+        return neighbour_indices, neighbour_distances
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul backend berupa file datar (tanpa package); tes mengimpornya langsung
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
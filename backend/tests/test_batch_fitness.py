@@ -0,0 +1,51 @@
+"""Evaluasi populasi batch (NumPy) harus identik dengan eval_route_fixed per individu"""
+import random
+
+import pytest
+
+from tourism_optimizer import TourismOptimizer
+from travel_time import HOURS_PER_DAY
+
+
+@pytest.fixture(scope='module')
+def optimizer():
+    optimizer = TourismOptimizer()
+    optimizer.preferences = optimizer.create_user_preferences()
+    optimizer.set_dynamic_data(optimizer.create_dynamic_data())
+    return optimizer
+
+
+def scalar_fitness(optimizer, population):
+    return [optimizer.eval_route_fixed(route, optimizer.df_places, optimizer.preferences,
+                                       optimizer.distance_matrix, optimizer.travel_times,
+                                       optimizer.dynamic_data)
+            for route in population]
+
+
+def random_population(optimizer, rng, size=50, max_places=6):
+    place_ids = optimizer.catalog.all_ids
+    return [rng.sample(place_ids, rng.randint(1, max_places)) for _ in range(size)]
+
+
+def test_default_preferences(optimizer):
+    population = random_population(optimizer, random.Random(42))
+    assert optimizer.evaluate_population(population) == scalar_fitness(optimizer, population)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_random_preferences_and_traffic(optimizer, seed):
+    rng = random.Random(seed)
+    optimizer.preferences = optimizer.create_user_preferences({
+        'budget': rng.choice([20000, 60000, 120000, 200000]),
+        'max_places': rng.randint(2, 6),
+        'must_visit': rng.sample(optimizer.catalog.all_ids, rng.randint(0, 3)),
+        'end_time': rng.choice(['12:00', '16:00', '20:00']),
+        'preferred_categories': rng.sample(['Budaya', 'Alam', 'Belanja', 'Rekreasi'], 2),
+        'start_time': rng.choice(['06:30', '08:00', '11:45'])
+    })
+    # Lalu lintas acak per jam: waktu tempuh bergantung jam berangkat
+    optimizer.set_dynamic_data(dict(optimizer.dynamic_data, traffic_by_hour={
+        hour: rng.choice([1.0, 1.2, 1.5, 2.3]) for hour in range(HOURS_PER_DAY)}))
+    # Rute kosong ikut dicek (fitness tetap 1.0)
+    population = random_population(optimizer, rng) + [[]]
+    assert optimizer.evaluate_population(population) == scalar_fitness(optimizer, population)
@@ -0,0 +1,91 @@
+"""Solver eksak: objektif sama dengan eval_route_fixed dan optimal terhadap enumerasi brute-force"""
+import itertools
+import random
+
+import pytest
+
+from exact_solver import EXACT_MAX_PLACES, is_small_instance
+from tourism_optimizer import TourismOptimizer
+from travel_time import HOURS_PER_DAY
+
+
+@pytest.fixture(scope='module')
+def optimizer():
+    return TourismOptimizer()
+
+
+def scalar_fitness(optimizer, route):
+    return optimizer.eval_route_fixed(route, optimizer.df_places, optimizer.preferences,
+                                      optimizer.distance_matrix, optimizer.travel_times,
+                                      optimizer.dynamic_data)[0]
+
+
+def brute_force(optimizer):
+    """Fitness terbaik dari semua rute (subset x urutan) yang lolos avoid, max_places, dan budget"""
+    preferences = optimizer.preferences
+    candidates = [place_id for place_id in optimizer.catalog.all_ids
+                  if place_id not in preferences['avoid_places']]
+    best = 0.0
+    for k in range(1, min(preferences['max_places'], len(candidates)) + 1):
+        for subset in itertools.combinations(candidates, k):
+            if optimizer.catalog.total_fee(subset) > preferences['budget']:
+                continue
+            for order in itertools.permutations(subset):
+                best = max(best, scalar_fitness(optimizer, list(order)))
+    return best
+
+
+def random_case(optimizer, rng):
+    place_ids = optimizer.catalog.all_ids
+    # 8-10 kandidat supaya brute force tetap cepat
+    avoid = rng.sample(place_ids, len(place_ids) - rng.randint(8, 10))
+    allowed = [place_id for place_id in place_ids if place_id not in avoid]
+    preferences = {
+        'budget': rng.choice([20000, 60000, 120000, 200000]),
+        'max_places': rng.randint(1, 4),
+        'avoid_places': avoid,
+        'must_visit': rng.sample(allowed, rng.randint(0, 2)),
+        'start_time': rng.choice(['06:30', '08:00', '11:45']),
+        'end_time': rng.choice(['12:00', '16:00', '20:00']),
+        'preferred_categories': rng.sample(['Budaya', 'Alam', 'Belanja', 'Rekreasi'], 2)
+    }
+    dynamic_data = dict(optimizer.create_dynamic_data(), traffic_by_hour={
+        hour: rng.choice([1.0, 1.2, 1.5, 2.3]) for hour in range(HOURS_PER_DAY)})
+    return preferences, dynamic_data
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_exact_matches_brute_force(optimizer, seed):
+    preferences, dynamic_data = random_case(optimizer, random.Random(seed))
+    result = optimizer.optimize_route_with_crossover_choice(
+        preferences, algorithm='exact', verbose=False, dynamic_data=dynamic_data)
+
+    assert result['algorithm'] == 'exact'
+    assert result['evolution_stats']['exact_solver']['optimal']
+    # Fitness yang dilaporkan = eval_route_fixed untuk rute itu, dan tidak ada rute yang lebih baik
+    assert result['fitness'] == pytest.approx(scalar_fitness(optimizer, result['route']), abs=1e-9)
+    assert result['fitness'] == pytest.approx(brute_force(optimizer), abs=1e-9)
+    assert optimizer.catalog.total_fee(result['route']) <= optimizer.preferences['budget']
+    assert not set(result['route']) & set(preferences['avoid_places'])
+
+
+def test_auto_uses_exact_for_small_instance(optimizer):
+    preferences = {'max_places': 3}
+    assert is_small_instance(optimizer.catalog, optimizer.create_user_preferences(preferences))
+    auto = optimizer.optimize_route_with_crossover_choice(dict(preferences), algorithm='auto', verbose=False, seed=1)
+    exact = optimizer.optimize_route_with_crossover_choice(dict(preferences), algorithm='exact', verbose=False)
+    assert auto['algorithm'] == 'exact'
+    assert (auto['route'], auto['fitness']) == (exact['route'], exact['fitness'])
+
+
+def test_auto_uses_ga_for_large_instance(optimizer):
+    preferences = {'max_places': EXACT_MAX_PLACES + 1, 'budget': 500000}
+    assert not is_small_instance(optimizer.catalog, optimizer.create_user_preferences(preferences))
+    result = optimizer.optimize_route_with_crossover_choice(dict(preferences), algorithm='auto', verbose=False, seed=1)
+    assert result['algorithm'] == 'simple'
+
+
+def test_exact_rejects_large_instance(optimizer):
+    with pytest.raises(ValueError, match="too large for exact"):
+        optimizer.optimize_route_with_crossover_choice({'max_places': EXACT_MAX_PLACES + 1},
+                                                       algorithm='exact', verbose=False)
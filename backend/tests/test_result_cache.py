@@ -0,0 +1,118 @@
+"""Result cache: kunci ternormalisasi, TTL, batas ukuran, dan round-trip JSON FileBackend"""
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import result_cache
+from result_cache import FileBackend, MemoryBackend, ResultCache, result_key
+from tourism_optimizer import TourismOptimizer
+
+
+@pytest.fixture(scope='module')
+def optimizer():
+    return TourismOptimizer()
+
+
+def optimize(optimizer, cache, preferences, seed=None):
+    return optimizer.optimize_route_with_crossover_choice(dict(preferences), verbose=False,
+                                                          result_cache=cache, seed=seed)
+
+
+def test_key_ignores_order_and_duplicates_of_set_fields():
+    options = {'algorithm': 'simple', 'seed': None}
+    a = result_key('v1', {'must_visit': [3, 1, 2], 'avoid_places': [9, 7], 'budget': 100000},
+                   {'closed_places': [5, 4]}, options)
+    b = result_key('v1', {'budget': 100000, 'avoid_places': [7, 9, 7], 'must_visit': [2, 3, 1]},
+                   {'closed_places': [4, 5, 5]}, options)
+    assert a == b
+    assert a != result_key('v1', {'must_visit': [3, 1], 'avoid_places': [9, 7], 'budget': 100000},
+                           {'closed_places': [5, 4]}, options)
+    assert a != result_key('v2', {'must_visit': [3, 1, 2], 'avoid_places': [9, 7], 'budget': 100000},
+                           {'closed_places': [5, 4]}, options)
+
+
+def test_key_depends_on_seed():
+    keys = {result_key('v1', {'must_visit': [1]}, {}, {'algorithm': 'simple', 'seed': seed})
+            for seed in (None, 0, 1, 2)}
+    assert len(keys) == 4
+
+
+def test_reordered_request_hits_cache(optimizer):
+    cache = ResultCache(MemoryBackend())
+    first = optimize(optimizer, cache, {'must_visit': [1, 5], 'avoid_places': [3, 7]}, seed=4)
+    second = optimize(optimizer, cache, {'must_visit': [5, 1], 'avoid_places': [7, 3]}, seed=4)
+    assert (first['from_cache'], second['from_cache']) == (False, True)
+    assert second['route'] == first['route'] and second['fitness'] == first['fitness']
+    assert cache.stats()['entries'] == 1
+
+
+def test_different_seed_is_a_different_entry(optimizer):
+    cache = ResultCache(MemoryBackend())
+    optimize(optimizer, cache, {'must_visit': [2]}, seed=1)
+    result = optimize(optimizer, cache, {'must_visit': [2]}, seed=2)
+    assert not result['from_cache']
+    assert optimize(optimizer, cache, {'must_visit': [2]}, seed=1)['from_cache']
+    assert cache.stats() == {'backend': 'MemoryBackend', 'entries': 2, 'hits': 1, 'misses': 2}
+
+
+def test_memory_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, 'time', lambda: now[0])
+    backend = MemoryBackend(ttl_seconds=60)
+    backend.set('a', {'x': 1})
+    now[0] += 59
+    assert backend.get('a') == {'x': 1}
+    now[0] += 2
+    assert backend.get('a') is None
+    assert len(backend) == 0
+
+
+def test_memory_size_limit_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=3)
+    for key in 'abc':
+        backend.set(key, key)
+    assert backend.get('a') == 'a'
+    backend.set('d', 'd')
+    assert len(backend) == 3
+    assert backend.get('b') is None
+    assert [backend.get(key) for key in 'acd'] == ['a', 'c', 'd']
+
+
+def test_file_ttl_expiry(tmp_path):
+    backend = FileBackend(str(tmp_path), ttl_seconds=60)
+    backend.set('a', {'x': 1})
+    assert backend.get('a') == {'x': 1}
+    old = time.time() - 61
+    os.utime(tmp_path / 'a.json', (old, old))
+    assert backend.get('a') is None
+    assert not (tmp_path / 'a.json').exists()
+
+
+def test_file_size_limit_removes_oldest(tmp_path):
+    backend = FileBackend(str(tmp_path), max_entries=3)
+    for age, key in enumerate('abcd'):
+        backend.set(key, key)
+        stamp = time.time() - 100 + age
+        os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+    backend.set('e', 'e')
+    assert len(backend) == 3
+    assert [backend.get(key) for key in 'abcde'] == [None, None, 'c', 'd', 'e']
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_file_backend_json_round_trip(optimizer, tmp_path):
+    cache = ResultCache(FileBackend(str(tmp_path)))
+    preferences = {'must_visit': [1], 'end_time': '15:00'}
+    first = optimize(optimizer, cache, preferences, seed=7)
+    schedule = optimizer.current_schedule
+
+    # Worker lain (cache baru di direktori yang sama) membaca entri JSON
+    other = TourismOptimizer()
+    second = optimize(other, ResultCache(FileBackend(str(tmp_path))), preferences, seed=7)
+    assert second['from_cache']
+    assert second == dict(first, from_cache=True)
+    assert other.current_route == optimizer.current_route
+    assert other.last_hall_of_fame == optimizer.last_hall_of_fame
+    pd.testing.assert_frame_equal(other.current_schedule, schedule)
@@ -0,0 +1,85 @@
+"""Skor langkah RouteState (delta) harus sama dengan eval_route_fixed untuk rute hasil langkah"""
+import random
+
+import pytest
+
+from route_state import RouteContext, RouteState
+from tourism_optimizer import TourismOptimizer
+from travel_time import HOURS_PER_DAY
+
+MOVES = ('swap', 'insert', 'remove', 'replace', 'reverse', 'relocate')
+
+
+@pytest.fixture(scope='module')
+def optimizer():
+    return TourismOptimizer()
+
+
+def make_context(optimizer, traffic_by_hour, preferences=None):
+    optimizer.preferences = optimizer.create_user_preferences(preferences)
+    optimizer.set_dynamic_data(dict(optimizer.create_dynamic_data(), traffic_by_hour=traffic_by_hour))
+    start_leg, end_leg = optimizer.get_leg_distances(optimizer.preferences)
+    return RouteContext(optimizer.catalog, optimizer.preferences, optimizer.distance_matrix,
+                        optimizer.travel_times, start_leg, end_leg)
+
+
+def full_fitness(optimizer, route):
+    return optimizer.eval_route_fixed(route, optimizer.df_places, optimizer.preferences,
+                                      optimizer.distance_matrix, optimizer.travel_times, None)[0]
+
+
+def random_moves(state, rng, n_places):
+    k = len(state)
+    i, j = sorted(rng.sample(range(k), 2))
+    outside = rng.choice([place for place in range(n_places) if place not in state.position])
+    return [
+        ('swap', (i, j)), ('swap', (i, i + 1)), ('reverse', (i, j)), ('relocate', (i, j)), ('relocate', (j, i)),
+        ('remove', (i,)), ('remove', (k - 1,)), ('replace', (i, outside)),
+        ('insert', (outside, rng.randint(0, k))), ('insert', (outside, k))
+    ]
+
+
+def check_moves(optimizer, context, seed, n_routes=60):
+    rng = random.Random(seed)
+    n_places = len(optimizer.catalog)
+    checked = set()
+    for _ in range(n_routes):
+        route = rng.sample(optimizer.catalog.all_ids, rng.randint(2, 7))
+        state = RouteState(context, route)
+        for kind, args in random_moves(state, rng, n_places):
+            predicted = getattr(state, f"score_{kind}")(*args)
+            moved = RouteState(context, route)
+            getattr(moved, f"apply_{kind}")(*args)
+            assert predicted == pytest.approx(full_fitness(optimizer, moved.route), abs=1e-9), (kind, route, args)
+            assert moved.fitness == pytest.approx(full_fitness(optimizer, moved.route), abs=1e-9)
+            checked.add(kind)
+    assert checked == set(MOVES)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_moves_match_full_evaluation_hourly_traffic(optimizer, seed):
+    rng = random.Random(100 + seed)
+    traffic = {hour: rng.choice([1.0, 1.2, 1.5, 2.3]) for hour in range(HOURS_PER_DAY)}
+    # Jendela waktu sempit supaya penalti end_time ikut teruji
+    context = make_context(optimizer, traffic, {'start_time': rng.choice(['06:30', '08:00', '15:45']),
+                                                'end_time': rng.choice(['12:00', '20:00'])})
+    assert not context.flat_traffic
+    check_moves(optimizer, context, seed)
+
+
+@pytest.mark.parametrize('factor', [1.0, 1.3])
+def test_moves_match_full_evaluation_flat_traffic(optimizer, factor):
+    context = make_context(optimizer, {hour: factor for hour in range(HOURS_PER_DAY)}, {'end_time': '13:00'})
+    assert context.flat_traffic
+    check_moves(optimizer, context, seed=int(factor * 10))
+
+
+def test_single_place_route(optimizer):
+    context = make_context(optimizer, {hour: 1.5 if hour < 12 else 1.0 for hour in range(HOURS_PER_DAY)})
+    state = RouteState(context, [optimizer.catalog.all_ids[0]])
+    assert state.score_remove(0) == 1.0
+    place = optimizer.catalog.index_of(optimizer.catalog.all_ids[1])
+    for position in (0, 1):
+        moved = RouteState(context, state.route)
+        moved.apply_insert(place, position)
+        assert state.score_insert(place, position) == pytest.approx(full_fitness(optimizer, moved.route), abs=1e-9)
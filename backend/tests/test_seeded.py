@@ -0,0 +1,76 @@
+"""Run ber-seed: seed sama + input sama -> rute dan fitness sama, juga dari banyak thread"""
+import threading
+
+import pytest
+
+from tourism_optimizer import TourismOptimizer
+
+SEEDS = range(6)
+
+
+@pytest.fixture(scope='module')
+def place_data():
+    return TourismOptimizer().place_data
+
+
+def run(place_data, seed, algorithm='simple'):
+    optimizer = TourismOptimizer(place_data=place_data)
+    result = optimizer.optimize_route_with_crossover_choice(
+        {'budget': 250000}, algorithm=algorithm, verbose=False, seed=seed)
+    return result['route'], result['fitness'], result['seed']
+
+
+def run_threads(func, seeds, threads=4):
+    results = {}
+    lock = threading.Lock()
+    pending = list(seeds)
+
+    def worker():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                seed = pending.pop()
+            result = func(seed)
+            with lock:
+                results[seed] = result
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return results
+
+
+@pytest.mark.parametrize('algorithm', ['simple', 'mu_plus_lambda'])
+def test_same_seed_same_route(place_data, algorithm):
+    for seed in SEEDS:
+        first = run(place_data, seed, algorithm)
+        assert first[2] == seed
+        assert run(place_data, seed, algorithm) == first
+
+
+def test_same_seed_same_route_on_threads(place_data):
+    sequential = {seed: run(place_data, seed) for seed in SEEDS}
+    assert run_threads(lambda seed: run(place_data, seed), SEEDS) == sequential
+
+
+def test_run_seed_replays_like_seed(place_data):
+    optimizer = TourismOptimizer(place_data=place_data)
+    result = optimizer.optimize_route_with_crossover_choice({'budget': 250000}, verbose=False, run_seed=3)
+    assert result['seed'] == 3
+    assert (result['route'], result['fitness'], result['seed']) == run(place_data, 3)
+
+
+def test_legacy_reoptimize_seeded_on_threads(place_data):
+    def reoptimize(seed):
+        optimizer = TourismOptimizer(place_data=place_data)
+        optimizer.optimize_route_with_crossover_choice(verbose=False, seed=7)
+        optimizer.get_next_place()
+        result = optimizer.reoptimize_route("14:00", seed=seed)
+        return result['updated_route']
+
+    sequential = {seed: reoptimize(seed) for seed in SEEDS}
+    assert {seed: reoptimize(seed) for seed in SEEDS} == sequential
+    assert run_threads(reoptimize, SEEDS) == sequential
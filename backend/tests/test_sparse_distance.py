@@ -0,0 +1,87 @@
+"""SparseDistanceMatrix harus memberi jarak yang sama dengan matriks haversine dense"""
+import random
+
+import numpy as np
+import pytest
+
+from distance import haversine_matrix
+from fitness import evaluate_routes_batch
+from sparse_distance import SparseDistanceMatrix
+from tourism_optimizer import TourismOptimizer
+from travel_time import HOURS_PER_DAY, TravelTimeModel
+
+
+def synthetic_coordinates(n, seed):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-8.2, -7.5, n), rng.uniform(110.0, 110.8, n)
+
+
+@pytest.fixture(scope='module')
+def matrices():
+    lat, lon = synthetic_coordinates(400, seed=1)
+    return SparseDistanceMatrix(lat, lon, k=8), haversine_matrix(lat, lon)
+
+
+def random_pairs(n, count, seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, n, count), rng.integers(0, n, count)
+
+
+def test_vector_lookup_matches_dense(matrices):
+    sparse, dense = matrices
+    rows, cols = random_pairs(len(sparse), 20000, seed=2)
+    stored = sparse._find(rows, cols) >= 0
+    # Pasangan acak harus mencakup tetangga kNN (CSR) dan pasangan on-demand
+    assert stored.any() and (~stored & (rows != cols)).any()
+    np.testing.assert_array_equal(sparse[rows, cols], dense[rows, cols])
+
+
+def test_knn_pairs_match_dense(matrices):
+    sparse, dense = matrices
+    rows = np.repeat(np.arange(len(sparse)), np.diff(sparse.indptr))
+    np.testing.assert_array_equal(sparse.data, dense[rows, sparse.indices])
+    np.testing.assert_array_equal(sparse[sparse.indices, rows], dense[sparse.indices, rows])
+
+
+def test_scalar_lookup_and_lru_cache(matrices):
+    lat, lon = synthetic_coordinates(400, seed=1)
+    sparse = SparseDistanceMatrix(lat, lon, k=8, cache_size=50)
+    dense = matrices[1]
+    rows, cols = random_pairs(len(sparse), 300, seed=3)
+    pairs = list(zip(rows.tolist(), cols.tolist()))
+
+    for a, b in pairs:
+        assert sparse[a, b] == dense[a, b]
+    assert sparse.misses > 0 and len(sparse._cache) <= 50
+
+    # Pasangan terakhir masih di cache (juga untuk urutan terbalik); nilainya tetap sama dengan dense
+    hits = sparse.hits
+    recent = [(a, b) for a, b in pairs[-20:] if a != b]
+    for a, b in recent:
+        assert sparse[b, a] == dense[b, a]
+    assert sparse.hits - hits == len(recent)
+    assert isinstance(sparse[np.int64(5), np.int64(9)], float)
+    assert sparse[7, 7] == 0.0
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_batch_fitness_same_on_both_backends(seed):
+    optimizer = TourismOptimizer()
+    rng = random.Random(seed)
+    preferences = optimizer.create_user_preferences({
+        'budget': rng.choice([60000, 200000]),
+        'max_places': rng.randint(3, 6),
+        'end_time': rng.choice(['13:00', '18:00'])
+    })
+    traffic = {hour: rng.choice([1.0, 1.3, 1.8]) for hour in range(HOURS_PER_DAY)}
+    df = optimizer.df_places
+    # k kecil: sebagian besar leg rute berada di luar graf kNN
+    sparse = SparseDistanceMatrix(df['latitude'].to_numpy(), df['longitude'].to_numpy(), k=3)
+    start_leg, end_leg = optimizer.get_leg_distances(preferences)
+    routes = [rng.sample(optimizer.catalog.all_ids, rng.randint(1, 6)) for _ in range(60)]
+
+    fitness = {}
+    for name, matrix in (('dense', optimizer.distance_matrix), ('sparse', sparse)):
+        fitness[name] = evaluate_routes_batch(routes, optimizer.catalog, preferences, matrix,
+                                              TravelTimeModel(matrix, traffic), start_leg, end_leg)
+    assert fitness['sparse'] == fitness['dense']
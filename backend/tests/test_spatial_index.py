@@ -0,0 +1,101 @@
+"""SpatialIndex (kNN, radius, graf kNN) harus sama dengan brute force, termasuk katalog degenerate"""
+import numpy as np
+import pytest
+
+from distance import haversine_matrix, haversine_to_point
+from spatial_index import SpatialIndex
+
+
+def catalog(kind, n, seed=0):
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(-8.2, -7.5, n)
+    lon = rng.uniform(110.0, 110.8, n)
+    if kind == 'same_point':
+        lat[:] = -7.8
+        lon[:] = 110.4
+    elif kind == 'row':
+        lat[:] = -7.8
+    elif kind == 'column':
+        lon[:] = 110.4
+    elif kind == 'clusters':
+        # Dua kelompok rapat berjauhan (area besar, hampir semua sel kosong)
+        lat[: n // 2] = -7.8 + rng.normal(0, 1e-4, n // 2)
+        lon[: n // 2] = 110.4 + rng.normal(0, 1e-4, n // 2)
+    return lat, lon
+
+
+CATALOGS = [('random', 400), ('same_point', 50), ('row', 500), ('column', 500), ('clusters', 300),
+            ('random', 1), ('row', 3)]
+
+
+def query_points(lat, lon, rng, count=40):
+    """Titik tempat katalog sendiri, titik acak di sekitar, dan titik jauh di luar katalog"""
+    picks = rng.integers(0, len(lat), count // 2)
+    points = list(zip(lat[picks], lon[picks]))
+    points += list(zip(rng.uniform(-8.3, -7.4, count // 2 - 2), rng.uniform(109.9, 110.9, count // 2 - 2)))
+    points += [(-6.2, 106.8), (-8.0, 112.0)]
+    return points
+
+
+@pytest.mark.parametrize('kind, n', CATALOGS)
+def test_nearest_and_within_match_brute_force(kind, n):
+    lat, lon = catalog(kind, n)
+    index = SpatialIndex(lat, lon)
+    rng = np.random.default_rng(n)
+    for point in query_points(lat, lon, rng):
+        distances = haversine_to_point(lat, lon, point)
+        for k in (1, 5, 40, n + 3):
+            nearest = index.nearest(*point, k)
+            expected = np.argsort(distances, kind='stable')[:k]
+            assert len(set(nearest.tolist())) == len(nearest) == min(k, n)
+            # Jarak sama tiap peringkat (urutan indeks bisa beda jika jaraknya sama)
+            np.testing.assert_array_equal(distances[nearest], distances[expected])
+        for radius in (0.0, 0.5, 5.0, 300.0):
+            within = index.within(*point, radius)
+            assert sorted(within.tolist()) == np.flatnonzero(distances <= radius).tolist()
+            assert np.all(np.diff(distances[within]) >= 0)
+
+
+@pytest.mark.parametrize('kind, n', CATALOGS)
+def test_knn_graph_matches_brute_force(kind, n):
+    lat, lon = catalog(kind, n)
+    dense = haversine_matrix(lat, lon)
+    indices, distances = SpatialIndex(lat, lon).knn_graph(8, lambda rows, cols: dense[np.ix_(rows, cols)])
+    k = min(8, n - 1)
+    assert indices.shape == distances.shape == (n, k)
+    others = dense + np.diag(np.full(n, np.inf))
+    np.testing.assert_array_equal(distances, np.sort(others, axis=1)[:, :k])
+    np.testing.assert_array_equal(np.take_along_axis(dense, indices, axis=1), distances)
+    assert not np.any(indices == np.arange(n)[:, None])
+
+
+@pytest.mark.parametrize('kind, n', CATALOGS + [('row', 20000), ('column', 20000)])
+def test_grid_size_bounded(kind, n):
+    lat, lon = catalog(kind, n)
+    index = SpatialIndex(lat, lon, points_per_cell=8)
+    # Katalog satu baris/kolom: luas diklem 1e-6, tetapi jumlah sel tetap O(n / points_per_cell)
+    assert index._nx <= n / 8 + 2 and index._ny <= n / 8 + 2
+    assert index._nx * index._ny <= 3 * n / 8 + 4
+    if kind == 'same_point':
+        assert index._nx == index._ny == 1
+
+
+class CountingIndex(SpatialIndex):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rings = 0
+
+    def _ring(self, cx, cy, r):
+        self.rings += 1
+        return super()._ring(cx, cy, r)
+
+
+@pytest.mark.parametrize('kind', ['same_point', 'row', 'column'])
+def test_query_far_from_degenerate_catalog_scans_few_rings(kind):
+    lat, lon = catalog(kind, 500)
+    index = CountingIndex(lat, lon)
+    # ~100+ km dari katalog; ring kosong sebelum grid dilewati, bukan diperiksa satu per satu
+    nearest = index.nearest(-6.9, 111.5, 5)
+    distances = haversine_to_point(lat, lon, (-6.9, 111.5))
+    np.testing.assert_array_equal(distances[nearest], np.sort(distances)[:5])
+    assert index.rings <= index._nx + index._ny + 1
@@ -3,20 +3,69 @@ import pandas as pd
 import math
 import folium
 import random
-from datetime import datetime, timedelta
+from datetime import datetime
 import geopy.distance as geodist
 import networkx as nx
-from deap import base, creator, tools, algorithms
+from deap import tools
 import io
 import base64
 import requests
 import time
+from place_catalog import MINUTES_PER_DAY, PlaceCatalog, PlaceData, minutes_to_time, time_to_minutes
+from fitness import evaluate_routes_batch, leg_distance_vector
+from distance import GEODESIC_MAX_PLACES, load_or_build_distance_matrix
+from sparse_distance import SparseDistanceMatrix, configured_backend
+from parallel import configured_workers, get_parallel_evaluator
+from islands import get_island_pool, island_options
+from ga_engine import GA_ENGINE, STOP_DEADLINE, Individual, StopCriteria, evolve
+from fitness_cache import FitnessCache, fitness_context_key
+from exact_solver import is_small_instance, solve_exact
+from local_search import LocalSearch
+from route_state import RouteContext, RouteState
+from travel_time import TravelTimeModel, hour_of
+from catalog_loader import configured_catalog_path, load_places
+from shared_data import catalog_signature, load_or_build_place_data, settings_key
+from result_cache import result_key
+import os
 
 class TourismOptimizer:
-    def __init__(self):
-        self.df_places = self.create_tourism_data()
-        self.distance_matrix = self.create_distance_matrix(self.df_places)
-        self.travel_time_matrix = self.create_travel_time_matrix(self.distance_matrix)
+    # Parameter GA default
+    POPULATION_SIZE = 50
+    GENERATIONS = 50
+    # Porsi populasi reoptimasi yang diisi bibit warm-start (sisanya acak untuk keragaman)
+    WARM_START_SEED_FRACTION = 0.2
+    # Generasi yang dihemat warm-start hanya terukur terhadap run cold pada input yang
+    # sama, yang tidak dijalankan per request (diukur di benchmark.py warm_start)
+    GENERATIONS_SAVED_UNAVAILABLE = {
+        'generations_saved': None,
+        'generations_saved_note': "unavailable per request: requires a cold run on the same input "
+                                  "(measured by 'python benchmark.py warm_start')"
+    }
+    HALL_OF_FAME_SIZE = 5
+    # Early stopping: berhenti jika fitness terbaik tidak naik selama sekian generasi
+    STAGNATION_GENERATIONS = 12
+    # Waktu yang disisakan sebelum deadline untuk jadwal + info jarak + serialisasi
+    DEADLINE_RESERVE_SECONDS = 0.02
+    # Local search (memetic): jumlah individu elit yang diperbaiki per generasi
+    LOCAL_SEARCH_ELITES = 2
+    # Katalog sebesar ini ke atas: kandidat tempat diambil dari tetangga terdekat (SpatialIndex)
+    SPATIAL_MIN_PLACES = int(os.environ.get('TOURISM_SPATIAL_MIN_PLACES', 200))
+    SPATIAL_CANDIDATES = 48
+
+    def __init__(self, place_data=None, distance_method=None):
+        # Data read-only dapat dibagi antar sesi (lihat session_store.py)
+        if place_data is None:
+            place_data = self.create_place_data(distance_method)
+        self.place_data = place_data
+        self.df_places = place_data.df_places
+        # Katalog array read-only untuk jalur GA; df_places hanya untuk output API
+        self.catalog = place_data.catalog
+        self.distance_method = place_data.distance_method
+        self.distance_matrix = place_data.distance_matrix
+        # Waktu tempuh per jam keberangkatan (free-flow dari jarak x traffic_by_hour journey ini)
+        self.travel_times = TravelTimeModel(place_data.distance_matrix, free_flow=place_data.free_flow)
+
+        # State per journey
         self.current_route = []
         self.current_position = 0
         self.current_schedule = None
@@ -26,6 +75,50 @@ class TourismOptimizer:
         # ✅ SIMPLE: Hanya simpan 1 rute sebelumnya
         self.previous_route_data = None
 
+        # Cache fitness journey ini (lintas generasi dan reoptimasi)
+        self.fitness_cache = FitnessCache()
+
+        # RNG milik optimasi yang sedang berjalan (diganti setiap run, lihat create_rng)
+        self.rng = random.Random()
+
+        # Populasi & hall of fame GA terakhir (bibit warm-start reoptimasi)
+        self.last_hall_of_fame = []
+
+        # Vektor jarak hotel -> tempat dan tempat -> hotel (per lokasi awal/akhir)
+        self._leg_cache_key = None
+        self._leg_cache = None
+        self._start_candidates_key = None
+        self._start_candidates = None
+
+    def create_place_data(self, distance_method=None):
+        """
+        Data bersama (df_places, katalog, matriks jarak): dimuat memory-mapped
+        dari cache (TOURISM_CACHE_DIR) agar worker gunicorn berbagi memori,
+        atau dibangun sekali lalu disimpan (lihat shared_data.py)
+        """
+        # 'haversine' (default, vektor) atau 'geodesic' (lebih akurat, lebih lambat)
+        self.distance_method = distance_method or os.environ.get('TOURISM_DISTANCE_METHOD', 'haversine')
+        # Katalog dari file (TOURISM_CATALOG_PATH: CSV/Parquet/JSON) atau data bawaan
+        catalog_path = configured_catalog_path()
+        df_places = None if catalog_path else self.create_tourism_data()
+        key = settings_key(catalog_signature(catalog_path, df_places), self.distance_method)
+        return load_or_build_place_data(key, lambda: self.build_place_data(catalog_path, df_places))
+
+    def build_place_data(self, catalog_path=None, df_places=None):
+        """Bangun data bersama: df_places, katalog, dan matriks jarak"""
+        if df_places is None:
+            df_places = load_places(catalog_path) if catalog_path else self.create_tourism_data()
+        print(f"📍 Catalog: {len(df_places)} places ({catalog_path or 'built-in'})")
+        if self.distance_method == 'geodesic' and len(df_places) > GEODESIC_MAX_PLACES:
+            print(f"⚠️ Geodesic matrix too slow for {len(df_places)} places, using haversine")
+            self.distance_method = 'haversine'
+        return PlaceData(
+            df_places=df_places,
+            catalog=PlaceCatalog.from_dataframe(df_places),
+            distance_method=self.distance_method,
+            distance_matrix=self.create_distance_matrix(df_places)
+        )
+
     def save_current_as_previous(self):
         """
         Simpan rute saat ini sebagai previous route
@@ -36,8 +129,8 @@ class TourismOptimizer:
             self.previous_route_data = {
                 'timestamp': datetime.now().isoformat(),
                 'route_ids': self.current_route.copy(),
-                'route_names': [self.df_places.iloc[id-1]['name'] for id in self.current_route],
-                'total_cost': sum(self.df_places.iloc[id-1]['entrance_fee'] for id in self.current_route),
+                'route_names': [self.place_row(id)['name'] for id in self.current_route],
+                'total_cost': sum(self.place_row(id)['entrance_fee'] for id in self.current_route),
                 'position': self.current_position,
                 'schedule': self.current_schedule.to_dict('records') if self.current_schedule is not None else []
             }
@@ -59,8 +152,8 @@ class TourismOptimizer:
         if not self.previous_route_data:
             return {"error": "No previous route available"}
         
-        current_cost = sum(self.df_places.iloc[id-1]['entrance_fee'] for id in self.current_route) if self.current_route else 0
-        current_names = [self.df_places.iloc[id-1]['name'] for id in self.current_route] if self.current_route else []
+        current_cost = sum(self.place_row(id)['entrance_fee'] for id in self.current_route) if self.current_route else 0
+        current_names = [self.place_row(id)['name'] for id in self.current_route] if self.current_route else []
         current_ids = [int(id) for id in self.current_route] if self.current_route else []  #
         comparison = {
             'previous_route': {
@@ -162,7 +255,7 @@ class TourismOptimizer:
             'max_places': 6,
             'budget': 200000,
             'preferred_categories': ['Budaya', 'Alam'],
-            'must_visit': [1, 2],
+            'must_visit': [place_id for place_id in (1, 2) if place_id in self.catalog],
             'avoid_places': [],
             'lunch_time': '12:00',
             'lunch_duration': 60,
@@ -223,9 +316,31 @@ class TourismOptimizer:
         # If only start_location provided, use it as end_location too (round trip)
         if 'start_location' in preferences_data and 'end_location' not in preferences_data:
             merged_preferences['end_location'] = merged_preferences['start_location'].copy()
+
+        unknown = [place_id for place_id in merged_preferences['must_visit'] + merged_preferences['avoid_places']
+                   if place_id not in self.catalog]
+        if unknown:
+            raise ValueError(f"Unknown place id(s): {unknown}")
         
         return merged_preferences
     
+    @staticmethod
+    def create_rng(seed=None):
+        """
+        random.Random untuk satu optimasi: dari `seed` request (seed sama ->
+        rute sama), atau diturunkan dari modul random jika kosong sehingga
+        random.seed() global tetap berlaku. Return (rng, seed yang dipakai).
+        """
+        if seed is None:
+            seed = random.getrandbits(63)
+        elif isinstance(seed, bool) or not isinstance(seed, (int, str)):
+            raise ValueError(f"Invalid seed: {seed}")
+        try:
+            seed = int(seed)
+        except ValueError:
+            raise ValueError(f"Invalid seed: {seed}")
+        return random.Random(seed), seed
+
     def create_dynamic_data(self):
         traffic_by_hour = {hour: 1.5 if (7 <= hour <= 9 or 16 <= hour <= 19) else
                                 1.2 if 10 <= hour <= 15 else 1.0
@@ -241,19 +356,20 @@ class TourismOptimizer:
         return dynamic_data
     
     def update_dynamic_data(self, current_time, old_dynamic_data=None):
+        """current_time: menit sejak tengah malam"""
         if old_dynamic_data is None:
             old_dynamic_data = self.create_dynamic_data()
 
         dynamic_data = old_dynamic_data.copy()
-        hour = current_time.hour
+        hour = int(current_time // 60) % 24
 
         # Simulasi perubahan cuaca
         if 6 <= hour < 11:
             weather = "Cerah"
         elif 11 <= hour < 15:
-            weather = "Panas" if random.random() < 0.7 else "Berawan"
+            weather = "Panas" if self.rng.random() < 0.7 else "Berawan"
         elif 15 <= hour < 18:
-            weather = "Berawan" if random.random() < 0.6 else "Hujan Ringan"
+            weather = "Berawan" if self.rng.random() < 0.6 else "Hujan Ringan"
         else:
             weather = "Cerah Berawan"
 
@@ -290,27 +406,39 @@ class TourismOptimizer:
 
         # Update closed places
         closed_places = []
-        if weather == "Hujan" and random.random() < 0.3:
-            outdoor_places = [6, 7, 8, 13, 14]
-            closed_places = random.sample(outdoor_places, 1)
+        if weather == "Hujan" and self.rng.random() < 0.3:
+            # Wisata alam (outdoor) bisa tutup saat hujan
+            outdoor_places = self.df_places.loc[self.df_places['category'] == 'Alam', 'id'].tolist()
+            closed_places = self.rng.sample(outdoor_places, 1) if outdoor_places else []
 
         dynamic_data['closed_places'] = closed_places
         return dynamic_data
     
-    def create_distance_matrix(self, df):
-        n = len(df)
-        distance_matrix = np.zeros((n, n))
+    def place_row(self, place_id):
+        """Baris df_places untuk place ID (ID tidak harus berurutan)"""
+        return self.df_places.iloc[self.catalog.index_of(place_id)]
 
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    point1 = (df.iloc[i]['latitude'], df.iloc[i]['longitude'])
-                    point2 = (df.iloc[j]['latitude'], df.iloc[j]['longitude'])
-                    distance_matrix[i][j] = geodist.distance(point1, point2).km
-
-        return distance_matrix
+    def create_distance_matrix(self, df):
+        """
+        Matriks jarak n x n, dibangun vektor lalu di-cache ke disk (.npy memory-mapped).
+        Katalog besar (TOURISM_DISTANCE_BACKEND=auto/sparse): SparseDistanceMatrix
+        (k tetangga terdekat + haversine on-demand), tanpa array n x n.
+        """
+        if configured_backend(len(df)) == 'sparse':
+            if self.distance_method != 'haversine':
+                print("⚠️ Sparse distance backend supports haversine only, using haversine")
+                self.distance_method = 'haversine'
+            matrix = SparseDistanceMatrix(df['latitude'].to_numpy(), df['longitude'].to_numpy())
+            print(f"🧭 Sparse distance backend: {matrix.nbytes / 1e6:.1f} MB "
+                  f"(dense would be {len(df) ** 2 * 8 / 1e6:.0f} MB)")
+            return matrix
+        return load_or_build_distance_matrix(
+            df['latitude'].to_numpy(), df['longitude'].to_numpy(),
+            method=self.distance_method
+        )
     
-    def create_travel_time_matrix(self, distance_matrix, traffic_factor=1.2):
+    def create_travel_time_matrix(self, distance_matrix, traffic_factor=1.0):
+        """Matriks waktu tempuh dense dengan faktor tetap (jalur GA memakai TravelTimeModel)"""
         return (distance_matrix / 40) * 60 * traffic_factor
     
     # Tambahkan di dalam class TourismOptimizer
@@ -342,154 +470,404 @@ class TourismOptimizer:
         else:
             return obj
         
-    def run_genetic_algorithm(self, pop, toolbox, stats, hof, algorithm="simple", verbose=True):
+    def get_leg_distances(self, preferences=None):
+        """
+        Vektor jarak (km) dari start_location ke setiap tempat dan dari setiap
+        tempat ke end_location. Dihitung sekali per pasangan lokasi, lalu fitness
+        dan jadwal cukup mengindeks vektor ini.
+        """
+        preferences = preferences or self.preferences
+        start_loc = preferences['start_location']
+        end_loc = preferences['end_location']
+        key = (start_loc['latitude'], start_loc['longitude'], end_loc['latitude'], end_loc['longitude'])
+
+        if key != self._leg_cache_key:
+            start_leg = leg_distance_vector(self.catalog, start_loc, self.distance_method)
+            if key[:2] == key[2:]:
+                end_leg = start_leg
+            else:
+                end_leg = leg_distance_vector(self.catalog, end_loc, self.distance_method)
+            self._leg_cache = (start_leg, end_leg)
+            self._leg_cache_key = key
+
+        return self._leg_cache
+
+    def candidate_places(self, route=(), preferences=None):
+        """
+        Place ID kandidat untuk inisialisasi, mutasi tambah, dan pengisian
+        constraint (tanpa tempat di route dan avoid_places).
+
+        Katalog kecil: semua tempat (urutan katalog). Katalog besar
+        (>= SPATIAL_MIN_PLACES): SPATIAL_CANDIDATES tempat terdekat dari
+        lokasi awal (posisi saat ini), lalu tetangga terdekat setiap tempat
+        di route, sehingga GA tidak membuang evaluasi pada tempat yang jauh.
+        """
+        preferences = preferences or self.preferences
+        catalog = self.catalog
+        excluded = set(route).union(preferences.get('avoid_places', []))
+        if len(catalog) < self.SPATIAL_MIN_PLACES:
+            return [place_id for place_id in catalog.all_ids if place_id not in excluded]
+
+        index = catalog.spatial_index
+        start = preferences['start_location']
+        key = (start['latitude'], start['longitude'], tuple(preferences.get('avoid_places', [])))
+        if key != self._start_candidates_key:
+            # Ambil lebih banyak agar tetap ada SPATIAL_CANDIDATES setelah avoid_places dibuang
+            k = self.SPATIAL_CANDIDATES + len(preferences.get('avoid_places', []))
+            self._start_candidates = index.nearest(start['latitude'], start['longitude'], k).tolist()
+            self._start_candidates_key = key
+
+        candidates = list(self._start_candidates)
+        for place_id in route:
+            candidates.extend(index.neighbours(catalog.index_of(place_id), self.SPATIAL_CANDIDATES))
+        ids = catalog.ids
+        return [place_id for place_id in (int(ids[idx]) for idx in dict.fromkeys(candidates))
+                if place_id not in excluded]
+
+    def evaluate_population(self, routes, preferences=None, dynamic_data=None):
+        """Evaluasi banyak rute sekaligus (hasil identik dengan eval_route_fixed)"""
+        preferences = preferences or self.preferences
+        start_leg, end_leg = self.get_leg_distances(preferences)
+        return evaluate_routes_batch(routes, self.catalog, preferences,
+                                     self.distance_matrix, self.travel_times,
+                                     start_leg, end_leg)
+
+    def set_dynamic_data(self, dynamic_data):
+        """Pasang dynamic_data dan samakan faktor lalu lintas model waktu tempuh (hanya jam yang berubah)"""
+        self.dynamic_data = dynamic_data
+        changed = self.travel_times.sync(dynamic_data['traffic_by_hour'])
+        if changed:
+            print(f"🚦 Traffic updated for {changed} hour(s)")
+
+    def create_stop_criteria(self, max_generations, options=None, deadline=None):
+        """
+        Kriteria berhenti GA dari opsi request (semua opsional):
+        max_generations, stagnation_generations (0 = nonaktif), target_fitness, max_evaluations.
+        deadline: waktu absolut time.monotonic() batas respons (anytime mode)
+        """
+        options = options or {}
+        if not isinstance(options, dict):
+            raise ValueError("stop_criteria must be an object")
+
+        def option(name, cast, default=None):
+            value = options.get(name, default)
+            if value is None:
+                return None
+            try:
+                value = cast(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid stop_criteria.{name}: {options.get(name)}")
+            if value < 0:
+                raise ValueError(f"stop_criteria.{name} must not be negative")
+            return value
+
+        stagnation = option('stagnation_generations', int, self.STAGNATION_GENERATIONS)
+        return StopCriteria(
+            max_generations=min(option('max_generations', int, max_generations), self.GENERATIONS),
+            stagnation_generations=stagnation or None,
+            target_fitness=option('target_fitness', float),
+            max_evaluations=option('max_evaluations', int),
+            deadline=deadline - self.DEADLINE_RESERVE_SECONDS if deadline is not None else None
+        )
+
+    def run_genetic_algorithm(self, pop, toolbox, stats, hof, algorithm="simple", verbose=True, criteria=None,
+                              on_generation=None, improve=None):
         """
         Flexible GA algorithm runner
         algorithm options: "simple", "mu_plus_lambda", "mu_comma_lambda"
+        Return: (pop, logbook, stop_reason, evaluations)
         """
-        if algorithm == "mu_plus_lambda":
-            pop, logbook = algorithms.eaMuPlusLambda(
-                pop, toolbox, 
-                mu=30, lambda_=50,
-                cxpb=0.7, mutpb=0.3, ngen=50,
-                stats=stats, halloffame=hof, verbose=verbose
-            )
-        elif algorithm == "mu_comma_lambda":
-            pop, logbook = algorithms.eaMuCommaLambda(
-                pop, toolbox,
-                mu=30, lambda_=50,
-                cxpb=0.7, mutpb=0.3, ngen=50,
-                stats=stats, halloffame=hof, verbose=verbose
+        criteria = criteria or self.create_stop_criteria(self.GENERATIONS)
+
+        if algorithm in ("mu_plus_lambda", "mu_comma_lambda"):
+            return evolve(
+                pop, toolbox, criteria, algorithm=algorithm,
+                mu=30, lambda_=50, cxpb=0.7, mutpb=0.3,
+                stats=stats, halloffame=hof, verbose=verbose, on_generation=on_generation,
+                improve=improve, elite_size=self.LOCAL_SEARCH_ELITES, rng=self.rng
             )
-        else:  # default "simple"
-            pop, logbook = algorithms.eaSimple(
-                pop, toolbox, 
-                cxpb=0.7, mutpb=0.3, ngen=50,
-                stats=stats, halloffame=hof, verbose=verbose
-            )
-        
-        return pop, logbook
+        # default "simple"
+        return evolve(
+            pop, toolbox, criteria, algorithm="simple",
+            cxpb=0.7, mutpb=0.3,
+            stats=stats, halloffame=hof, verbose=verbose, on_generation=on_generation,
+            improve=improve, elite_size=self.LOCAL_SEARCH_ELITES, rng=self.rng
+        )
         
-    def optimize_route_with_crossover_choice(self, preferences_data=None, crossover_method="original", algorithm="simple", verbose=True):
+    def create_toolbox(self, crossover_method="original", workers=0):
         """
-        Modified optimize_route yang bisa memilih metode crossover
-        crossover_method: "original", "order", "cycle"
-        algorithm: "simple", "mu_plus_lambda", "mu_comma_lambda"
+        Toolbox GA untuk self.preferences / self.dynamic_data saat ini:
+        inisialisasi, evaluasi (batch + cache fitness), crossover, mutasi.
+        Return (toolbox, route_context).
         """
-        self.preferences = self.create_user_preferences(preferences_data)
-        self.dynamic_data = self.create_dynamic_data()
-        
-        # Reset DEAP creators
-        if 'FitnessMax' in dir(creator):
-            del creator.FitnessMax
-            del creator.Individual
-
-        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMax)
-
-        toolbox = base.Toolbox()
+        start_leg, end_leg = self.get_leg_distances(self.preferences)
+        route_context = RouteContext(self.catalog, self.preferences, self.distance_matrix,
+                                     self.travel_times, start_leg, end_leg)
 
         def init_individual():
             individual = self.preferences['must_visit'].copy()
-            potential_places = [i for i in range(1, len(self.df_places)+1)
-                            if i not in individual and i not in self.preferences['avoid_places']]
+            potential_places = self.candidate_places(individual)
 
-            random.shuffle(potential_places)
-            current_budget = sum(self.df_places.iloc[p-1]['entrance_fee'] for p in individual)
+            self.rng.shuffle(potential_places)
+            current_budget = self.catalog.total_fee(individual)
 
             for place_id in potential_places:
                 if len(individual) >= self.preferences['max_places']:
                     break
 
-                fee = self.df_places.iloc[place_id-1]['entrance_fee']
+                fee = self.catalog.fee(place_id)
                 if current_budget + fee <= self.preferences['budget']:
                     individual.append(place_id)
                     current_budget += fee
 
-            random.shuffle(individual)
+            self.rng.shuffle(individual)
             return individual
 
-        toolbox.register("individual", tools.initIterate, creator.Individual, init_individual)
-        toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-        
+        # Toolbox per run dari template engine (tanpa del/create ulang kelas DEAP)
+        toolbox = GA_ENGINE.toolbox(init_individual, self.rng)
+
         def eval_wrapper(route):
             return self.eval_route_fixed(route, self.df_places, self.preferences, 
-                                    self.distance_matrix, self.travel_time_matrix, self.dynamic_data)
+                                    self.distance_matrix, self.travel_times, self.dynamic_data)
         
         toolbox.register("evaluate", eval_wrapper)
-        
+        if workers > 1:
+            evaluator = get_parallel_evaluator(self.place_data, workers)
+            batch_evaluate = lambda routes: evaluator.evaluate(routes, self.preferences,
+                                                               self.travel_times.fingerprint())
+        else:
+            batch_evaluate = self.evaluate_population
+        # Rute duplikat (di populasi, hasil repair, antar generasi) diambil dari cache
+        toolbox.register("evaluate_batch", self.fitness_cache.evaluate,
+                         context_key=fitness_context_key(self.preferences, self.distance_method,
+                                                         self.travel_times.fingerprint()),
+                         evaluate_batch=batch_evaluate)
+
         # Register crossover berdasarkan pilihan
         selected_crossover = self.register_crossover_method(crossover_method)
         toolbox.register("mate", selected_crossover)
         
         # Custom mutation (tetap sama)
         def custom_mutate(individual, indpb):
-            if random.random() < indpb and len(individual) >= 2:
+            if self.rng.random() < indpb and len(individual) >= 2:
                 # Swap mutation
-                idx1, idx2 = random.sample(range(len(individual)), 2)
+                idx1, idx2 = self.rng.sample(range(len(individual)), 2)
                 individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
 
-            if random.random() < indpb and len(individual) >= 2:
+            if self.rng.random() < indpb and len(individual) >= 2:
                 # Insert mutation
-                idx1 = random.randint(0, len(individual) - 1)
-                idx2 = random.randint(0, len(individual) - 1)
+                idx1 = self.rng.randint(0, len(individual) - 1)
+                idx2 = self.rng.randint(0, len(individual) - 1)
                 if idx1 != idx2:
                     value = individual.pop(idx1)
                     individual.insert(idx2, value)
 
             # Add/remove mutation
-            if random.random() < indpb * 1.5:
-                current_budget = sum(self.df_places.iloc[p-1]['entrance_fee'] for p in individual)
+            if self.rng.random() < indpb * 1.5:
+                current_budget = self.catalog.total_fee(individual)
 
                 # Add place if possible
                 if len(individual) < self.preferences['max_places']:
-                    available_places = [i for i in range(1, len(self.df_places)+1)
-                                    if i not in individual and i not in self.preferences['avoid_places']]
+                    available_places = self.candidate_places(individual)
                     if available_places:
-                        new_place = random.choice(available_places)
-                        fee = self.df_places.iloc[new_place-1]['entrance_fee']
+                        new_place = self.rng.choice(available_places)
+                        fee = self.catalog.fee(new_place)
                         if current_budget + fee <= self.preferences['budget']:
-                            individual.append(new_place)
+                            # Sisipkan di posisi terbaik (delta RouteState), bukan selalu di akhir
+                            state = RouteState(route_context, individual)
+                            individual.insert(state.best_insert_position(self.catalog.index_of(new_place)), new_place)
 
                 # Remove optional place
-                if random.random() < indpb and len(individual) > 1:
+                if self.rng.random() < indpb and len(individual) > 1:
                     optional_places = [p for p in individual if p not in self.preferences['must_visit']]
                     if optional_places:
-                        individual.remove(random.choice(optional_places))
+                        individual.remove(self.rng.choice(optional_places))
 
             return individual,
 
         toolbox.register("mutate", custom_mutate, indpb=0.2)
-        toolbox.register("select", tools.selTournament, tournsize=3)
+        return toolbox, route_context
+
+    def create_local_search(self, route_context):
+        """Local search memetic untuk konteks rute ini (kandidat swap-in dari tetangga untuk katalog besar)"""
+        spatial = len(self.catalog) >= self.SPATIAL_MIN_PLACES
+        return LocalSearch(self.catalog, self.preferences, self.distance_matrix, self.travel_times,
+                           route_context.start_leg, route_context.end_leg, context=route_context,
+                           candidates=self.candidate_places if spatial else None)
+
+    def run_islands(self, pop, hof, criteria, options, local_search=False, on_generation=None, verbose=True):
+        """
+        Island model: populasi dibagi rata ke options['count'] island, masing-masing
+        di process sendiri dengan crossover sendiri; elit bermigrasi (ring) setiap
+        migration_interval generasi. hof dan logbook digabung dari semua island.
+        Return: (pop, logbook, stop_reason, evaluations)
+        """
+        count = options['count']
+        # Bibit warm-start (di awal pop) disebar ke semua island
+        pop = [pop[j] for i in range(count) for j in range(i, len(pop), count)]
+        pool = get_island_pool(type(self), self.place_data, count)
+        return pool.evolve(self.preferences, self.dynamic_data, [list(ind) for ind in pop], criteria, options,
+                           hof, local_search=local_search, on_generation=on_generation, verbose=verbose,
+                           rng=self.rng)
+
+    def evolve_island(self, preferences, dynamic_data, crossover_method, routes, fitness, generations, seed,
+                      deadline=None, local_search=False):
+        """
+        Satu epoch island model di process worker (lihat islands.py): evolusi
+        `generations` generasi populasi island. fitness None = belum dievaluasi
+        (epoch pertama, record generasi 0 ikut dikembalikan).
+        """
+        self.rng = random.Random(seed)
+        self.preferences = preferences
+        self.set_dynamic_data(dynamic_data)
+        toolbox, route_context = self.create_toolbox(crossover_method)
+
+        population = []
+        for route, value in zip(routes, fitness):
+            individual = Individual(route)
+            if value is not None:
+                individual.fitness.values = (value,)
+            population.append(individual)
+        initial = any(value is None for value in fitness)
+
+        hof = tools.HallOfFame(self.HALL_OF_FAME_SIZE)
+        improver = self.create_local_search(route_context) if local_search else None
+        population, logbook, stop_reason, evaluations = evolve(
+            population, toolbox, StopCriteria(max_generations=generations, deadline=deadline),
+            stats=GA_ENGINE.statistics(), halloffame=hof, verbose=False,
+            improve=improver.improve if improver else None, elite_size=self.LOCAL_SEARCH_ELITES, rng=self.rng
+        )
+        records = [{key: float(record[key]) for key in ('nevals', 'avg', 'max', 'min', 'std')}
+                   for record in logbook]
+        return {
+            'routes': [list(ind) for ind in population],
+            'fitness': [ind.fitness.values[0] for ind in population],
+            'hall_of_fame': [(list(ind), ind.fitness.values[0]) for ind in hof],
+            'records': records if initial else records[1:],
+            'evaluations': evaluations,
+            'stop_reason': stop_reason
+        }
+
+    def optimize_route_with_crossover_choice(self, preferences_data=None, crossover_method="original", algorithm="simple", verbose=True,
+                                             progress_callback=None, parallel_workers=None, seed_routes=None,
+                                             stop_criteria=None, deadline=None, local_search=False,
+                                             dynamic_data=None, islands=None, result_cache=None, seed=None,
+                                             run_seed=None):
+        """
+        Modified optimize_route yang bisa memilih metode crossover
+        crossover_method: "original", "order", "cycle"
+        algorithm: "simple", "mu_plus_lambda", "mu_comma_lambda", "exact" (branch-and-bound),
+                   "auto" (exact untuk instance kecil, selain itu simple),
+                   "islands" (sub-populasi di process terpisah + migrasi ring)
+        progress_callback: opsional, dipanggil (gen, record) setiap generasi
+        parallel_workers: >1 untuk evaluasi fitness di process pool (default env TOURISM_GA_WORKERS)
+        seed_routes: rute awal populasi (warm-start, maksimal WARM_START_SEED_FRACTION populasi);
+                     GA tetap berhenti lewat kriteria stagnasi seperti run cold
+        stop_criteria: opsi early stopping (lihat create_stop_criteria)
+        deadline: time.monotonic() batas waktu; GA berhenti lebih awal dan hasil
+                  terbaik sejauh ini dikembalikan dengan truncated=True
+        local_search: True untuk local search (2-opt, relocate, swap-in) pada elit
+                      setiap generasi dan pada hasil akhir
+        dynamic_data: kondisi saat ini (lalu lintas per jam, dll.); default create_dynamic_data()
+        islands: opsi island model (lihat islands.island_options), hanya untuk algorithm="islands"
+        result_cache: opsional ResultCache (lihat result_cache.py); request identik tanpa
+                      warm-start dilayani dari cache dan state journey dipulihkan (from_cache=True)
+        seed: opsional; seed sama + input sama -> rute sama (kecuali dihentikan deadline).
+              Seed yang dipakai dikembalikan di hasil ('seed') untuk replay.
+        run_seed: seed run jika `seed` kosong (mis. seed per item batch dari parent); berbeda
+                  dengan `seed`, tidak masuk kunci result cache (run tetap dianggap tanpa seed)
+        """
+        requested_seed = seed
+        self.rng, seed = self.create_rng(seed if seed is not None else run_seed)
+        workers = configured_workers(parallel_workers)
+        island_config = island_options(islands, crossover_method) if algorithm == "islands" else None
+        self.preferences = self.create_user_preferences(preferences_data)
+        self.set_dynamic_data(dynamic_data or self.create_dynamic_data())
+        self.get_leg_distances(self.preferences)
+
+        cache_key = None
+        if result_cache is not None and seed_routes is None:
+            cache_key = result_key(self.place_data.version, self.preferences, self.dynamic_data, {
+                'crossover_method': crossover_method,
+                'algorithm': algorithm,
+                'stop_criteria': stop_criteria,
+                'local_search': bool(local_search),
+                'islands': island_config,
+                # Run tanpa seed: hasil GA mana pun untuk input yang sama boleh dipakai ulang
+                'seed': requested_seed
+            })
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                print("⚡ Result cache hit")
+                return self.restore_cached_result(cached)
+
+        if algorithm == "auto":
+            algorithm = "exact" if is_small_instance(self.catalog, self.preferences) else "simple"
+            print(f"🤖 Auto algorithm: {algorithm.upper()}")
+        if algorithm == "exact":
+            result = self.optimize_route_exact(crossover_method, progress_callback, deadline)
+            result['seed'] = seed
+            return self.store_cached_result(result_cache, cache_key, result)
+
+        # Island model: evaluasi di process island, toolbox master hanya untuk populasi awal + polish akhir
+        toolbox, route_context = self.create_toolbox(crossover_method, 0 if island_config else workers)
+        cache_hits, cache_misses = self.fitness_cache.counters()
 
         # Setup statistics
-        stats = tools.Statistics(lambda ind: ind.fitness.values)
-        stats.register("avg", np.mean)
-        stats.register("max", np.max)
-        stats.register("min", np.min)
-        stats.register("std", np.std)
+        stats = GA_ENGINE.statistics()
 
         # Print algorithm info
         print("\n" + "="*60)
         print("🧬 GENETIC ALGORITHM EVOLUTION")
         print("="*60)
-        print(f"Population Size: {50}")
-        print(f"Generations: {50}")
+        print(f"Population Size: {self.POPULATION_SIZE}")
+        print(f"Generations: max {self.GENERATIONS} (stop when no improvement for {self.STAGNATION_GENERATIONS})")
         print(f"Crossover Rate: {70}%")
         print(f"Mutation Rate: {30}%")
         print(f"🧬 Crossover Method: {crossover_method.upper()}")
         print(f"⚡ Algorithm: {algorithm.upper()}")
+        if island_config:
+            print(f"🏝️ Islands: {island_config['count']} x {self.POPULATION_SIZE} "
+                  f"({', '.join(island_config['crossover_methods'])}), migrate {island_config['migrants']} "
+                  f"every {island_config['migration_interval']} generations")
+        else:
+            print(f"🖥️ Fitness Workers: {workers if workers > 1 else 'serial'}")
         print("="*60)
 
-        # Run genetic algorithm
-        pop = toolbox.population(n=50)
-        hof = tools.HallOfFame(1)
-        
-        pop, logbook = self.run_genetic_algorithm(
-            pop, toolbox, stats, hof, 
-            algorithm=algorithm, verbose=verbose
-        )
-
+        # Run genetic algorithm (bibit warm-start + sisa individu acak)
+        population_size = self.POPULATION_SIZE * (island_config['count'] if island_config else 1)
+        max_seeds = max(1, int(population_size * self.WARM_START_SEED_FRACTION))
+        seeds = [Individual(self.complete_warm_start_seed(route, route_context))
+                 for route in (seed_routes or [])[:max_seeds]]
+        pop = seeds + toolbox.population(n=population_size - len(seeds))
+        hof = tools.HallOfFame(self.HALL_OF_FAME_SIZE)
+        criteria = self.create_stop_criteria(self.GENERATIONS, stop_criteria, deadline)
+        
+        improver = self.create_local_search(route_context) if local_search else None
+
+        if island_config:
+            pop, logbook, stop_reason, evaluations = self.run_islands(
+                pop, hof, criteria, island_config, local_search=local_search,
+                on_generation=progress_callback, verbose=verbose
+            )
+        else:
+            pop, logbook, stop_reason, evaluations = self.run_genetic_algorithm(
+                pop, toolbox, stats, hof,
+                algorithm=algorithm, verbose=verbose, criteria=criteria,
+                on_generation=progress_callback, improve=improver.improve if improver else None
+            )
+        if improver:
+            # Hasil akhir juga dipoles; hall of fame hanya menerima jika lebih baik
+            final = Individual(improver.improve(list(hof[0])))
+            final.fitness.values = toolbox.evaluate_batch([final])[0]
+            evaluations += 1
+            hof.update([final])
+        generations_run = len(logbook) - 1
+        cache_hits = self.fitness_cache.hits - cache_hits
+        cache_misses = self.fitness_cache.misses - cache_misses
+        print(f"🛑 GA stopped after {generations_run} generations: {stop_reason} ({evaluations} evaluations)")
+
+        self.last_hall_of_fame = [list(ind) for ind in hof]
         self.current_route = list(hof[0])
         # self.current_position = 0
         self.current_schedule = self.create_schedule()
@@ -509,14 +887,25 @@ class TourismOptimizer:
             'route': [int(x) for x in self.current_route],
             'fitness': float(hof[0].fitness.values[0]),
             'schedule': self.current_schedule.to_dict('records'),
-            'total_cost': int(sum(self.df_places.iloc[id-1]['entrance_fee'] for id in self.current_route)),
+            'total_cost': int(sum(self.place_row(id)['entrance_fee'] for id in self.current_route)),
             'crossover_method': crossover_method,  # Info crossover yang digunakan,
             'algorithm': algorithm,
+            # Anytime mode: True jika GA dihentikan deadline (hasil terbaik sejauh ini)
+            'truncated': stop_reason == STOP_DEADLINE,
             # ✅ TAMBAHAN: Distance and travel time information
             'distance_info': distance_info,
             'travel_time_info': travel_time_info,
             'evolution_stats': {
                 'generations': len(gen),
+                'stop_reason': stop_reason,
+                'evaluations': int(evaluations),
+                'local_search': bool(local_search),
+                'fitness_cache': {
+                    'hits': cache_hits,
+                    'misses': cache_misses,
+                    'hit_rate': cache_hits / (cache_hits + cache_misses) if cache_hits + cache_misses else 0.0,
+                    'size': len(self.fitness_cache)
+                },
                 'final_avg_fitness': float(fit_avg[-1]),
                 'final_max_fitness': float(fit_max[-1]),
                 'final_min_fitness': float(fit_min[-1]),
@@ -529,6 +918,101 @@ class TourismOptimizer:
                     'std_fitness': [float(x) for x in fit_std]
                 }
             },
+            'warm_start': {
+                'enabled': bool(seeds),
+                'seeded_individuals': len(seeds),
+                'generations_run': generations_run,
+                **self.GENERATIONS_SAVED_UNAVAILABLE
+            },
+            'used_preferences': {
+                'start_location': self.preferences['start_location'],
+                'end_location': self.preferences['end_location'],
+                'budget': self.preferences['budget'],
+                'max_places': self.preferences['max_places']
+            },
+            'seed': seed
+        }
+
+        return self.store_cached_result(result_cache, cache_key, self.convert_to_json_serializable(result))
+
+    def store_cached_result(self, result_cache, cache_key, result):
+        """Simpan hasil + state journey ke result cache (hasil terpotong deadline tidak disimpan)"""
+        result['from_cache'] = False
+        if cache_key is not None and not result['truncated']:
+            result_cache.set(cache_key, {
+                'result': dict(result),
+                'route': list(self.current_route),
+                'hall_of_fame': self.last_hall_of_fame
+            })
+        return result
+
+    def restore_cached_result(self, cached):
+        """State journey dari entri result cache (preferensi dan dynamic data sudah di-set)"""
+        self.last_hall_of_fame = [list(route) for route in cached['hall_of_fame']]
+        self.current_route = list(cached['route'])
+        self.current_schedule = self.create_schedule()
+        return dict(cached['result'], from_cache=True)
+
+    def optimize_route_exact(self, crossover_method="original", progress_callback=None, deadline=None):
+        """
+        Optimasi eksak (lihat exact_solver.solve_exact) dengan objektif yang sama
+        dengan GA. Format hasil sama dengan optimize_route_with_crossover_choice.
+        """
+        if not is_small_instance(self.catalog, self.preferences):
+            raise ValueError("Instance too large for exact algorithm, use 'auto' or a GA algorithm")
+
+        start_leg, end_leg = self.get_leg_distances(self.preferences)
+        solution = solve_exact(self.catalog, self.preferences, self.distance_matrix, self.travel_times,
+                               start_leg, end_leg, deadline=deadline)
+        fitness = float(solution['fitness'])
+        print(f"🎯 Exact solver: {solution['subsets_evaluated']}/{solution['subsets_total']} subsets, "
+              f"{solution['permutations_evaluated']} permutations, optimal={solution['optimal']}")
+        if progress_callback:
+            progress_callback(0, {'avg': fitness, 'max': fitness, 'min': fitness, 'std': 0.0})
+
+        # Rute terbaik berikutnya menjadi bibit warm-start bila reoptimasi memakai GA
+        self.last_hall_of_fame = solution['top_routes']
+        self.current_route = list(solution['route'])
+        self.current_schedule = self.create_schedule()
+
+        result = {
+            'route': [int(x) for x in self.current_route],
+            'fitness': fitness,
+            'schedule': self.current_schedule.to_dict('records'),
+            'total_cost': int(self.catalog.total_fee(self.current_route)),
+            'crossover_method': crossover_method,
+            'algorithm': 'exact',
+            'truncated': not solution['optimal'],
+            'distance_info': self.calculate_route_distances(),
+            'travel_time_info': self.calculate_travel_time_info(),
+            'evolution_stats': {
+                'generations': 0,
+                'stop_reason': 'exact' if solution['optimal'] else STOP_DEADLINE,
+                'evaluations': solution['permutations_evaluated'],
+                'exact_solver': {
+                    'subsets_total': solution['subsets_total'],
+                    'subsets_evaluated': solution['subsets_evaluated'],
+                    'permutations_evaluated': solution['permutations_evaluated'],
+                    'optimal': solution['optimal']
+                },
+                'final_avg_fitness': fitness,
+                'final_max_fitness': fitness,
+                'final_min_fitness': fitness,
+                'improvement': 0.0,
+                'fitness_history': {
+                    'generation': [0],
+                    'avg_fitness': [fitness],
+                    'max_fitness': [fitness],
+                    'min_fitness': [fitness],
+                    'std_fitness': [0.0]
+                }
+            },
+            'warm_start': {
+                'enabled': False,
+                'seeded_individuals': 0,
+                'generations_run': 0,
+                **self.GENERATIONS_SAVED_UNAVAILABLE
+            },
             'used_preferences': {
                 'start_location': self.preferences['start_location'],
                 'end_location': self.preferences['end_location'],
@@ -538,30 +1022,110 @@ class TourismOptimizer:
         }
 
         return self.convert_to_json_serializable(result)
+
+    def repair_route(self, route, preferences):
+        """
+        Perbaiki rute bibit terhadap constraint baru (avoid, must_visit,
+        max_places, budget) tanpa mengacak urutan.
+        """
+        avoid = set(preferences.get('avoid_places', []))
+        must_visit = preferences['must_visit']
+        repaired = [p for p in dict.fromkeys(route) if p not in avoid]
+
+        for must_visit_id in must_visit:
+            if must_visit_id not in repaired and must_visit_id not in avoid:
+                repaired.append(must_visit_id)
+
+        while len(repaired) > preferences['max_places']:
+            optional = [p for p in repaired if p not in must_visit]
+            if not optional:
+                break
+            repaired.remove(optional[-1])
+
+        current_budget = self.catalog.total_fee(repaired)
+        while current_budget > preferences['budget']:
+            optional = [p for p in repaired if p not in must_visit]
+            if not optional:
+                break
+            most_expensive = max(optional, key=self.catalog.fee)
+            repaired.remove(most_expensive)
+            current_budget -= self.catalog.fee(most_expensive)
+
+        return repaired
+
+    def complete_warm_start_seed(self, route, route_context):
+        """
+        Isi ulang bibit warm-start yang kehilangan tempat (ditutup/dihindari):
+        sisipkan kandidat terbaik di posisi terbaik (RouteState) selama fitness
+        naik, budget cukup, dan belum max_places. Tanpa ini bibit lebih pendek
+        dari rute cold dan GA terjebak di sekitarnya.
+        """
+        state = RouteState(route_context, route)
+        budget = self.preferences['budget']
+        while len(state) < self.preferences['max_places']:
+            best_value, best_move = state.fitness, None
+            for place_id in self.candidate_places(state.route):
+                if state.fee + self.catalog.fee(place_id) > budget:
+                    continue
+                place = self.catalog.index_of(place_id)
+                for position in range(len(state) + 1):
+                    value = state.score_insert(place, position)
+                    if value > best_value:
+                        best_value, best_move = value, (place, position)
+            if best_move is None:
+                break
+            state.apply_insert(*best_move)
+        return state.route
+
+    def build_warm_start_seeds(self, remaining_route, preferences):
+        """
+        Bibit populasi reoptimasi: sisa rute saat ini dan hall of fame GA
+        sebelumnya, diperbaiki terhadap constraint baru. Jumlahnya dibatasi
+        WARM_START_SEED_FRACTION populasi supaya sisanya tetap acak.
+        """
+        seeds = []
+        seen = set()
+        max_seeds = max(1, int(self.POPULATION_SIZE * self.WARM_START_SEED_FRACTION))
+
+        for candidate in [remaining_route] + self.last_hall_of_fame:
+            repaired = self.repair_route(candidate, preferences)
+            key = tuple(repaired)
+            if repaired and key not in seen:
+                seen.add(key)
+                seeds.append(repaired)
+            if len(seeds) >= max_seeds:
+                break
+
+        return seeds
     
     # ✅ UPDATE: Modifikasi reoptimize_route_with_crossover
-    def reoptimize_route_with_crossover(self, current_time_str=None, crossover_method="original", algorithm="simple"):
+    def reoptimize_route_with_crossover(self, current_time_str=None, crossover_method="original", algorithm="simple",
+                                        progress_callback=None, parallel_workers=None, stop_criteria=None,
+                                        deadline=None, local_search=False, islands=None, seed=None):
         """
         Enhanced reoptimize dengan previous route tracking
+        seed: opsional; menentukan simulasi dynamic data dan GA reoptimasi
         """
+        self.rng, seed = self.create_rng(seed)
 
         # ✅ DEBUG: Tambahkan di AWAL method
         print(f"🔍 DEBUG reoptimize START:")
         print(f"   Position BEFORE reoptimize: {self.current_position}")
         print(f"   Route BEFORE reoptimize: {self.current_route}")
-        print(f"   Route names BEFORE: {[self.df_places.iloc[id-1]['name'] for id in self.current_route] if self.current_route else []}")
+        print(f"   Route names BEFORE: {[self.place_row(id)['name'] for id in self.current_route] if self.current_route else []}")
 
         # ✅ Save current route as previous before reoptimization
         self.save_current_as_previous()
         
         # ... existing reoptimization code sama seperti sebelumnya ...
         if current_time_str:
-            current_time = datetime.strptime(current_time_str, '%H:%M')
+            current_time = time_to_minutes(current_time_str)
         else:
-            current_time = datetime.now()
+            now = datetime.now()
+            current_time = now.hour * 60 + now.minute
         
         # Update dynamic data
-        self.dynamic_data = self.update_dynamic_data(current_time, self.dynamic_data)
+        self.set_dynamic_data(self.update_dynamic_data(current_time, self.dynamic_data))
         
         # Get remaining places
         remaining_places = self.current_route[self.current_position + 1:]
@@ -569,14 +1133,14 @@ class TourismOptimizer:
         
         # Update preferences for reoptimization
         new_preferences = self.preferences.copy()
-        new_preferences['start_time'] = current_time.strftime('%H:%M')
+        new_preferences['start_time'] = minutes_to_time(current_time)
         new_preferences['avoid_places'] = self.preferences.get('avoid_places', []) + visited_places
         new_preferences['must_visit'] = []
         
         # Update start location to current place
         if self.current_position < len(self.current_route):
             current_place_id = self.current_route[self.current_position]
-            current_place = self.df_places.iloc[current_place_id - 1]
+            current_place = self.place_row(current_place_id)
             new_preferences['start_location'] = {
                 'name': current_place['name'],
                 'latitude': float(current_place['latitude']),
@@ -585,7 +1149,7 @@ class TourismOptimizer:
         
         # Update budget
         # Update budget
-        used_budget = sum(self.df_places.iloc[place_id - 1]['entrance_fee'] for place_id in visited_places)
+        used_budget = sum(self.place_row(place_id)['entrance_fee'] for place_id in visited_places)
         new_preferences['budget'] = self.preferences['budget'] - used_budget
         
         # ✅ TAMBAH DEBUG PRINT:
@@ -607,20 +1171,26 @@ class TourismOptimizer:
 
         distance_info = self.calculate_route_distances()
         if new_preferences['max_places'] > 0 and new_preferences['budget'] > 0:
-            # Reset DEAP creators
-            if 'FitnessMax' in dir(creator):
-                del creator.FitnessMax
-                del creator.Individual
-                
             print(f"🔄 Reoptimizing with {crossover_method} crossover and {algorithm} algorithm...")
             print(f"✅ GA will be executed:")
             print(f"   Places to reoptimize: {new_preferences['max_places']}")
             print(f"   Budget available: Rp{new_preferences['budget']:,}")
+            seed_routes = self.build_warm_start_seeds(remaining_places, self.create_user_preferences(new_preferences))
+            print(f"🌱 Warm-start seeds: {len(seed_routes)}")
             result = self.optimize_route_with_crossover_choice(
                 new_preferences, 
                 crossover_method=crossover_method,
                 algorithm=algorithm,
-                verbose=True
+                verbose=True,
+                progress_callback=progress_callback,
+                parallel_workers=parallel_workers,
+                seed_routes=seed_routes,
+                stop_criteria=stop_criteria,
+                deadline=deadline,
+                local_search=local_search,
+                dynamic_data=self.dynamic_data,
+                islands=islands,
+                seed=self.rng.getrandbits(63)
             )
             
             # Combine with visited places
@@ -633,7 +1203,7 @@ class TourismOptimizer:
             print(f"🔍 DEBUG reoptimize AFTER:")
             print(f"🔍 Position AFTER reoptimize: {self.current_position}")
             print(f"🔍 Route AFTER reoptimize: {self.current_route}")
-            print(f"🔍 Route names AFTER: {[self.df_places.iloc[id-1]['name'] for id in self.current_route]}")
+            print(f"🔍 Route names AFTER: {[self.place_row(id)['name'] for id in self.current_route]}")
             print(f"🔍 Visited places: {visited_places}")
             print(f"🔍 New places from GA: {result['route']}")
 
@@ -651,9 +1221,9 @@ class TourismOptimizer:
                 'dynamic_data': {
                     'weather': self.dynamic_data['weather_condition'],
                     'crowdedness_factor': float(self.dynamic_data['crowdedness_factor']),
-                    'closed_places': [self.df_places.iloc[id-1]['name'] for id in self.dynamic_data['closed_places']]
+                    'closed_places': [self.place_row(id)['name'] for id in self.dynamic_data['closed_places']]
                 },
-                'updated_route': [self.df_places.iloc[id-1]['name'] for id in self.current_route],
+                'updated_route': [self.place_row(id)['name'] for id in self.current_route],
                 'route_ids': [int(id) for id in self.current_route],
                 'schedule': self.current_schedule.to_dict('records'),
                 'budget_info': {
@@ -672,6 +1242,8 @@ class TourismOptimizer:
                 # ✅ TAMBAHAN: Distance and travel time information
                 'distance_info': distance_info,
                 'travel_time_info': travel_time_info,
+                'warm_start': result.get('warm_start'),
+                'truncated': result.get('truncated', False),
                 'message': f"Rute berhasil dioptimasi ulang menggunakan {crossover_method} crossover dan {algorithm} algorithm"
             }
         else:
@@ -689,9 +1261,9 @@ class TourismOptimizer:
                 'dynamic_data': {
                     'weather': self.dynamic_data['weather_condition'],
                     'crowdedness_factor': float(self.dynamic_data['crowdedness_factor']),
-                    'closed_places': [self.df_places.iloc[id-1]['name'] for id in self.dynamic_data['closed_places']]
+                    'closed_places': [self.place_row(id)['name'] for id in self.dynamic_data['closed_places']]
                 },
-                'updated_route': [self.df_places.iloc[id-1]['name'] for id in self.current_route],
+                'updated_route': [self.place_row(id)['name'] for id in self.current_route],
                 'route_ids': [int(id) for id in self.current_route],
                 'schedule': self.current_schedule.to_dict('records') if self.current_schedule is not None else [],
                 'budget_info': {
@@ -724,7 +1296,9 @@ class TourismOptimizer:
                 'cumulative_distance': [0]
             }
         
-        import geopy.distance as geodist
+        catalog = self.catalog
+        start_leg, end_leg = self.get_leg_distances()
+        indices = [catalog.index_of(place_id) for place_id in self.current_route]
         
         distances = []
         cumulative = [0]
@@ -732,15 +1306,10 @@ class TourismOptimizer:
         
         # Distance from start location to first place
         if self.current_route:
-            start_loc = (self.preferences['start_location']['latitude'], 
-                        self.preferences['start_location']['longitude'])
-            first_place = self.df_places.iloc[self.current_route[0]-1]
-            first_loc = (first_place['latitude'], first_place['longitude'])
-            
-            start_distance = geodist.distance(start_loc, first_loc).km
+            start_distance = start_leg[indices[0]]
             distances.append({
                 'from': self.preferences['start_location']['name'],
-                'to': first_place['name'],
+                'to': catalog.names[indices[0]],
                 'distance_km': round(float(start_distance), 2),
                 'leg_number': 0
             })
@@ -749,16 +1318,11 @@ class TourismOptimizer:
         
         # Distance between places in route
         for i in range(len(self.current_route) - 1):
-            place1 = self.df_places.iloc[self.current_route[i]-1]
-            place2 = self.df_places.iloc[self.current_route[i+1]-1]
-            
-            loc1 = (place1['latitude'], place1['longitude'])
-            loc2 = (place2['latitude'], place2['longitude'])
-            
-            distance = geodist.distance(loc1, loc2).km
+            idx1, idx2 = indices[i], indices[i+1]
+            distance = self.distance_matrix[idx1, idx2]
             distances.append({
-                'from': place1['name'],
-                'to': place2['name'],
+                'from': catalog.names[idx1],
+                'to': catalog.names[idx2],
                 'distance_km': round(float(distance), 2),
                 'leg_number': i + 1
             })
@@ -768,14 +1332,9 @@ class TourismOptimizer:
         
         # Distance from last place back to end location
         if self.current_route:
-            last_place = self.df_places.iloc[self.current_route[-1]-1]
-            end_loc = (self.preferences['end_location']['latitude'], 
-                    self.preferences['end_location']['longitude'])
-            last_loc = (last_place['latitude'], last_place['longitude'])
-            
-            end_distance = geodist.distance(last_loc, end_loc).km
+            end_distance = end_leg[indices[-1]]
             distances.append({
-                'from': last_place['name'],
+                'from': catalog.names[indices[-1]],
                 'to': self.preferences['end_location']['name'],
                 'distance_km': round(float(end_distance), 2),
                 'leg_number': len(self.current_route)
@@ -803,13 +1362,14 @@ class TourismOptimizer:
         
         travel_times = []
         total_time = 0
+        _, schedule_legs = self.simulate_schedule()
         
-        for leg in distance_info['distance_breakdown']:
+        for leg, schedule_leg in zip(distance_info['distance_breakdown'], schedule_legs):
             # Base travel time (40 km/h average speed)
             base_time = (leg['distance_km'] / 40) * 60  # minutes
             
-            # Apply traffic factor (simplified)
-            traffic_factor = 1.2  # Can be made dynamic based on time/day
+            # Traffic factor pada jam keberangkatan leg ini (traffic_by_hour)
+            traffic_factor = schedule_leg['traffic_factor']
             actual_time = base_time * traffic_factor
             
             travel_times.append({
@@ -819,6 +1379,7 @@ class TourismOptimizer:
                 'base_travel_time_minutes': round(base_time, 1),
                 'actual_travel_time_minutes': round(actual_time, 1),
                 'traffic_factor': traffic_factor,
+                'departure_time': schedule_leg['departure_time'],
                 'leg_number': leg['leg_number']
             })
             
@@ -830,44 +1391,36 @@ class TourismOptimizer:
             'travel_time_breakdown': travel_times
         }
 
-    def optimize_route(self, preferences_data=None, verbose=True):
+    def optimize_route(self, preferences_data=None, verbose=True, seed=None):
+        self.rng, _ = self.create_rng(seed)
         self.preferences = self.create_user_preferences(preferences_data)
-        self.dynamic_data = self.create_dynamic_data()
-        
-        # Reset DEAP creators
-        if 'FitnessMax' in dir(creator):
-            del creator.FitnessMax
-            del creator.Individual
-
-        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMax)
-
-        toolbox = base.Toolbox()
+        self.set_dynamic_data(self.create_dynamic_data())
+        self.get_leg_distances(self.preferences)
 
         def init_individual():
             individual = self.preferences['must_visit'].copy()
-            potential_places = [i for i in range(1, len(self.df_places)+1)
+            potential_places = [i for i in self.catalog.all_ids
                            if i not in individual and i not in self.preferences['avoid_places']]
 
             # ✅ TAMBAHKAN DEBUG PRINT DI SINI:
             print(f"🔍 DEBUG init_individual:")
             print(f"   must_visit: {self.preferences['must_visit']}")
-            print(f"   potential_places range: 1 to {len(self.df_places)}")
+            print(f"   potential_places count: {len(potential_places)}")
             print(f"   potential_places: {potential_places[:10]}...")  # Show first 10
 
-            random.shuffle(potential_places)
-            current_budget = sum(self.df_places.iloc[p-1]['entrance_fee'] for p in individual)
+            self.rng.shuffle(potential_places)
+            current_budget = self.catalog.total_fee(individual)
 
             for place_id in potential_places:
                 if len(individual) >= self.preferences['max_places']:
                     break
 
-                fee = self.df_places.iloc[place_id-1]['entrance_fee']
+                fee = self.catalog.fee(place_id)
                 if current_budget + fee <= self.preferences['budget']:
                     individual.append(place_id)
                     current_budget += fee
 
-            random.shuffle(individual)
+            self.rng.shuffle(individual)
 
             # ✅ TAMBAHKAN DEBUG PRINT DI SINI:
             print(f"   final individual: {individual}")
@@ -875,12 +1428,11 @@ class TourismOptimizer:
             print(f"   individual max: {max(individual) if individual else 'empty'}")
             return individual
 
-        toolbox.register("individual", tools.initIterate, creator.Individual, init_individual)
-        toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+        toolbox = GA_ENGINE.toolbox(init_individual, self.rng)
         
         def eval_wrapper(route):
             return self.eval_route_fixed(route, self.df_places, self.preferences, 
-                                    self.distance_matrix, self.travel_time_matrix, self.dynamic_data)
+                                    self.distance_matrix, self.travel_times, self.dynamic_data)
         
         toolbox.register("evaluate", eval_wrapper)
         
@@ -891,8 +1443,8 @@ class TourismOptimizer:
             
             if len(ind1) > 1 and len(ind2) > 1:
                 # Simple one-point crossover with validation
-                cx_point1 = random.randint(0, len(ind1)-1)
-                cx_point2 = random.randint(0, len(ind2)-1)
+                cx_point1 = self.rng.randint(0, len(ind1)-1)
+                cx_point2 = self.rng.randint(0, len(ind2)-1)
 
                 # Create offspring
                 offspring1 = ind1[:cx_point1] + [x for x in ind2 if x not in ind1[:cx_point1]]
@@ -909,34 +1461,34 @@ class TourismOptimizer:
                 while len(offspring1) > self.preferences['max_places']:
                     optional = [p for p in offspring1 if p not in self.preferences['must_visit']]
                     if optional:
-                        offspring1.remove(random.choice(optional))
+                        offspring1.remove(self.rng.choice(optional))
                     else:
                         break
 
                 while len(offspring2) > self.preferences['max_places']:
                     optional = [p for p in offspring2 if p not in self.preferences['must_visit']]
                     if optional:
-                        offspring2.remove(random.choice(optional))
+                        offspring2.remove(self.rng.choice(optional))
                     else:
                         break
 
                 # Budget constraints
                 def enforce_budget(offspring):
-                    budget = sum(self.df_places.iloc[p-1]['entrance_fee'] for p in offspring)
+                    budget = self.catalog.total_fee(offspring)
                     while budget > self.preferences['budget'] and len(offspring) > len(self.preferences['must_visit']):
                         optional = [p for p in offspring if p not in self.preferences['must_visit']]
                         if optional:
-                            to_remove = max(optional, key=lambda p: self.df_places.iloc[p-1]['entrance_fee'])
+                            to_remove = max(optional, key=self.catalog.fee)
                             offspring.remove(to_remove)
-                            budget -= self.df_places.iloc[to_remove-1]['entrance_fee']
+                            budget -= self.catalog.fee(to_remove)
                         else:
                             break
 
                 enforce_budget(offspring1)
                 enforce_budget(offspring2)
 
-                random.shuffle(offspring1)
-                random.shuffle(offspring2)
+                self.rng.shuffle(offspring1)
+                self.rng.shuffle(offspring2)
 
                 ind1[:] = offspring1
                 ind2[:] = offspring2
@@ -945,38 +1497,38 @@ class TourismOptimizer:
         
         # Custom mutation
         def custom_mutate(individual, indpb):
-            if random.random() < indpb and len(individual) >= 2:
+            if self.rng.random() < indpb and len(individual) >= 2:
                 # Swap mutation
-                idx1, idx2 = random.sample(range(len(individual)), 2)
+                idx1, idx2 = self.rng.sample(range(len(individual)), 2)
                 individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
 
-            if random.random() < indpb and len(individual) >= 2:
+            if self.rng.random() < indpb and len(individual) >= 2:
                 # Insert mutation
-                idx1 = random.randint(0, len(individual) - 1)
-                idx2 = random.randint(0, len(individual) - 1)
+                idx1 = self.rng.randint(0, len(individual) - 1)
+                idx2 = self.rng.randint(0, len(individual) - 1)
                 if idx1 != idx2:
                     value = individual.pop(idx1)
                     individual.insert(idx2, value)
 
             # Add/remove mutation
-            if random.random() < indpb * 1.5:
-                current_budget = sum(self.df_places.iloc[p-1]['entrance_fee'] for p in individual)
+            if self.rng.random() < indpb * 1.5:
+                current_budget = self.catalog.total_fee(individual)
 
                 # Add place if possible
                 if len(individual) < self.preferences['max_places']:
-                    available_places = [i for i in range(1, len(self.df_places)+1)
+                    available_places = [i for i in self.catalog.all_ids
                                        if i not in individual and i not in self.preferences['avoid_places']]
                     if available_places:
-                        new_place = random.choice(available_places)
-                        fee = self.df_places.iloc[new_place-1]['entrance_fee']
+                        new_place = self.rng.choice(available_places)
+                        fee = self.catalog.fee(new_place)
                         if current_budget + fee <= self.preferences['budget']:
                             individual.append(new_place)
 
                 # Remove optional place
-                if random.random() < indpb and len(individual) > 1:
+                if self.rng.random() < indpb and len(individual) > 1:
                     optional_places = [p for p in individual if p not in self.preferences['must_visit']]
                     if optional_places:
-                        individual.remove(random.choice(optional_places))
+                        individual.remove(self.rng.choice(optional_places))
 
             return individual,
 
@@ -984,51 +1536,28 @@ class TourismOptimizer:
         # toolbox.register("mate", self.order_crossover)
         toolbox.register("mate", self.cycle_crossover)
         toolbox.register("mutate", custom_mutate, indpb=0.2)
-        toolbox.register("select", tools.selTournament, tournsize=3)
 
         # Setup statistics
-        stats = tools.Statistics(lambda ind: ind.fitness.values)
-        stats.register("avg", np.mean)
-        stats.register("max", np.max)
-        stats.register("min", np.min)
-        stats.register("std", np.std)
+        stats = GA_ENGINE.statistics()
 
         # Run genetic algorithm dengan verbose output
         print("\n" + "="*60)
         print("🧬 GENETIC ALGORITHM EVOLUTION")
         print("="*60)
-        print(f"Population Size: {50}")
-        print(f"Generations: {50}")
+        print(f"Population Size: {self.POPULATION_SIZE}")
+        print(f"Generations: max {self.GENERATIONS} (stop when no improvement for {self.STAGNATION_GENERATIONS})")
         print(f"Crossover Rate: {70}%")
         print(f"Mutation Rate: {30}%")
         print("="*60)
 
-        # Run genetic algorithm
-        pop = toolbox.population(n=50)
+        # Run genetic algorithm: engine yang sama dengan optimize_route_with_crossover_choice
+        # (seleksi + variasi dari self.rng, early stopping), bukan rantai algorithms.ea* DEAP
+        pop = toolbox.population(n=self.POPULATION_SIZE)
         hof = tools.HallOfFame(1)
-        
-        #update generasi
-        pop, logbook = algorithms.eaSimple(
-            pop, toolbox, cxpb=0.7, mutpb=0.3,
-            ngen=50, stats=stats, halloffame=hof, 
-            verbose=verbose   # ← Enable verbose output
-        )
-
-        pop, logbook = algorithms.eaMuPlusLambda(
-            pop, toolbox,
-            mu=30,           # 30 parents survive  
-            lambda_=50,      # 50 offspring created
-            cxpb=0.7, mutpb=0.3, ngen=50,
-            stats=stats, halloffame=hof, verbose=verbose
-        )
-
-        pop, logbook = algorithms.eaMuCommaLambda(
-            pop, toolbox,
-            mu=30,           # 30 selected from offspring only
-            lambda_=50,      # 50 offspring created  
-            cxpb=0.7, mutpb=0.3, ngen=50,
-            stats=stats, halloffame=hof, verbose=verbose
+        pop, logbook, stop_reason, evaluations = self.run_genetic_algorithm(
+            pop, toolbox, stats, hof, algorithm="simple", verbose=verbose
         )
+        print(f"🛑 GA stopped after {len(logbook) - 1} generations: {stop_reason} ({evaluations} evaluations)")
 
         self.current_route = list(hof[0])
         self.current_position = 0
@@ -1045,9 +1574,11 @@ class TourismOptimizer:
             'route': [int(x) for x in self.current_route],
             'fitness': float(hof[0].fitness.values[0]),
             'schedule': self.current_schedule.to_dict('records'),
-            'total_cost': int(sum(self.df_places.iloc[id-1]['entrance_fee'] for id in self.current_route)),
+            'total_cost': int(sum(self.place_row(id)['entrance_fee'] for id in self.current_route)),
             'evolution_stats': {
                 'generations': len(gen),
+                'stop_reason': stop_reason,
+                'evaluations': int(evaluations),
                 'final_avg_fitness': float(fit_avg[-1]),
                 'final_max_fitness': float(fit_max[-1]),
                 'final_min_fitness': float(fit_min[-1]),
@@ -1070,11 +1601,11 @@ class TourismOptimizer:
         print(f"   result['route']: {result['route']}")
         
         # Check for invalid IDs
-        invalid_ids = [id for id in self.current_route if id < 1 or id > 15]
+        invalid_ids = [id for id in self.current_route if id not in self.catalog]
         if invalid_ids:
             print(f"   ❌ INVALID IDs found: {invalid_ids}")
         else:
-            print(f"   ✅ All IDs valid (1-15)")    
+            print(f"   ✅ All IDs valid")    
         return self.convert_to_json_serializable(result)
     
 
@@ -1094,8 +1625,8 @@ class TourismOptimizer:
             
             # Simple swap elements
             if size >= 2:
-                point1 = random.randint(0, size-2)
-                point2 = random.randint(point1+1, size-1)
+                point1 = self.rng.randint(0, size-2)
+                point2 = self.rng.randint(point1+1, size-1)
                 
                 # Swap segments
                 offspring1[point1:point2] = ind2[point1:point2]
@@ -1134,7 +1665,7 @@ class TourismOptimizer:
         max_size = max(len(ind1), len(ind2))
         
         # Pad yang lebih pendek dengan elemen available
-        available_places = [i for i in range(1, len(self.df_places)+1)
+        available_places = [i for i in self.catalog.all_ids
                         if i not in self.preferences.get('avoid_places', [])]
         
         ind1_work = ind1[:min_size] if len(ind1) >= min_size else ind1[:]
@@ -1254,38 +1785,37 @@ class TourismOptimizer:
             # Remove non-must-visit places first
             optional = [p for p in individual if p not in self.preferences['must_visit']]
             if optional:
-                individual.remove(random.choice(optional))
+                individual.remove(self.rng.choice(optional))
             else:
                 break
         
         # Budget constraint
-        current_budget = sum(self.df_places.iloc[p-1]['entrance_fee'] for p in individual)
+        current_budget = self.catalog.total_fee(individual)
         while current_budget > self.preferences['budget'] and len(individual) > len(self.preferences['must_visit']):
             # Remove most expensive optional place
             optional = [p for p in individual if p not in self.preferences['must_visit']]
             if optional:
-                most_expensive = max(optional, key=lambda p: self.df_places.iloc[p-1]['entrance_fee'])
+                most_expensive = max(optional, key=self.catalog.fee)
                 individual.remove(most_expensive)
-                current_budget -= self.df_places.iloc[most_expensive-1]['entrance_fee']
+                current_budget -= self.catalog.fee(most_expensive)
             else:
                 break
         
         # Add more places if under budget and under max_places
         if len(individual) < self.preferences['max_places']:
-            available_places = [i for i in range(1, len(self.df_places)+1)
-                            if i not in individual and i not in self.preferences.get('avoid_places', [])]
+            available_places = self.candidate_places(individual)
             
             for place_id in available_places:
                 if len(individual) >= self.preferences['max_places']:
                     break
                 
-                fee = self.df_places.iloc[place_id-1]['entrance_fee']
+                fee = self.catalog.fee(place_id)
                 if current_budget + fee <= self.preferences['budget']:
                     individual.append(place_id)
                     current_budget += fee
         
         # Shuffle untuk variasi
-        random.shuffle(individual)
+        self.rng.shuffle(individual)
         
         return individual
 
@@ -1304,92 +1834,99 @@ class TourismOptimizer:
     def create_schedule(self):
         if not self.current_route or not self.preferences:
             return pd.DataFrame()
-        
+        schedule, _ = self.simulate_schedule()
+        return pd.DataFrame(schedule)
+
+    def simulate_schedule(self):
+        """
+        Simulasi perjalanan rute saat ini. Return (baris jadwal, legs) dengan
+        legs = jam berangkat dan faktor lalu lintas tiap leg (awal, antar tempat, kembali).
+        """
+        # Semua waktu dalam menit sejak tengah malam (float), tanpa datetime
         schedule = []
-        start_time = datetime.strptime(self.preferences['start_time'], '%H:%M')
-        current_time = start_time
-        lunch_time = datetime.strptime(self.preferences['lunch_time'], '%H:%M')
+        legs = []
+        current_time = time_to_minutes(self.preferences['start_time'])
+        lunch_time = time_to_minutes(self.preferences['lunch_time'])
         lunch_taken = False
 
         schedule.append({
             'location': self.preferences['start_location']['name'],
             'activity': 'Berangkat dari '+ self.preferences['start_location']['name'],
-            'time': current_time.strftime('%H:%M'),
+            'time': minutes_to_time(current_time),
             'type': 'departure'
         })
 
+        catalog = self.catalog
+        start_leg, end_leg = self.get_leg_distances()
+        travel_times = self.travel_times
+        crowdedness_factor = self.dynamic_data['crowdedness_factor']
         for i, place_id in enumerate(self.current_route):
-            place = self.df_places.iloc[place_id-1]
+            idx = catalog.index_of(place_id)
+            place_name = catalog.names[idx]
 
-            # Travel time calculation
+            # Travel time calculation (faktor lalu lintas menurut jam berangkat)
+            hour = hour_of(current_time)
+            legs.append({'departure_time': minutes_to_time(current_time), 'traffic_factor': travel_times.factor(hour)})
             if i == 0:
-                start_loc = (self.preferences['start_location']['latitude'], 
-                           self.preferences['start_location']['longitude'])
-                place_loc = (place['latitude'], place['longitude'])
-                distance = geodist.distance(start_loc, place_loc).km
+                distance = start_leg[idx]
+                current_time += (distance / 40) * 60 * travel_times.factor(hour)
             else:
-                prev_place = self.df_places.iloc[self.current_route[i-1]-1]
-                distance = self.distance_matrix[self.current_route[i-1]-1][place_id-1]
-
-            travel_time = (distance / 40) * 60
-            traffic_factor = self.dynamic_data['traffic_by_hour'].get(current_time.hour, 1.0)
-            current_time += timedelta(minutes=travel_time * traffic_factor)
+                prev_idx = catalog.index_of(self.current_route[i-1])
+                distance = self.distance_matrix[prev_idx, idx]
+                current_time += travel_times.minutes(prev_idx, idx, hour)
 
             if i > 0:
                 schedule.append({
-                    'location': f"Perjalanan ke {place['name']}",
+                    'location': f"Perjalanan ke {place_name}",
                     'activity': f"Perjalanan ({distance:.1f} km)",
-                    'time': current_time.strftime('%H:%M'),
+                    'time': minutes_to_time(current_time),
                     'type': 'travel'
                 })
 
             # Lunch check
             if not lunch_taken and current_time >= lunch_time:
                 schedule.append({
-                    'location': f"Makan Siang (di sekitar {place['name']})",
+                    'location': f"Makan Siang (di sekitar {place_name})",
                     'activity': "Makan Siang",
-                    'time': current_time.strftime('%H:%M'),
+                    'time': minutes_to_time(current_time),
                     'type': 'lunch'
                 })
-                current_time += timedelta(minutes=self.preferences['lunch_duration'])
+                current_time += self.preferences['lunch_duration']
                 lunch_taken = True
 
-            # Visit
-            place_open = datetime.strptime(place['open_time'], '%H:%M').time()
-            if current_time.time() < place_open:
-                current_time = datetime.combine(current_time.date(), place_open)
+            # Visit (tunggu sampai jam buka pada hari yang sama)
+            open_time = int(catalog.open_min[idx])
+            time_of_day = current_time % MINUTES_PER_DAY
+            if time_of_day < open_time:
+                current_time += open_time - time_of_day
 
             schedule.append({
-                'location': place['name'],
-                'activity': f"Kunjungan ke {place['name']}",
-                'time': current_time.strftime('%H:%M'),
+                'location': place_name,
+                'activity': f"Kunjungan ke {place_name}",
+                'time': minutes_to_time(current_time),
                 'type': 'visit',
                 'place_id': place_id,
-                'category': place['category'],
-                'entrance_fee': place['entrance_fee']
+                'category': catalog.category_names[catalog.category_list[idx]],
+                'entrance_fee': catalog.fee_list[idx]
             })
 
-            visit_time = place['visit_duration_min'] * self.dynamic_data['crowdedness_factor'] * place['crowdedness_factor']
-            current_time += timedelta(minutes=visit_time)
+            current_time += catalog.visit_duration_list[idx] * crowdedness_factor * catalog.crowdedness[idx]
 
         # Return to hotel
         if self.current_route:
-            last_place = self.df_places.iloc[self.current_route[-1]-1]
-            end_loc = (self.preferences['end_location']['latitude'], 
-                      self.preferences['end_location']['longitude'])
-            last_loc = (last_place['latitude'], last_place['longitude'])
-            distance = geodist.distance(last_loc, end_loc).km
-            travel_time = (distance / 40) * 60
-            current_time += timedelta(minutes=travel_time)
+            distance = end_leg[catalog.index_of(self.current_route[-1])]
+            hour = hour_of(current_time)
+            legs.append({'departure_time': minutes_to_time(current_time), 'traffic_factor': travel_times.factor(hour)})
+            current_time += (distance / 40) * 60 * travel_times.factor(hour)
 
             schedule.append({
                 'location': self.preferences['end_location']['name'],
                 'activity': 'Kembali ke '+ self.preferences['end_location']['name'],
-                'time': current_time.strftime('%H:%M'),
+                'time': minutes_to_time(current_time),
                 'type': 'return'
             })
 
-        return pd.DataFrame(schedule)
+        return schedule, legs
     
     def get_next_place(self):
         print(f"🔍 DEBUG get_next_place:")
@@ -1402,7 +1939,7 @@ class TourismOptimizer:
             print(f"   Current position AFTER: {self.current_position}")
 
             current_place_id = self.current_route[self.current_position]
-            current_place = self.df_places.iloc[current_place_id - 1]
+            current_place = self.place_row(current_place_id)
             
             print(f"   Next place ID: {current_place_id}")
             print(f"   Next place name: {current_place['name']}")
@@ -1431,15 +1968,17 @@ class TourismOptimizer:
                 'message': "Anda sudah berada di tempat terakhir dalam rute!"
             }
     
-    def reoptimize_route(self, current_time_str=None):
+    def reoptimize_route(self, current_time_str=None, seed=None):
         """Menu 2: Perbarui data real-time dan optimasi ulang rute"""
+        self.rng, _ = self.create_rng(seed)
         if current_time_str:
-            current_time = datetime.strptime(current_time_str, '%H:%M')
+            current_time = time_to_minutes(current_time_str)
         else:
-            current_time = datetime.now()
+            now = datetime.now()
+            current_time = now.hour * 60 + now.minute
         
         # Update dynamic data
-        self.dynamic_data = self.update_dynamic_data(current_time, self.dynamic_data)
+        self.set_dynamic_data(self.update_dynamic_data(current_time, self.dynamic_data))
         
         # Get remaining places
         remaining_places = self.current_route[self.current_position + 1:]
@@ -1447,14 +1986,14 @@ class TourismOptimizer:
         
         # Update preferences for reoptimization
         new_preferences = self.preferences.copy()
-        new_preferences['start_time'] = current_time.strftime('%H:%M')
+        new_preferences['start_time'] = minutes_to_time(current_time)
         new_preferences['avoid_places'] = self.preferences.get('avoid_places', []) + visited_places
         new_preferences['must_visit'] = []
         
         # Update start location to current place
         if self.current_position < len(self.current_route):
             current_place_id = self.current_route[self.current_position]
-            current_place = self.df_places.iloc[current_place_id - 1]
+            current_place = self.place_row(current_place_id)
             new_preferences['start_location'] = {
                 'name': current_place['name'],
                 'latitude': current_place['latitude'],
@@ -1462,18 +2001,13 @@ class TourismOptimizer:
             }
         
         # Update budget
-        used_budget = sum(self.df_places.iloc[place_id - 1]['entrance_fee'] for place_id in visited_places)
+        used_budget = sum(self.place_row(place_id)['entrance_fee'] for place_id in visited_places)
         new_preferences['budget'] = self.preferences['budget'] - used_budget
         new_preferences['max_places'] = self.preferences['max_places'] - len(visited_places)
         
         # Reoptimize if there are still places to visit
         if new_preferences['max_places'] > 0 and new_preferences['budget'] > 0:
-            # Reset DEAP creators
-            if 'FitnessMax' in dir(creator):
-                del creator.FitnessMax
-                del creator.Individual
-                
-            result = self.optimize_route(new_preferences)
+            result = self.optimize_route(new_preferences, seed=self.rng.getrandbits(63))
             
             # Combine with visited places
             self.current_route = visited_places + result['route']
@@ -1484,9 +2018,9 @@ class TourismOptimizer:
             'dynamic_data': {
                 'weather': self.dynamic_data['weather_condition'],
                 'crowdedness_factor': self.dynamic_data['crowdedness_factor'],
-                'closed_places': [self.df_places.iloc[id-1]['name'] for id in self.dynamic_data['closed_places']]
+                'closed_places': [self.place_row(id)['name'] for id in self.dynamic_data['closed_places']]
             },
-            'updated_route': [self.df_places.iloc[id-1]['name'] for id in self.current_route],
+            'updated_route': [self.place_row(id)['name'] for id in self.current_route],
             'schedule': self.current_schedule.to_dict('records'),
             'message': "Rute berhasil dioptimasi ulang"
         }
@@ -1516,8 +2050,8 @@ class TourismOptimizer:
             visited_route = self.current_route[:self.current_position + 1] if self.current_position >= 0 else []
             
             # Calculate costs
-            total_cost = sum(self.df_places.iloc[place_id-1]['entrance_fee'] for place_id in self.current_route)
-            visited_cost = sum(self.df_places.iloc[place_id-1]['entrance_fee'] for place_id in visited_route)
+            total_cost = sum(self.place_row(place_id)['entrance_fee'] for place_id in self.current_route)
+            visited_cost = sum(self.place_row(place_id)['entrance_fee'] for place_id in visited_route)
             remaining_cost = total_cost - visited_cost
             
             result = {
@@ -1526,17 +2060,17 @@ class TourismOptimizer:
                 'visited_places': [
                     {
                         'id': place_id,
-                        'name': self.df_places.iloc[place_id-1]['name'],
-                        'category': self.df_places.iloc[place_id-1]['category'],
-                        'cost': self.df_places.iloc[place_id-1]['entrance_fee']
+                        'name': self.place_row(place_id)['name'],
+                        'category': self.place_row(place_id)['category'],
+                        'cost': self.place_row(place_id)['entrance_fee']
                     } for place_id in visited_route
                 ],
                 'remaining_places': [
                     {
                         'id': place_id,
-                        'name': self.df_places.iloc[place_id-1]['name'],
-                        'category': self.df_places.iloc[place_id-1]['category'],
-                        'cost': self.df_places.iloc[place_id-1]['entrance_fee']
+                        'name': self.place_row(place_id)['name'],
+                        'category': self.place_row(place_id)['category'],
+                        'cost': self.place_row(place_id)['entrance_fee']
                     } for place_id in remaining_route
                 ],
                 'total_places': len(self.current_route),
@@ -1558,13 +2092,13 @@ class TourismOptimizer:
     def end_journey(self):
         """Menu 5: Akhiri perjalanan"""
         total_visited = self.current_position + 1 if self.current_position >= 0 else 0
-        total_cost = sum(self.df_places.iloc[place_id-1]['entrance_fee'] 
+        total_cost = sum(self.place_row(place_id)['entrance_fee'] 
                         for place_id in self.current_route[:total_visited])
         
         # Calculate statistics
         categories_visited = {}
         for place_id in self.current_route[:total_visited]:
-            category = self.df_places.iloc[place_id-1]['category']
+            category = self.place_row(place_id)['category']
             categories_visited[category] = categories_visited.get(category, 0) + 1
         
         journey_summary = {
@@ -1579,9 +2113,9 @@ class TourismOptimizer:
                 'visited_places': [
                     {
                         'id': place_id,
-                        'name': self.df_places.iloc[place_id-1]['name'],
-                        'category': self.df_places.iloc[place_id-1]['category'],
-                        'cost': self.df_places.iloc[place_id-1]['entrance_fee']
+                        'name': self.place_row(place_id)['name'],
+                        'category': self.place_row(place_id)['category'],
+                        'cost': self.place_row(place_id)['entrance_fee']
                     } for place_id in self.current_route[:total_visited]
                 ]
             }
@@ -1594,42 +2128,42 @@ class TourismOptimizer:
         
         return self.convert_to_json_serializable(journey_summary)
     
-    def eval_route_fixed(self, route, df_places, preferences, distance_matrix, time_matrix, dynamic_data):
+    def eval_route_fixed(self, route, df_places, preferences, distance_matrix, travel_times, dynamic_data):
         """Fitness function yang diperbaiki - selalu menghasilkan nilai positif"""
         
         if not route:
             return (1.0,)
 
+        catalog = self.catalog
+        indices = [catalog.index_of(place_id) for place_id in route]
+        start_leg, end_leg = self.get_leg_distances(preferences)
+
         # KOMPONEN POSITIF (0-1 scale)
         place_count_score = len(route) / preferences['max_places']
         
         # Distance score
         total_distance = 0
         if route:
-            start_loc = (preferences['start_location']['latitude'], preferences['start_location']['longitude'])
-            first_loc = (df_places.iloc[route[0]-1]['latitude'], df_places.iloc[route[0]-1]['longitude'])
-            total_distance += geodist.distance(start_loc, first_loc).km
+            total_distance += start_leg[indices[0]]
 
         for i in range(len(route)-1):
-            idx1, idx2 = route[i]-1, route[i+1]-1
+            idx1, idx2 = indices[i], indices[i+1]
             # ✅ KONVERSI numpy types ke Python types
-            distance = float(distance_matrix[idx1][idx2])
+            distance = float(distance_matrix[idx1, idx2])
             total_distance += distance
 
         if route:
-            end_loc = (preferences['end_location']['latitude'], preferences['end_location']['longitude'])
-            last_loc = (df_places.iloc[route[-1]-1]['latitude'], df_places.iloc[route[-1]-1]['longitude'])
-            total_distance += geodist.distance(last_loc, end_loc).km
+            total_distance += end_leg[indices[-1]]
 
         distance_score = max(0, 1 - (total_distance / 200))
         
         # Category score
-        category_matches = sum(1 for place_id in route 
-                            if df_places.iloc[place_id-1]['category'] in preferences['preferred_categories'])
+        preferred_codes = catalog.category_codes_for(preferences['preferred_categories'])
+        category_matches = sum(1 for idx in indices if catalog.category_list[idx] in preferred_codes)
         category_score = category_matches / len(route) if route else 0
         
         # Popularity score
-        popularity_score = sum(df_places.iloc[place_id-1]['popularity'] for place_id in route)
+        popularity_score = sum(catalog.popularity_list[idx] for idx in indices)
         popularity_score = (popularity_score / len(route)) / 10.0 if route else 0
 
         # BASE FITNESS (0-100)
@@ -1644,7 +2178,7 @@ class TourismOptimizer:
         penalty_multiplier = 1.0
 
         # Budget penalty
-        budget_used = sum(df_places.iloc[place_id-1]['entrance_fee'] for place_id in route)
+        budget_used = sum(catalog.fee_list[idx] for idx in indices)
         if budget_used > preferences['budget']:
             budget_ratio = preferences['budget'] / budget_used
             penalty_multiplier *= max(0.5, budget_ratio)
@@ -1657,7 +2191,7 @@ class TourismOptimizer:
             penalty_multiplier *= (0.3 + 0.7 * must_visit_ratio)
 
         # Time feasibility penalty
-        time_feasible = self.check_time_feasibility_simple(route, df_places, preferences, time_matrix, dynamic_data)
+        time_feasible = self.check_time_feasibility_simple(route, df_places, preferences, travel_times, dynamic_data)
         if not time_feasible:
             penalty_multiplier *= 0.7
 
@@ -1667,32 +2201,28 @@ class TourismOptimizer:
         # ✅ KONVERSI hasil ke Python float
         return (max(1.0, float(final_fitness)),)
     
-    def check_time_feasibility_simple(self, route, df_places, preferences, time_matrix, dynamic_data):
-        """Simplified time feasibility check"""
-        start_time = datetime.strptime(preferences['start_time'], '%H:%M')
-        current_time = start_time
-        end_time = datetime.strptime(preferences['end_time'], '%H:%M')
-        
-        for i, place_id in enumerate(route):
-            place = df_places.iloc[place_id-1]
+    def check_time_feasibility_simple(self, route, df_places, preferences, travel_times, dynamic_data):
+        """Simplified time feasibility check (menit sejak start_time, waktu tempuh menurut jam berangkat)"""
+        start_time = time_to_minutes(preferences['start_time'])
+        end_time = time_to_minutes(preferences['end_time'])
+        catalog = self.catalog
+        elapsed = 0.0
+        prev_idx = None
+        
+        for place_id in route:
+            idx = catalog.index_of(place_id)
             
             # Add travel time
-            if i > 0:
-                prev_idx = route[i-1] - 1
-                travel_time = time_matrix[prev_idx][place_id-1]
-                # ✅ KONVERSI numpy.int64/float64 ke Python int/float
-                travel_time = float(travel_time)  # atau int(travel_time)
-                current_time += timedelta(minutes=travel_time)
+            if prev_idx is not None:
+                elapsed += travel_times.minutes(prev_idx, idx, hour_of(start_time + elapsed))
             
             # Add visit time
-            visit_time = place['visit_duration_min']
-            # ✅ KONVERSI numpy.int64 ke Python int
-            visit_time = int(visit_time)  # Konversi ke Python int
-            current_time += timedelta(minutes=visit_time)
+            elapsed += catalog.visit_duration_list[idx]
             
             # Check if exceeded end time
-            if current_time > end_time:
+            if start_time + elapsed > end_time:
                 return False
+            prev_idx = idx
         
         return True
 
@@ -1716,7 +2246,7 @@ class TourismOptimizer:
 
         # Add place markers
         for i, place_id in enumerate(self.current_route):
-            place = self.df_places.iloc[place_id-1]
+            place = self.place_row(place_id)
             
             # Different colors based on visit status
             if i <= self.current_position:
@@ -1754,7 +2284,7 @@ class TourismOptimizer:
         route_points.append([start_loc['latitude'], start_loc['longitude']])
 
         for place_id in self.current_route:
-            place = self.df_places.iloc[place_id-1]
+            place = self.place_row(place_id)
             route_points.append([place['latitude'], place['longitude']])
 
         route_points.append([start_loc['latitude'], start_loc['longitude']])
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+
+HOURS_PER_DAY = 24
+# Kecepatan rata-rata free-flow (km/jam)
+AVERAGE_SPEED_KMH = 40
+
+# Batas memori tabel free-flow n x n bersama (per PlaceData); di atasnya dihitung dari jarak
+FREE_FLOW_MAX_BYTES = int(os.environ.get('TOURISM_FREE_FLOW_MAX_BYTES', 16 * 1024 * 1024))
+
+
+def free_flow_minutes(distance_km):
+    """Waktu tempuh tanpa kemacetan (menit) untuk jarak (km), skalar atau array"""
+    return (distance_km / AVERAGE_SPEED_KMH) * 60
+
+
+def hour_of(minutes):
+    """Jam (0-23) dari menit sejak tengah malam"""
+    return int(minutes // 60) % HOURS_PER_DAY
+
+
+def free_flow_table(distances, max_bytes=None):
+    """
+    Matriks waktu tempuh free-flow n x n (read-only) untuk matriks jarak
+    dense yang cukup kecil, selain itu None. Dibuat sekali per PlaceData
+    dan dibagi semua journey (lihat PlaceData.free_flow).
+    """
+    if max_bytes is None:
+        max_bytes = FREE_FLOW_MAX_BYTES
+    if not isinstance(distances, np.ndarray) or distances.size * 8 > max_bytes:
+        return None
+    table = free_flow_minutes(distances)
+    table.setflags(write=False)
+    return table
+
+
+class TravelTimeModel:
+    """
+    Waktu tempuh (menit) yang bergantung jam keberangkatan:
+    free-flow[a, b] x faktor traffic_by_hour[jam].
+
+    distances: matriks jarak dense (ndarray) atau backend dengan lookup
+    yang sama (SparseDistanceMatrix). free_flow: tabel free-flow bersama
+    dari free_flow_table() (opsional); tanpa tabel, free-flow dihitung
+    dari jarak saat lookup dengan hasil float yang sama persis.
+
+    State per journey hanya 24 faktor jam; tabel n x n dipakai bersama
+    semua journey, jadi jumlah sesi tidak menambah memori O(n^2).
+    """
+
+    def __init__(self, distances, traffic_by_hour=None, free_flow=None):
+        self.distances = distances
+        self.free_flow = free_flow
+        self.factors = np.ones(HOURS_PER_DAY)
+        self._factor_list = self.factors.tolist()
+        if traffic_by_hour:
+            self.sync(traffic_by_hour)
+
+    def factor(self, hour):
+        return self._factor_list[hour]
+
+    def update_hour(self, hour, factor):
+        """Ganti faktor satu jam; return True jika berubah"""
+        factor = float(factor)
+        if self._factor_list[hour] == factor:
+            return False
+        self.factors[hour] = factor
+        self._factor_list[hour] = factor
+        return True
+
+    def sync(self, traffic_by_hour):
+        """Samakan dengan dynamic_data['traffic_by_hour']; return jumlah jam yang berubah"""
+        return sum(self.update_hour(int(hour), traffic_by_hour.get(hour, 1.0))
+                   for hour in range(HOURS_PER_DAY))
+
+    @property
+    def flat(self):
+        """True jika faktor semua jam sama (waktu tempuh tidak bergantung jam berangkat)"""
+        return min(self._factor_list) == max(self._factor_list)
+
+    def fingerprint(self):
+        """Faktor per jam, untuk kunci cache fitness"""
+        return tuple(self._factor_list)
+
+    def minutes(self, a, b, hour):
+        """Waktu tempuh dari indeks tempat a ke b jika berangkat pada jam `hour`"""
+        if self.free_flow is not None:
+            return float(self.free_flow[a, b]) * self._factor_list[hour]
+        return free_flow_minutes(float(self.distances[a, b])) * self._factor_list[hour]
+
+    def lookup(self, hours, a, b):
+        """Versi vektor dari minutes() untuk array jam dan indeks"""
+        if self.free_flow is not None:
+            return self.free_flow[a, b] * self.factors[hours]
+        return free_flow_minutes(self.distances[a, b]) * self.factors[hours]
@@ -0,0 +1,23 @@
+const STORAGE_KEY = 'journeyId';
+
+const generateId = () => {
+  if (window.crypto && window.crypto.randomUUID) {
+    return window.crypto.randomUUID().replace(/-/g, '');
+  }
+  return Date.now().toString(16) + Math.random().toString(16).slice(2);
+}
+
+// Journey ID dikirim di setiap request agar backend memakai state perjalanan milik user ini
+export const getJourneyId = () => {
+  let journeyId = localStorage.getItem(STORAGE_KEY);
+  if (!journeyId) {
+    journeyId = generateId();
+    localStorage.setItem(STORAGE_KEY, journeyId);
+  }
+  return journeyId;
+}
+
+export const journeyHeaders = () => ({
+  'Content-Type': 'application/json',
+  'X-Journey-Id': getJourneyId(),
+});
@@ -1,4 +1,5 @@
 import { useEffect, useState } from "react";
+import { journeyHeaders } from "../journey";
 import Map from "../components/Map";
 
 const API_URL = 'http://localhost:5000';
@@ -126,9 +127,7 @@ const MainPage = ({ setCurrentPage, mainData, setMainData, mainConfig, loading,
 
     fetch(API_URL + '/api/next-and-reoptimize', {
       method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
+      headers: journeyHeaders(),
       body: JSON.stringify({
         // start_time: startTime,
         // end_time: endTime,
@@ -162,9 +161,7 @@ const MainPage = ({ setCurrentPage, mainData, setMainData, mainConfig, loading,
   const handleEndTrip = () => {
     fetch(API_URL + '/api/end-journey', {
       method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
+      headers: journeyHeaders(),
       // body: JSON.stringify({
       //   // start_time: startTime,
       //   // end_time: endTime,
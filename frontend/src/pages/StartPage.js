@@ -1,4 +1,5 @@
 import { useEffect, useState } from "react";
+import { journeyHeaders } from "../journey";
 
 const API_URL = 'http://localhost:5000';
 
@@ -66,9 +67,7 @@ const StartPage = ({ setCurrentPage, mainData, setMainData, setMainConfig, loadi
 
     fetch(API_URL + '/api/end-journey', {
       method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
+      headers: journeyHeaders(),
     })
       .then(async response => {
         const responseText = await response.text();
@@ -87,9 +86,7 @@ const StartPage = ({ setCurrentPage, mainData, setMainData, setMainConfig, loadi
   const optimize = () => {
     fetch(API_URL + '/api/optimize', {
       method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
+      headers: journeyHeaders(),
       // body: JSON.stringify({
       //   start_time: startTime,
       //   end_time: endTime,
@@ -288,6 +285,8 @@ const StartPage = ({ setCurrentPage, mainData, setMainData, setMainConfig, loadi
                 <option value={'simple'}>Generational GA</option>
                 <option value={'mu_plus_lambda'}>Steady-state GA (μ + λ)</option>
                 <option value={'mu_comma_lambda'}>Evolutionary Strategy (μ, λ)</option>
+                <option value={'exact'}>Exact solver (branch-and-bound)</option>
+                <option value={'auto'}>Auto (exact for small trips)</option>
               </select>
             </div>
           </div>